@@ -1,8 +1,118 @@
+import os
+import hashlib
 import tkinter as tk
+from collections import OrderedDict, deque
 from PIL import Image, ImageTk
 from cairosvg import svg2png
 from io import BytesIO
-from config import CARD_IMAGES_PATH, CARD_BACK_IMAGE_PATH, CARD_WIDTH, CARD_HEIGHT, CARD_PADDING, BORDER_PADDING, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT, WINDOW_PADDING, BUTTON_ACTIVE_COLOUR, BUTTON_DISABLED_COLOUR, BUTTON_TEXT_COLOUR
+from deck_architecture import Hand
+from config import CARD_IMAGES_PATH, CARD_BACK_IMAGE_PATH, CARD_IMAGE_CACHE_PATH, CARD_IMAGE_CACHE_SIZE, DEALER_CARD_DELAY_MS, CARD_WIDTH, CARD_HEIGHT, CARD_PADDING, BORDER_PADDING, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT, WINDOW_PADDING, BUTTON_ACTIVE_COLOUR, BUTTON_DISABLED_COLOUR, BUTTON_TEXT_COLOUR, TABLE_COLOUR, TABLE_TEXT_COLOUR, TABLE_BUTTON_WIDTH, TABLE_BUTTON_HEIGHT
+
+
+class CardImageCache:
+    """
+    Two-tier cache of rasterised card images so each SVG is only converted once:
+    - A bounded in-memory LRU of Tkinter-ready images.
+    - An on-disk tier of resized PNGs so a warm start skips the SVG conversion completely.
+
+    Entries are keyed by (svg path, size, file modification time), so editing a card's SVG invalidates it.
+    """
+    def __init__(self, max_entries=CARD_IMAGE_CACHE_SIZE, cache_dir=CARD_IMAGE_CACHE_PATH):
+        """
+        Initialises an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of images held in memory before the least recently used is evicted.
+            cache_dir (str): Folder for the on-disk PNG tier (None to disable it).
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.images = OrderedDict() #Maps cache keys to images, ordered from least to most recently used
+
+        # Counters for measuring how well the cache is working
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, card_path, width, height):
+        """Returns the cache key for the given SVG rendered at the given size."""
+        return (os.path.abspath(card_path), width, height, os.stat(card_path).st_mtime_ns)
+
+    def disk_path(self, key):
+        """Returns the path of the cached PNG for a given cache key."""
+        card_name = os.path.splitext(os.path.basename(key[0]))[0]
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16] #Distinguishes different paths and modification times with the same name
+        return os.path.join(self.cache_dir, f"{card_name}_{key[1]}x{key[2]}_{digest}.png")
+
+    def rasterise(self, card_path, width, height):
+        """Converts an SVG file to a PIL image resized to the given dimensions."""
+        png_data = svg2png(url=card_path)  # Converts SVG file to binary PNG data
+        image = Image.open(BytesIO(png_data))  # Open binary data as a PIL image
+        return image.resize((width, height), Image.LANCZOS)  # Resize the image
+
+    def load_pil_image(self, key, card_path):
+        """
+        Returns the resized PIL image for a key, reading it from the disk tier if possible
+        and otherwise rasterising the SVG and saving the result to disk.
+        """
+        if self.cache_dir is not None:
+            png_path = self.disk_path(key)
+            if os.path.exists(png_path):
+                self.disk_hits += 1
+                with Image.open(png_path) as image:
+                    image.load()
+                    return image.copy()
+
+        self.misses += 1
+        image = self.rasterise(card_path, key[1], key[2])
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{png_path}.{os.getpid()}.tmp"
+            image.save(temp_path, format="PNG")
+            os.replace(temp_path, png_path) #Swaps the finished file in so a partially written PNG is never read
+
+        return image
+
+    def get(self, card_path, width, height):
+        """
+        Returns a Tkinter-compatible image of the SVG at 'card_path' resized to width x height.
+        """
+        key = self.make_key(card_path, width, height)
+
+        image = self.images.get(key)
+        if image is not None:
+            self.memory_hits += 1
+            self.images.move_to_end(key) #Mark as most recently used
+            return image
+
+        image = ImageTk.PhotoImage(self.load_pil_image(key, card_path))
+        self.images[key] = image
+
+        #Evict the least recently used images once over capacity (labels still showing them keep their own reference)
+        while len(self.images) > self.max_entries:
+            self.images.popitem(last=False)
+            self.evictions += 1
+
+        return image
+
+    def stats(self):
+        """Returns the cache counters as a dictionary."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.images),
+        }
+
+    def clear(self):
+        """Empties the in-memory tier (the disk tier is left in place)."""
+        self.images.clear()
+
+
+card_image_cache = CardImageCache() #Shared by every card window so each image is only loaded once
 
 
 class CardsWindowBase:
@@ -20,6 +130,9 @@ class CardsWindowBase:
 
         # Attributes for card display
         self.card_labels = [] #Stores card labels for easy access/clearing
+        self.card_label_paths = [] #Stores the image path currently shown by each card label
+        self.card_y_position = None #The y position the card labels are currently placed at
+        self.window_size = None #The (width, height) last applied to the window geometry
         self.card_width = CARD_WIDTH 
         self.card_height = CARD_HEIGHT
         self.card_padding = CARD_PADDING #Padding between cards
@@ -30,148 +143,106 @@ class CardsWindowBase:
 
     def load_card_image(self, card_path):
         """ 
-        Loads a card image from an SVG file and resizes it for Tkinter. 
+        Loads a card image from an SVG file, resized for Tkinter, via the shared image cache. 
         
         Args:
             card_path (str): the path to the card image to load
         """
         try:
-            #Converting the SVG to PNG
-            png_data = svg2png(url=card_path)  # Converts SVG file to binary PNG data
-            image = Image.open(BytesIO(png_data))  # Open binary data as a PIL image
-            image = image.resize((self.card_width, self.card_height), Image.LANCZOS)  # Resize the image
-            return ImageTk.PhotoImage(image)  # Convert to tkinter-compatible format
+            #Pull the image from the shared cache, only converting the SVG if it's not been loaded before
+            return card_image_cache.get(card_path, self.card_width, self.card_height)
         except Exception as e:
             print(f"Error loading card image: {e}")
             raise
 
-    def display_cards(self, cards):
+    def card_image_path(self, card, revealed):
+        """Returns the path to the image for a card, which is the card back if it hasn't been revealed."""
+        if revealed:
+            return f"{CARD_IMAGES_PATH}{card.get_filename()}.svg" 
+        return CARD_BACK_IMAGE_PATH
+
+    def update_card_labels(self, hand, card_y_position):
         """ 
-        Displays the cards in the window by removing all existing card images and adding new ones back in iteratively.
-        """
-        # Clear all existing card labels
-        for label in self.card_labels:
-            label.destroy()
-        self.card_labels.clear()
+        Brings the card labels in line with the given cards, only doing Tk work for what has changed:
+        - A label is created for each new card and destroyed for each card no longer in the hand.
+        - A label's image is only swapped if its card's image has changed (e.g. the dealer's hole card being revealed).
+        - Existing labels are only moved if the vertical position of the row of cards has changed.
 
-        # Position to start displaying cards from the left of the window
-        current_x = self.border_padding
+        Args:
+            hand (Hand): The hand whose cards to display, in order.
+            card_y_position (int): The y position of the top of the row of cards.
+        """
+        move_existing_labels = card_y_position != self.card_y_position
+        self.card_y_position = card_y_position
+
+        cards = hand.cards
+
+        # Remove labels for cards that are no longer displayed (e.g. after a split)
+        while len(self.card_labels) > len(cards):
+            self.card_labels.pop().destroy()
+            self.card_label_paths.pop()
+
+        for i, card in enumerate(cards):
+            card_path = self.card_image_path(card, hand.revealed[i])
+
+            if i == len(self.card_labels):
+                # New card, so create a label placed after the previous card
+                card_image = self.load_card_image(card_path) #Load the card image
+                label = tk.Label(self.window, image=card_image) #Label the loaded card image
+                label.image = card_image  # Keep a reference to the image
+                label.place(x=self.border_padding + i * (self.card_width + self.card_padding), y=card_y_position)
+                self.card_labels.append(label) #Add the label to the list of card labels
+                self.card_label_paths.append(card_path)
+                continue
+
+            label = self.card_labels[i]
+            if self.card_label_paths[i] != card_path:
+                # Card has changed or been revealed, so swap the image in place
+                card_image = self.load_card_image(card_path)
+                label.config(image=card_image)
+                label.image = card_image
+                self.card_label_paths[i] = card_path
+
+            if move_existing_labels:
+                label.place(x=self.border_padding + i * (self.card_width + self.card_padding), y=card_y_position)
+
+    def cards_width(self, num_cards):
+        """
+        Calculates the width of the window as the last card plus padding (or the space for two cards and padding if there's only one card)
+        """
+        current_x = self.border_padding + num_cards * (self.card_width + self.card_padding)
+        return max(current_x - self.card_padding + self.border_padding,3*self.card_padding+2*self.card_width)
 
-        # Loop through each card and display it with correct spacing
-        for card in cards:
-            
-            #Pull the correct card paths based on whether the card is revealed or not
-            if card.revealed:
-                card_path = f"{CARD_IMAGES_PATH}{card.get_filename()}.svg" 
-            else:
-                card_path = CARD_BACK_IMAGE_PATH
+    def resize_window(self, total_width, total_height):
+        """
+        Updates the window geometry to the given size, skipping the call if the size hasn't changed.
+        """
+        self.total_width = total_width
+        self.total_height = total_height
 
-            card_image = self.load_card_image(card_path) #Load the card image
+        if self.window_size != (total_width, total_height):
+            self.window_size = (total_width, total_height)
+            self.window.geometry(f"{total_width}x{total_height}")
 
-            label = tk.Label(self.window, image=card_image) #Label the loaded card image
-            label.image = card_image  # Keep a reference to the image
-            label.place(x=current_x, y=self.border_padding) #Place the card image in the window
-            self.card_labels.append(label) #Add the label to the list of card labels
+    def display_cards(self, hand):
+        """ 
+        Displays the cards of a hand in the window, updating only the card labels that have changed since the last call.
+        """
+        self.update_card_labels(hand, self.border_padding)
 
-            current_x += self.card_width + self.card_padding #Update the next card's starting x position 
-        
         # Calculate the total size of the window based on the number of cards displayed
-        total_width = max(current_x - self.card_padding + self.border_padding,3*self.card_padding+2*self.card_width) #Calculates the width of the window as the last card plus padding (or the space for two cards and padding if there's only one card)
+        total_width = self.cards_width(len(hand.cards))
         total_height = self.card_height + 2* self.border_padding
 
         # Update the window geometry to fit the cards
-        self.total_width = total_width
-        self.total_height = total_height
-        self.window.geometry(f"{total_width}x{total_height}")
+        self.resize_window(total_width, total_height)
 
-class PlayerHandWindow(CardsWindowBase):
+class PlayerHandControls:
     """
-    A specialised window for managing a player's hand.
-    Includes buttons and labels for interaction, allowing players to perform actions.
+    Mixin with the buttons and score labels logic shared by every display of a player's hand (a window or a seat on the table).
+    Expects 'hit_button', 'stand_button', 'split_button', 'player_hand_value_label' and 'dealer_hand_value_label'
+    configurable like Tkinter widgets, a 'hand_index', and a 'display_cards' method.
     """
-
-    def __init__(self, root, title, x_position, y_position, hand_index, width=800, height=600):
-        """
-        Initialises the player's hand window with buttons.
-
-        Args:
-            hand_index (int): Index of the player's hand (used when multiple hands needed after splitting).
-        """
-        super().__init__(root, title, x_position, y_position, width, height)
-
-        self.hand_index = hand_index #Identifies the hand index for the window
-
-        # Add labels for player and dealer hand totals 
-        self.player_hand_value_label = tk.Label(self.window, text="Player Hand: 0", font=("Arial", 20))
-        self.dealer_hand_value_label = tk.Label(self.window, text="Dealer Hand: Hidden", font=("Arial", 20))
-
-        # Add 'Hit', 'Stand' and 'Split' buttons
-        self.hit_button = tk.Button(self.window, text="Hit", command=self.hit, font=("Arial", 20),width = 10,height=2)
-        self.stand_button = tk.Button(self.window, text="Stand", command=self.stand, font=("Arial", 20),width = 10,height=2)
-        self.split_button = tk.Button(self.window, text="Split", command=self.split, font=("Arial", 20), width=10, height=2, state=tk.DISABLED)
-
-        self.enable_hit_stand_buttons()
-
-        # Placeholders for card labels and game reference
-        self.ui = None
-
-    def display_cards(self, cards):
-        """
-        Overwrites the based class method to include buttons and labels for player interaction.
-        """
-
-        # Clear all existing card labels
-        for label in self.card_labels:
-            label.destroy()
-        self.card_labels.clear()
-
-        # Calculate the total width of the cards section based on number of cards
-        current_x = self.border_padding
-        for card in cards:
-            current_x += self.card_width + self.card_padding
-        total_width = max(current_x - self.card_padding + self.border_padding,3*self.card_padding+2*self.card_width) 
-        self.total_width = total_width  # Update the width 
-
-        # Place score labels initially to get their actual height for spacing
-        label_y_position = self.border_padding
-        self.player_hand_value_label.place(x=self.total_width * 0.25, y=label_y_position, anchor="n") #Puts the player score label 1/4 of the window in from the left
-        self.dealer_hand_value_label.place(x=self.total_width * 0.75, y=label_y_position, anchor="n") #Puts the dealer score label 1/4 of the window in from the right
-
-        # Get the height of the labels after they are placed
-        label_height = max(self.player_hand_value_label.winfo_reqheight(), self.dealer_hand_value_label.winfo_reqheight()) #Extracts the height of the biggest label
-        
-        # Calculate card section position based on label height
-        card_y_position = label_y_position + label_height + self.border_padding
-        current_x = self.border_padding
-
-        # Display the cards correctly spaced as in the base window functionality
-        for card in cards:
-            card_path = f"{CARD_IMAGES_PATH}{card.get_filename()}.svg" if card.revealed else CARD_BACK_IMAGE_PATH
-            card_image = self.load_card_image(card_path)
-            label = tk.Label(self.window, image=card_image)
-            label.image = card_image  
-            label.place(x=current_x, y=card_y_position)
-            self.card_labels.append(label)
-            current_x += self.card_width + self.card_padding
-        
-        # Place hit and stand buttons 
-        button_y_position = card_y_position + self.card_height + self.border_padding
-        self.hit_button.place(x=total_width * 0.25, y=button_y_position, anchor='n') #Puts the hit button 1/4 of the window in from the left
-        self.stand_button.place(x=total_width * 0.75, y=button_y_position, anchor='n') #Puts the stand button 1/4 of the window in from the right
-
-        # Get button height (assuming both buttons have the same height)
-        button_height = self.hit_button.winfo_reqheight()
-
-        #Place the split button using spacing from the hit and stand buttons
-        self.split_button.place(x=total_width * 0.25 , y=button_y_position + button_height + self.border_padding , anchor='n')
-
-        # Calculate the total height required for the window
-        total_height = button_y_position + 2* button_height + 3 * self.border_padding
-        self.total_height = total_height  # Update the window height 
-
-        # Update the window geometry to fit all elements
-        self.window.geometry(f"{total_width}x{total_height}")
-
     def set_game_reference(self, ui):
         """ 
         Connect the player hand window to the game controller. 
@@ -184,11 +255,8 @@ class PlayerHandWindow(CardsWindowBase):
         """
         if self.ui:
             
-            #Try to deal card
-            self.ui.game.current_hand.deal_card_to_player(self.hand_index)
-            
-            #Check if the player has busted
-            self.ui.game.current_hand.check_bust(self.hand_index)
+            #Deal a card, checking if the player has busted
+            self.ui.game.current_hand.player_hits(self.hand_index)
             
             #Check if the player's turn is over
             if self.ui.game.current_hand.player_hand_turn_over[self.hand_index]:
@@ -259,13 +327,104 @@ class PlayerHandWindow(CardsWindowBase):
         else:
             self.disable_split_button()
 
+        #Hands made by splitting aces only receive one more card
+        if self.ui and self.ui.game.current_hand.split_from_aces[self.hand_index]:
+            self.hit_button.config(state=tk.DISABLED, bg=BUTTON_DISABLED_COLOUR, fg=BUTTON_TEXT_COLOUR)
+
     def reset_window(self):
         """Reset the window for a new round."""
         self.enable_hit_stand_buttons()  # Re-enable hit and stand buttons for the new round
         self.disable_split_button()  # Disable split button initially
-        self.display_cards([])  # Clear displayed cards
+        self.display_cards(Hand())  # Clear displayed cards
         self.update_hand_value_labels(0, 0, dealer_revealed=False)  # Reset hand values
 
+
+class PlayerHandWindow(PlayerHandControls, CardsWindowBase):
+    """
+    A specialised window for managing a player's hand.
+    Includes buttons and labels for interaction, allowing players to perform actions.
+    """
+
+    def __init__(self, root, title, x_position, y_position, hand_index, width=800, height=600):
+        """
+        Initialises the player's hand window with buttons.
+
+        Args:
+            hand_index (int): Index of the player's hand (used when multiple hands needed after splitting).
+        """
+        super().__init__(root, title, x_position, y_position, width, height)
+
+        self.hand_index = hand_index #Identifies the hand index for the window
+
+        # Add labels for player and dealer hand totals 
+        self.player_hand_value_label = tk.Label(self.window, text="Player Hand: 0", font=("Arial", 20))
+        self.dealer_hand_value_label = tk.Label(self.window, text="Dealer Hand: Hidden", font=("Arial", 20))
+
+        # Add 'Hit', 'Stand' and 'Split' buttons
+        self.hit_button = tk.Button(self.window, text="Hit", command=self.hit, font=("Arial", 20),width = 10,height=2)
+        self.stand_button = tk.Button(self.window, text="Stand", command=self.stand, font=("Arial", 20),width = 10,height=2)
+        self.split_button = tk.Button(self.window, text="Split", command=self.split, font=("Arial", 20), width=10, height=2, state=tk.DISABLED)
+
+        self.enable_hit_stand_buttons()
+
+        # Layout of the labels and buttons, calculated when the window width changes
+        self.controls_width = None
+        self.controls_card_y_position = None
+        self.controls_height = None
+
+        # Placeholders for card labels and game reference
+        self.ui = None
+
+    def display_cards(self, hand):
+        """
+        Overwrites the based class method to include buttons and labels for player interaction.
+        The labels and buttons are only re-placed when the width of the window changes.
+        """
+
+        # Calculate the total width of the cards section based on number of cards
+        total_width = self.cards_width(len(hand.cards))
+        if total_width != self.controls_width:
+            self.layout_controls(total_width)
+
+        # Display the cards correctly spaced as in the base window functionality
+        self.update_card_labels(hand, self.controls_card_y_position)
+
+        # Update the window geometry to fit all elements
+        self.resize_window(total_width, self.controls_height)
+
+    def layout_controls(self, total_width):
+        """
+        Places the score labels and buttons around the cards for a window of the given width.
+        """
+        self.controls_width = total_width
+
+        # Place score labels initially to get their actual height for spacing
+        label_y_position = self.border_padding
+        self.player_hand_value_label.place(x=total_width * 0.25, y=label_y_position, anchor="n") #Puts the player score label 1/4 of the window in from the left
+        self.dealer_hand_value_label.place(x=total_width * 0.75, y=label_y_position, anchor="n") #Puts the dealer score label 1/4 of the window in from the right
+
+        # Get the height of the labels after they are placed
+        label_height = max(self.player_hand_value_label.winfo_reqheight(), self.dealer_hand_value_label.winfo_reqheight()) #Extracts the height of the biggest label
+        
+        # Calculate card section position based on label height
+        card_y_position = label_y_position + label_height + self.border_padding
+        self.controls_card_y_position = card_y_position
+        
+        # Place hit and stand buttons 
+        button_y_position = card_y_position + self.card_height + self.border_padding
+        self.hit_button.place(x=total_width * 0.25, y=button_y_position, anchor='n') #Puts the hit button 1/4 of the window in from the left
+        self.stand_button.place(x=total_width * 0.75, y=button_y_position, anchor='n') #Puts the stand button 1/4 of the window in from the right
+
+        # Get button height (assuming both buttons have the same height)
+        button_height = self.hit_button.winfo_reqheight()
+
+        #Place the split button using spacing from the hit and stand buttons
+        self.split_button.place(x=total_width * 0.25 , y=button_y_position + button_height + self.border_padding , anchor='n')
+
+        # Calculate the total height required for the window
+        self.controls_height = button_y_position + 2* button_height + 3 * self.border_padding
+
+
 class DealerHandWindow(CardsWindowBase):
     def __init__(self, root, title, x_position, y_position, width=800, height=400):
         # Call the base class constructor
@@ -320,9 +479,266 @@ class ControlWindow:
         self.ui.root.quit()
 
 
-class BlackjackUI:
+class UIUpdateScheduler:
+    """
+    Coalesces UI update requests into a single render pass per turn of the Tk event loop.
+
+    Each request marks part of the UI as dirty and, if no pass is pending, schedules one with `after_idle`.
+    Any further requests before that pass runs are merged into it and counted as skipped passes.
+    """
+    def __init__(self, root, render):
+        """
+        Args:
+            root (Tk object): Root Tkinter window used for scheduling.
+            render (callable): Called with the set of dirty parts to redraw them.
+        """
+        self.root = root
+        self.render = render
+        self.dirty = set() #Parts of the UI waiting to be redrawn
+        self.pending = None #Identifier of the scheduled render pass (None if nothing is scheduled)
+
+        # Counters for how much work the scheduler has saved
+        self.requests = 0
+        self.render_passes = 0
+        self.skipped_passes = 0
+
+    def request(self, *parts):
+        """Marks the given parts of the UI as dirty and schedules a render pass if one isn't already pending."""
+        self.requests += 1
+        self.dirty.update(parts)
+
+        if self.pending is None:
+            self.pending = self.root.after_idle(self.flush)
+        else:
+            self.skipped_passes += 1 #Merged into the pass that is already scheduled
+
+    def flush(self):
+        """Runs the pending render pass now (does nothing if nothing is dirty)."""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending) #No-op when called from the scheduled pass itself
+            self.pending = None
+
+        if not self.dirty:
+            return
+
+        dirty, self.dirty = self.dirty, set()
+        self.render_passes += 1
+        self.render(dirty)
+
+    def stats(self):
+        """Returns the scheduler counters as a dictionary."""
+        return {
+            "requests": self.requests,
+            "render_passes": self.render_passes,
+            "skipped_passes": self.skipped_passes,
+        }
+
+
+class AnimationQueue:
+    """
+    Plays queued UI steps one after another with a pause before each, using `after` so the event loop stays responsive.
+
+    The game state is always settled before its steps are queued, so the steps only change what is shown.
+    Skipping runs every remaining step at once, jumping straight to the final state.
+    """
+    def __init__(self, root, delay_ms=DEALER_CARD_DELAY_MS):
+        """
+        Args:
+            root (Tk object): Root Tkinter window used for scheduling.
+            delay_ms (int): Default pause in milliseconds before each step (0 runs steps as soon as they are queued).
+        """
+        self.root = root
+        self.delay_ms = delay_ms
+        self.steps = deque() #(pause in milliseconds, callable) of each step waiting to run
+        self.pending = None #Identifier of the scheduled step (None if nothing is scheduled)
+
+    def push(self, step, delay_ms=None):
+        """
+        Queues a step to run 'delay_ms' milliseconds (the queue's default if None) after the previous one.
+        A step with no pause and nothing ahead of it runs immediately.
+        """
+        delay_ms = self.delay_ms if delay_ms is None else delay_ms
+        if delay_ms <= 0 and not self.busy():
+            step()
+            return
+
+        self.steps.append((delay_ms, step))
+        if self.pending is None:
+            self.schedule_next()
+
+    def schedule_next(self):
+        """Schedules the next queued step after its pause."""
+        delay_ms = self.steps[0][0]
+        self.pending = self.root.after(delay_ms, self.run_next)
+
+    def run_next(self):
+        """Runs the next queued step and schedules the one after it."""
+        self.pending = None
+        _, step = self.steps.popleft()
+        step()
+        if self.steps:
+            self.schedule_next()
+
+    def busy(self):
+        """Returns True if any steps are still waiting to run."""
+        return bool(self.steps)
+
+    def skip(self):
+        """Cancels the scheduled step and runs every remaining step immediately."""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+
+        while self.steps:
+            _, step = self.steps.popleft()
+            step()
+
+
+class BlackjackUIBase:
+    """
+    Base class for the Blackjack UIs, with everything that doesn't depend on how the table is drawn:
+    coalescing update requests into render passes, animating the dealer's cards and drawing the hands from the game state.
+    Subclasses create the 'dealer_display' and 'player_displays' and lay them out in 'layout'.
+    """
+
+    def __init__(self, game, root):
+        """
+        Args:
+            game (Blackjack_Game): The main game object that manages gameplay logic.
+            root (Tk object): Root Tkinter window.
+        """
+        self.root = root
+        self.game = game
+
+        # Merges the updates requested while handling an event into one redraw
+        self.scheduler = UIUpdateScheduler(self.root, self.render)
+
+        # Shows the dealer's cards one at a time after the round has already been settled
+        self.animations = AnimationQueue(self.root)
+        self.dealer_view = None #Snapshot of the dealer's hand shown while the dealer's cards are being animated (None shows the current hand)
+
+    def request_update(self, *parts):
+        """
+        Requests a redraw of the given parts of the UI ("player", "dealer", "labels" or "layout") in the next render pass.
+        """
+        self.scheduler.request(*parts)
+
+    def render(self, dirty):
+        """
+        Redraws the dirty parts of the UI and lays out the table once for the whole pass.
+        """
+        if self.game.current_hand is None:
+            return
+
+        if "player" in dirty:
+            self.render_player()
+        if "dealer" in dirty:
+            self.render_dealer()
+        if "labels" in dirty:
+            self.render_all_hand_value_labels()
+
+        self.layout()
+
+    def layout(self):
+        """Positions the dealer's hand, the player's hands and the controls for the current number of hands."""
+        raise NotImplementedError
+
+    def update_dealer(self):
+        """
+        Requests an update of the dealer's card display in the next render pass
+        """
+        self.request_update("dealer")
+
+    def update_player(self):
+        """
+        Requests an update of the player's card displays in the next render pass
+        """
+        self.request_update("player")
+    
+    def update_all_hand_value_labels(self):
+        """
+        Requests an update of the hand value labels in the next render pass
+        """
+        self.request_update("labels")
+
+    def animate_dealer_hand(self, hand, delay_ms=None):
+        """
+        Queues the dealer's hand as it is now to be shown after the previously queued dealer cards.
+
+        Args:
+            hand (Hand): The dealer's hand (a snapshot is taken, so it can keep changing).
+            delay_ms (int): Pause before it's shown in milliseconds (DEALER_CARD_DELAY_MS if None).
+        """
+        snapshot = hand.copy()
+        self.animations.push(lambda: self.show_dealer_view(snapshot), delay_ms)
+
+    def finish_dealer_animation(self):
+        """Queues the return to showing the current hands once the queued dealer cards have been shown."""
+        self.animations.push(lambda: self.show_dealer_view(None), 0)
+
+    def show_dealer_view(self, hand):
+        """Shows the given snapshot in place of the dealer's current hand (None goes back to the current hands)."""
+        self.dealer_view = hand
+        self.request_update("player", "dealer", "labels")
+
+    def skip_animations(self):
+        """Jumps any animation still playing straight to its final state."""
+        self.animations.skip()
+        self.dealer_view = None
+
+    def dealer_hand(self):
+        """Returns the dealer's hand as it should currently be shown."""
+        if self.dealer_view is not None:
+            return self.dealer_view
+        return self.game.current_hand.dealer_card_set
+
+    def render_dealer(self):
+        """
+        Updates the dealer's card display with current cards
+        """
+        self.dealer_display.display_cards(self.dealer_hand())
+
+    def render_player(self):
+        """
+        Updates the player's card displays.
+        """
+        # Update the player windows with the current hands
+        for i, player_window in enumerate(self.player_displays):
+            player_window.display_cards(self.game.current_hand.player_hands[i])
+            player_window.update_buttons()
+
+        # Check if the split button should be enabled on each hand in play
+        for i, hand in enumerate(self.game.current_hand.player_hands):
+            if self.game.current_hand.can_split(i):
+                self.player_displays[i].enable_split_button()
+                break
+        else:
+            self.player_displays[i].disable_split_button()
+    
+    def render_all_hand_value_labels(self):
+        """
+        Updates the hand value labels for all player hands and checks on the dealer's hand reveal status.
+        """
+        #Check dealer total and reveal status
+        dealer_hand = self.dealer_hand()
+        dealer_total = dealer_hand.total()
+        dealer_revealed = dealer_hand.all_revealed()
+
+        #Update player hand values
+        for i, hand in enumerate(self.game.current_hand.player_hands):
+            player_total = hand.total()  # Calculate the total for this hand
+            self.player_displays[i].update_hand_value_labels(player_total, dealer_total, dealer_revealed)
+
+    def mainloop(self):
+        """
+        Starts the Tkinter main event loop to keep the UI running.
+        """
+        self.root.mainloop()
+
+
+class BlackjackUI(BlackjackUIBase):
     """
-    Main UI class to create and manage the card display windows for the dealer and player.
+    UI that shows the dealer's hand, each of the player's hands and the game controls in separate windows.
     """
 
     def __init__(self,game):
@@ -334,11 +750,9 @@ class BlackjackUI:
         """
         
         # Create root window and hide it since we only need child windows
-        self.root = tk.Tk()
+        super().__init__(game, tk.Tk())
         self.root.withdraw()
 
-        self.game = game
-
         # Calculate central point on the screen for the cards (1/2 in both directions used but could be anywhere)
         self.x_center_cards = self.root.winfo_screenwidth() // 2
         self.y_center_cards = self.root.winfo_screenheight() // 2
@@ -376,6 +790,10 @@ class BlackjackUI:
         player_window = PlayerHandWindow(self.root, f"Player's Hand {hand_index + 1}", 0, 0, hand_index)
         player_window.set_game_reference(self)
         self.player_displays.append(player_window)
+        self.request_update("layout")
+
+    def layout(self):
+        """Centers the windows for the current number of hands."""
         self.center_windows()
 
     def center_windows(self):
@@ -437,63 +855,403 @@ class BlackjackUI:
         #Place the control window in the calculated position
         self.control_window.window.geometry(f"{self.control_window.width}x{self.control_window.height}+{x_c}+{y_c}")
 
-    def update_dealer(self):
+    def reset_player_windows(self):
+        """Reset the player windows to match a single hand."""
+        
+        # Destroy all current player windows
+        for player_window in self.player_displays:
+            player_window.window.destroy()
+        self.player_displays.clear()
+
+        # Create a single player window
+        player_window = PlayerHandWindow(self.root, "Player's Hand 1", 0, 0, 0)
+        player_window.set_game_reference(self)
+        self.player_displays.append(player_window)
+
+        self.request_update("layout")
+
+
+class CanvasButton:
+    """
+    A button drawn on a canvas as a rectangle and its text, configured like a tk.Button (state, bg and fg),
+    so the table needs no child widgets.
+    """
+    def __init__(self, canvas, text, command, tags=(), width=TABLE_BUTTON_WIDTH, height=TABLE_BUTTON_HEIGHT, bg=BUTTON_ACTIVE_COLOUR, fg=BUTTON_TEXT_COLOUR, state=tk.NORMAL):
+        """
+        Args:
+            canvas (tk.Canvas): Canvas to draw the button on.
+            text (str): Text on the button.
+            command (callable): Called when the button is clicked while enabled.
+            tags (tuple): Canvas tags for the button's items (e.g. so it moves with the rest of a hand).
+            width (int): Width of the button in pixels.
+            height (int): Height of the button in pixels.
+        """
+        self.canvas = canvas
+        self.command = command
+        self.width = width
+        self.height = height
+        self.state = state
+        self.colours = (bg, fg) #Current (background, text) colours, so unchanged configs skip the canvas call
+
+        self.rectangle = canvas.create_rectangle(0, 0, width, height, fill=bg, outline="", tags=tags)
+        self.text = canvas.create_text(width // 2, height // 2, text=text, fill=fg, font=("Arial", 20), tags=tags)
+        for item in (self.rectangle, self.text):
+            canvas.tag_bind(item, "<Button-1>", self.click)
+
+    def click(self, event):
+        """Runs the button's command unless it's disabled."""
+        if self.state != tk.DISABLED:
+            self.command()
+
+    def config(self, state=None, bg=None, fg=None):
+        """Changes the button's state and colours (like tk.Button.config)."""
+        if state is not None:
+            self.state = state
+
+        colours = (bg or self.colours[0], fg or self.colours[1])
+        if colours != self.colours:
+            self.colours = colours
+            self.canvas.itemconfig(self.rectangle, fill=colours[0])
+            self.canvas.itemconfig(self.text, fill=colours[1])
+
+    def place(self, x, y):
+        """Moves the button so the middle of its top edge is at (x, y)."""
+        left = x - self.width // 2
+        self.canvas.coords(self.rectangle, left, y, left + self.width, y + self.height)
+        self.canvas.coords(self.text, x, y + self.height // 2)
+
+
+class CanvasLabel:
+    """A line of text on a canvas, configured like a tk.Label."""
+    def __init__(self, canvas, text, tags=()):
         """
-        Updates the dealer's card display window with current cards
+        Args:
+            canvas (tk.Canvas): Canvas to draw the text on.
+            text (str): Initial text.
+            tags (tuple): Canvas tags for the text item.
         """
-        self.dealer_display.display_cards(self.game.current_hand.dealer_card_set.cards)
+        self.canvas = canvas
+        self.text = text
+        self.item = canvas.create_text(0, 0, text=text, anchor="n", fill=TABLE_TEXT_COLOUR, font=("Arial", 20), tags=tags)
 
-        self.center_windows()  
+        x1, y1, x2, y2 = canvas.bbox(self.item)
+        self.height = y2 - y1
 
-    def update_player(self):
+    def config(self, text):
+        """Changes the text, skipping the canvas call if it hasn't changed."""
+        if text != self.text:
+            self.text = text
+            self.canvas.itemconfig(self.item, text=text)
+
+    def place(self, x, y):
+        """Moves the text so the middle of its top edge is at (x, y)."""
+        self.canvas.coords(self.item, x, y)
+
+
+class CanvasHandArea:
+    """
+    Base class for a hand drawn on the table canvas (player or dealer): an outline with a row of card images inside it.
+    Every item of the area shares the area's tag, so the whole area moves with a single canvas call,
+    and the cards are kept in line with the hand with as few canvas calls as possible.
+    """
+    # Card images and sizes are worked out exactly as for the windows
+    load_card_image = CardsWindowBase.load_card_image
+    card_image_path = CardsWindowBase.card_image_path
+    cards_width = CardsWindowBase.cards_width
+
+    def __init__(self, canvas, tag):
         """
-        Updates the player's card display window.
+        Args:
+            canvas (tk.Canvas): The table canvas.
+            tag (str): Canvas tag shared by every item of the area.
         """
-        # Update the player windows with the current hands
-        for i, player_window in enumerate(self.player_displays):
-            player_window.display_cards(self.game.current_hand.player_hands[i].cards)
-            player_window.update_buttons()
+        self.canvas = canvas
+        self.tag = tag
+        self.x = 0 #Position of the top left corner of the area on the canvas
+        self.y = 0
+
+        self.card_items = [] #Canvas image item of each card shown
+        self.card_item_paths = [] #Image path shown by each card item
+        self.card_item_images = [] #Image shown by each card item (the canvas doesn't keep a reference itself)
+        self.card_y_position = None #The y position of the row of cards within the area
+        self.card_width = CARD_WIDTH
+        self.card_height = CARD_HEIGHT
+        self.card_padding = CARD_PADDING
+        self.border_padding = BORDER_PADDING
 
-        # Check if the split button should be enabled on each hand in play
-        for i, hand in enumerate(self.game.current_hand.player_hands):
-            if self.game.current_hand.can_split(i):
-                self.player_displays[i].enable_split_button()
-                break
-        else:
-            self.player_displays[i].disable_split_button()
+        self.total_width = DEFAULT_WINDOW_WIDTH
+        self.total_height = DEFAULT_WINDOW_HEIGHT
+        self.outline = canvas.create_rectangle(0, 0, self.total_width, self.total_height, outline=TABLE_TEXT_COLOUR, width=2, tags=(tag,))
 
-        self.center_windows() 
-    
-    def update_all_hand_value_labels(self):
+    def update_card_items(self, hand, card_y_position):
         """
-        Updates the hand value labels for all player hands and checks on the dealer's hand reveal status.
+        Brings the card items in line with the given cards, only doing canvas work for what has changed:
+        - An image item is created for each new card and deleted for each card no longer in the hand.
+        - An item's image is only swapped if its card's image has changed (e.g. the dealer's hole card being revealed).
+        - Existing items are only moved if the vertical position of the row of cards has changed.
+
+        Args:
+            hand (Hand): The hand whose cards to display, in order.
+            card_y_position (int): The y position of the top of the row of cards within the area.
         """
-        #Check dealer total and reveal status
-        dealer_total = self.game.current_hand.dealer_card_set.total()
-        dealer_revealed = all(card.revealed for card in self.game.current_hand.dealer_card_set.cards)
+        move_existing_items = card_y_position != self.card_y_position
+        self.card_y_position = card_y_position
+        y = self.y + card_y_position
+
+        cards = hand.cards
+
+        # Remove items for cards that are no longer displayed (e.g. after a split)
+        while len(self.card_items) > len(cards):
+            self.canvas.delete(self.card_items.pop())
+            self.card_item_paths.pop()
+            self.card_item_images.pop()
+
+        for i, card in enumerate(cards):
+            card_path = self.card_image_path(card, hand.revealed[i])
+            x = self.x + self.border_padding + i * (self.card_width + self.card_padding)
+
+            if i == len(self.card_items):
+                # New card, so create an image item placed after the previous card
+                card_image = self.load_card_image(card_path)
+                self.card_items.append(self.canvas.create_image(x, y, image=card_image, anchor="nw", tags=(self.tag,)))
+                self.card_item_paths.append(card_path)
+                self.card_item_images.append(card_image)
+                continue
+
+            if self.card_item_paths[i] != card_path:
+                # Card has changed or been revealed, so swap the image in place
+                card_image = self.load_card_image(card_path)
+                self.canvas.itemconfig(self.card_items[i], image=card_image)
+                self.card_item_paths[i] = card_path
+                self.card_item_images[i] = card_image
+
+            if move_existing_items:
+                self.canvas.coords(self.card_items[i], x, y)
+
+    def resize(self, total_width, total_height):
+        """Resizes the outline of the area (skipping the canvas call if the size hasn't changed)."""
+        if (total_width, total_height) != (self.total_width, self.total_height):
+            self.total_width = total_width
+            self.total_height = total_height
+            self.canvas.coords(self.outline, self.x, self.y, self.x + total_width, self.y + total_height)
+
+    def place(self, x, y):
+        """Moves the whole area so its top left corner is at (x, y)."""
+        if (x, y) != (self.x, self.y):
+            self.canvas.move(self.tag, x - self.x, y - self.y)
+            self.x = x
+            self.y = y
+
+    def show(self):
+        """Shows every item of the area."""
+        self.canvas.itemconfig(self.tag, state=tk.NORMAL)
+
+    def hide(self):
+        """Hides every item of the area (hidden items also ignore clicks)."""
+        self.canvas.itemconfig(self.tag, state=tk.HIDDEN)
+
+
+class DealerArea(CanvasHandArea):
+    """The dealer's hand on the table canvas."""
+    def __init__(self, canvas):
+        super().__init__(canvas, "dealer")
+
+    def display_cards(self, hand):
+        """
+        Displays the cards of the dealer's hand, updating only the card items that have changed since the last call.
+        """
+        self.update_card_items(hand, self.border_padding)
+        self.resize(self.cards_width(len(hand.cards)), self.card_height + 2 * self.border_padding)
 
-        #Update player hand values
-        for i, hand in enumerate(self.game.current_hand.player_hands):
-            player_total = hand.total()  # Calculate the total for this hand
-            self.player_displays[i].update_hand_value_labels(player_total, dealer_total, dealer_revealed)
 
-    def mainloop(self):
+class PlayerSeat(PlayerHandControls, CanvasHandArea):
+    """
+    One of the player's hands on the table canvas, with its score labels and buttons drawn alongside the cards.
+    Seats are kept when a round ends and reused by later rounds, so splitting never creates new canvas items for the labels and buttons.
+    """
+    def __init__(self, canvas, hand_index):
         """
-        Starts the Tkinter main event loop to keep the UI running.
+        Args:
+            canvas (tk.Canvas): The table canvas.
+            hand_index (int): Index of the player's hand the seat shows.
         """
-        self.root.mainloop()
+        super().__init__(canvas, f"seat{hand_index}")
+        tags = (self.tag,)
+
+        self.hand_index = hand_index
+
+        # Add labels for player and dealer hand totals
+        self.player_hand_value_label = CanvasLabel(canvas, "Player Hand: 0", tags)
+        self.dealer_hand_value_label = CanvasLabel(canvas, "Dealer Hand: Hidden", tags)
+
+        # Add 'Hit', 'Stand' and 'Split' buttons
+        self.hit_button = CanvasButton(canvas, "Hit", self.hit, tags)
+        self.stand_button = CanvasButton(canvas, "Stand", self.stand, tags)
+        self.split_button = CanvasButton(canvas, "Split", self.split, tags, bg=BUTTON_DISABLED_COLOUR, state=tk.DISABLED)
+
+        self.enable_hit_stand_buttons()
+
+        # Layout of the labels and buttons within the seat, calculated when the seat's width changes
+        self.controls_width = None
+        self.controls_card_y_position = None
+        self.controls_height = None
+
+        self.ui = None
+
+    def display_cards(self, hand):
+        """
+        Displays the cards of the hand, re-placing the labels and buttons only when the width of the seat changes.
+        """
+        total_width = self.cards_width(len(hand.cards))
+        if total_width != self.controls_width:
+            self.layout_controls(total_width)
+
+        self.update_card_items(hand, self.controls_card_y_position)
+        self.resize(total_width, self.controls_height)
+
+    def layout_controls(self, total_width):
+        """
+        Places the score labels and buttons around the cards for a seat of the given width.
+        """
+        self.controls_width = total_width
+        x = self.x
+        y = self.y
+
+        # Score labels go along the top, 1/4 of the seat in from each side
+        label_y_position = self.border_padding
+        self.player_hand_value_label.place(x + total_width // 4, y + label_y_position)
+        self.dealer_hand_value_label.place(x + total_width * 3 // 4, y + label_y_position)
+        label_height = max(self.player_hand_value_label.height, self.dealer_hand_value_label.height)
+
+        # The cards go below the labels
+        card_y_position = label_y_position + label_height + self.border_padding
+        self.controls_card_y_position = card_y_position
+
+        # Hit and stand buttons go below the cards, with the split button under the hit button
+        button_y_position = card_y_position + self.card_height + self.border_padding
+        button_height = self.hit_button.height
+        self.hit_button.place(x + total_width // 4, y + button_y_position)
+        self.stand_button.place(x + total_width * 3 // 4, y + button_y_position)
+        self.split_button.place(x + total_width // 4, y + button_y_position + button_height + self.border_padding)
+
+        self.controls_height = button_y_position + 2 * button_height + 3 * self.border_padding
+
+
+class TableUI(BlackjackUIBase):
+    """
+    UI that draws the whole table (the dealer's hand, each of the player's hands and the game controls) on a single canvas.
+
+    Hands are canvas items rather than windows, so laying out the table only changes item coordinates,
+    and the seats made for split hands are hidden at the end of a round and reused rather than destroyed and recreated.
+    """
+
+    def __init__(self, game):
+        """
+        Creates the table window and canvas.
+
+        Args:
+            game (Blackjack_Game): The main game object that manages gameplay logic.
+        """
+        super().__init__(game, tk.Tk())
+        self.root.title("Blackjack")
+
+        # The table fills the screen, with the cards centred on it
+        width = self.root.winfo_screenwidth()
+        height = self.root.winfo_screenheight()
+        self.root.geometry(f"{width}x{height}+0+0")
+        self.canvas = tk.Canvas(self.root, width=width, height=height, bg=TABLE_COLOUR, highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+
+        self.x_center_cards = width // 2
+        self.y_center_cards = height // 2
+        self.x_center_controls = width // 4
+        self.window_padding = WINDOW_PADDING #This is the vertical gap between the dealer's and player's hands
+
+        self.dealer_display = DealerArea(self.canvas)
+
+        # Seats made so far (kept between rounds) and the ones in use this round
+        self.seats = []
+        self.player_displays = []
+        self.add_player_window(0)
+
+        # 'New Game' and 'Quit' buttons, which move together to the left of the dealer's hand
+        self.new_game_button = CanvasButton(self.canvas, "New Game", self.new_game, ("controls",), bg="green")
+        self.quit_button = CanvasButton(self.canvas, "Quit", self.quit_game, ("controls",), bg="red")
+        self.controls_x = 0
+        self.controls_y = 0
+        button_padding = 20
+        self.new_game_button.place(button_padding + TABLE_BUTTON_WIDTH // 2, button_padding)
+        self.quit_button.place(2 * button_padding + TABLE_BUTTON_WIDTH * 3 // 2, button_padding)
+        self.controls_width = 2 * TABLE_BUTTON_WIDTH + 3 * button_padding
+        self.controls_height = TABLE_BUTTON_HEIGHT + 2 * button_padding
+
+        self.layout()
+
+    def new_game(self):
+        """Starts a new hand of the game."""
+        self.game.start_new_hand()
+
+    def quit_game(self):
+        """Quits the game by destroying the main window."""
+        self.root.quit()
+
+    def add_player_window(self, hand_index):
+        """
+        Brings another seat into play, typically after a split, reusing a seat from an earlier round if there is one.
+
+        Args:
+            hand_index (int): The index of the new hand.
+        """
+        if hand_index == len(self.seats):
+            seat = PlayerSeat(self.canvas, hand_index)
+            seat.set_game_reference(self)
+            self.seats.append(seat)
+
+        seat = self.seats[hand_index]
+        seat.reset_window()
+        seat.show()
+        self.player_displays.append(seat)
+        self.request_update("layout")
 
     def reset_player_windows(self):
-        """Reset the player windows to match a single hand."""
-        
-        # Destroy all current player windows
-        for player_window in self.player_displays:
-            player_window.window.destroy()
-        self.player_displays.clear()
+        """Puts the table back to a single seat, hiding the seats of any split hands."""
+        for seat in self.player_displays[1:]:
+            seat.hide()
+        del self.player_displays[1:]
 
-        # Create a single player window
-        player_window = PlayerHandWindow(self.root, "Player's Hand 1", 0, 0, 0)
-        player_window.set_game_reference(self)
-        self.player_displays.append(player_window)
+        self.player_displays[0].reset_window()
+        self.request_update("layout")
 
-        self.center_windows()
+    def layout(self):
+        """
+        Positions the hands on the table (as BlackjackUI.center_windows does for the windows):
+        - The dealer's hand sits above the player's hands, with the two rows centred vertically together.
+        - The player's hands are spaced out in a row centred horizontally.
+        - The controls sit to the left of the dealer's hand.
+        """
+        dealer = self.dealer_display
+        seat_height = self.player_displays[0].total_height
+
+        # Dealer positioning
+        x_d = self.x_center_cards - dealer.total_width // 2
+        y_d = self.y_center_cards - (dealer.total_height + self.window_padding + seat_height) // 2
+        dealer.place(x_d, y_d)
+
+        # Player positioning, with each hand to the right of the previous one
+        total_player_width = sum(seat.total_width + self.window_padding for seat in self.player_displays)
+        x_p = self.x_center_cards - total_player_width // 2
+        y_p = self.y_center_cards + (dealer.total_height + self.window_padding - seat_height) // 2
+        for seat in self.player_displays:
+            seat.place(x_p, y_p)
+            x_p += seat.total_width + self.window_padding
+
+        # Control positioning, to the left of the dealer's hand with at least some padding
+        x_c = max(0, min(self.x_center_controls - self.controls_width // 2, x_d - self.window_padding - self.controls_width))
+        y_c = max(0, self.y_center_cards - (dealer.total_height + self.window_padding + self.controls_height) // 2)
+        if (x_c, y_c) != (self.controls_x, self.controls_y):
+            self.canvas.move("controls", x_c - self.controls_x, y_c - self.controls_y)
+            self.controls_x = x_c
+            self.controls_y = y_c
+
+
+UI_RENDERERS = {"canvas": TableUI, "windows": BlackjackUI} #UI classes for each UI_RENDERER setting in config
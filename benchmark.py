@@ -0,0 +1,423 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from deck_architecture import Deck, Hand, CARDS
+from engine_architecture import Blackjack_Engine, Blackjack_Round, HIT, SPLIT, basic_strategy
+from output_architecture import Buffered_Sink, Discard_Sink
+from probability_architecture import EV_Solver, clear_caches
+from config import NUM_DECKS, CARD_IMAGES_PATH, BENCHMARK_BASELINE_PATH, BENCHMARK_RESULTS_PATH, BENCHMARK_REGRESSION_THRESHOLD, EV_QUERY_TIME_LIMIT
+
+# Every benchmark is a function taking the number of operations to time and returning the elapsed seconds.
+# Benchmarks that need optional dependencies (Tkinter, PIL, cairosvg) raise BenchmarkSkipped when they're unavailable,
+# and benchmarks with a hard time limit raise BenchmarkFailed when an operation goes over it.
+
+EV_QUERY_ATTEMPTS = 3 #Cold runs of each solver query, the fastest of which is timed (to filter out the machine's noise)
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark that can't run in the current environment."""
+
+
+class BenchmarkFailed(Exception):
+    """Raised by a benchmark when an operation takes longer than its limit."""
+
+
+def time_deck_build(num_decks):
+    """Returns a benchmark building a new shoe of 'num_decks' decks."""
+    def benchmark(operations):
+        start = time.perf_counter()
+        for _ in range(operations):
+            Deck(num_decks=num_decks)
+        return time.perf_counter() - start
+    return benchmark
+
+
+def time_deck_shuffle(num_decks):
+    """
+    Returns a benchmark fully shuffling a shoe of 'num_decks' decks.
+    The shuffle is done lazily as cards are dealt, so this times refilling the shoe and dealing out every card.
+    """
+    def benchmark(operations):
+        deck = Deck(num_decks=num_decks, rng=random.Random(0))
+        deal_card = deck.deal_card
+        start = time.perf_counter()
+        for _ in range(operations):
+            deck.new_deck(decks=num_decks)
+            for _ in range(deck.cards_left):
+                deal_card()
+        return time.perf_counter() - start
+    return benchmark
+
+
+def time_deal_card(operations):
+    """Times dealing single cards from a 6 deck shoe (refilling it between full passes, outside the timer)."""
+    deck = Deck(num_decks=6, rng=random.Random(0))
+    elapsed = 0.0
+    remaining = operations
+    while remaining:
+        deck.new_deck(decks=6)
+        batch = min(remaining, deck.cards_left)
+        deal_card = deck.deal_card
+        start = time.perf_counter()
+        for _ in range(batch):
+            deal_card()
+        elapsed += time.perf_counter() - start
+        remaining -= batch
+    return elapsed
+
+
+def time_hand_totals(operations):
+    """Times a call each of total, is_soft and is_bust on a hand (cycling through a fixed set of random hands)."""
+    rng = random.Random(0)
+    hands = []
+    for _ in range(256):
+        hand = Hand()
+        for _ in range(rng.randint(2, 5)):
+            hand.add_card(rng.choice(CARDS))
+        hands.append(hand)
+
+    start = time.perf_counter()
+    for i in range(operations):
+        hand = hands[i & 255]
+        hand.total()
+        hand.is_soft()
+        hand.is_bust()
+    return time.perf_counter() - start
+
+
+def time_engine_play_rounds(operations):
+    """
+    Times full rounds of the headless Blackjack_Engine playing basic strategy from a seeded 6 deck shoe
+    (the engine's target is at least 100,000 rounds a second, i.e. under 10 us a round).
+    """
+    engine = Blackjack_Engine(strategy=basic_strategy(), num_decks=6, seed=0)
+    start = time.perf_counter()
+    engine.play_rounds(operations)
+    return time.perf_counter() - start
+
+
+def pair_rounds(count, cards_dealt, num_decks=6):
+    """
+    Returns 'count' rounds whose player hand is a pair that can be split, each dealt from its own seeded shoe
+    after 'cards_dealt' cards have been dealt from it (and before the cut card, as in play).
+    """
+    rounds = []
+    seed = 0
+    while len(rounds) < count:
+        deck = Deck(num_decks=num_decks, rng=random.Random(seed), output=Discard_Sink())
+        seed += 1
+        for _ in range(cards_dealt):
+            deck.deal_card()
+
+        current_round = Blackjack_Round(deck)
+        while deck.dealt_cards < deck.cut_card:
+            current_round.reset_all_hands()
+            current_round.deal_initial_hands()
+            if not current_round.round_over and current_round.can_split(0):
+                rounds.append(current_round)
+                break
+    return rounds
+
+
+def time_ev_solver_split_query(operations):
+    """
+    Times cold EV_Solver.evaluate queries (stand, hit and split) on pairs at least 200 cards into a 6 deck shoe,
+    the slowest queries the GUI makes, failing if any takes longer than EV_QUERY_TIME_LIMIT.
+    Each query starts from empty caches, which are cleared outside the timer, and is timed as the fastest of EV_QUERY_ATTEMPTS runs.
+    """
+    elapsed = 0.0
+    for current_round in pair_rounds(operations, 200):
+        query_time = float("inf")
+        for _ in range(EV_QUERY_ATTEMPTS):
+            clear_caches()
+            solver = EV_Solver()
+            start = time.perf_counter()
+            solver.evaluate(current_round)
+            query_time = min(query_time, time.perf_counter() - start)
+
+        if query_time > EV_QUERY_TIME_LIMIT:
+            hand = current_round.player_hands[0]
+            raise BenchmarkFailed(
+                f"A pair of {hand.cards[0].rank}s against a dealer {current_round.dealer_card_set.cards[0].rank} took {query_time * 1e3:.1f} ms, "
+                f"over the {EV_QUERY_TIME_LIMIT * 1e3:g} ms limit"
+            )
+        elapsed += query_time
+    return elapsed
+
+
+class StubPlayerDisplay:
+    """Stands in for a PlayerHandWindow, ignoring every update."""
+    def enable_hit_stand_buttons(self):
+        pass
+
+    def update_hand_value_labels(self, *args, **kwargs):
+        pass
+
+
+class StubUI:
+    """Stands in for BlackjackUI so a Blackjack_Hand can be played without a display."""
+    def __init__(self):
+        self.player_displays = [StubPlayerDisplay()]
+
+    def reset_player_windows(self):
+        del self.player_displays[1:]
+
+    def add_player_window(self, hand_index):
+        self.player_displays.append(StubPlayerDisplay())
+
+    def update_player(self):
+        pass
+
+    def update_dealer(self):
+        pass
+
+    def update_all_hand_value_labels(self):
+        pass
+
+    def animate_dealer_hand(self, hand, delay_ms=None):
+        pass
+
+    def finish_dealer_animation(self):
+        pass
+
+    def skip_animations(self):
+        pass
+
+
+def blackjack_hand_round_benchmark(make_output):
+    """
+    Returns a benchmark timing full rounds of a Blackjack_Hand (dealing, basic strategy decisions, the dealer's play and settling)
+    against a stub UI, with the game's output going to the sink returned by 'make_output'.
+    """
+    def benchmark(operations):
+        return time_blackjack_hand_round(operations, make_output())
+    return benchmark
+
+
+def time_blackjack_hand_round(operations, output=None):
+    """
+    Times full rounds of a Blackjack_Hand against a stub UI, including the terminal output (which is discarded) unless another sink is given.
+    """
+    try:
+        from game_architecture import Blackjack_Hand
+    except ImportError as e:
+        raise BenchmarkSkipped(f"game_architecture can't be imported: {e}")
+
+    deck = Deck(num_decks=NUM_DECKS, rng=random.Random(0), output=output)
+    ui = StubUI()
+    strategy = basic_strategy()
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        if deck.should_shuffle_after_hand:
+            deck.new_deck(decks=deck.num_decks)
+
+        current_hand = Blackjack_Hand(deck, ui)
+        current_hand.play_hand()
+        dealer_upcard = current_hand.dealer_card_set.cards[0]
+
+        while not current_hand.player_turn_over:
+            hand_index = current_hand.player_hand_turn_over.index(False)
+            can_split = current_hand.can_split(hand_index)
+            action = strategy(current_hand.player_hands[hand_index], dealer_upcard, can_split)
+
+            if action == SPLIT and can_split:
+                current_hand.split_hand(hand_index)
+            elif action == HIT and current_hand.can_hit(hand_index):
+                current_hand.player_hits(hand_index)
+            else:
+                current_hand.player_stands(hand_index)
+    return time.perf_counter() - start
+
+
+def card_image_benchmark(warm):
+    """
+    Returns a benchmark loading card images through CardsWindowBase.load_card_image with a fresh image cache.
+    Cold loads start from an empty memory and disk cache (so every image is rasterised from its SVG);
+    warm loads come from the in-memory cache.
+    """
+    def benchmark(operations):
+        try:
+            import tkinter as tk
+            import GUI_architecture
+        except ImportError as e:
+            raise BenchmarkSkipped(f"GUI_architecture can't be imported: {e}")
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            raise BenchmarkSkipped(f"No display available: {e}")
+
+        root.withdraw()
+        cache_dir = tempfile.mkdtemp(prefix="card_image_cache_")
+        shared_cache = GUI_architecture.card_image_cache
+        card_paths = [f"{CARD_IMAGES_PATH}{card.get_filename().lower()}.svg" for card in CARDS]
+        try:
+            window = GUI_architecture.CardsWindowBase(root, "Benchmark", 0, 0)
+            GUI_architecture.card_image_cache = GUI_architecture.CardImageCache(max_entries=len(card_paths), cache_dir=cache_dir)
+
+            if warm:
+                for card_path in card_paths:
+                    window.load_card_image(card_path)
+
+            #Cold loads need a different card each time, as a repeat of the same card would be warm
+            if not warm and operations > len(card_paths):
+                raise ValueError(f"At most {len(card_paths)} cold loads can be timed per repeat")
+            start = time.perf_counter()
+            for i in range(operations):
+                window.load_card_image(card_paths[i % len(card_paths)])
+            return time.perf_counter() - start
+        finally:
+            GUI_architecture.card_image_cache = shared_cache
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            root.destroy()
+    return benchmark
+
+
+def benchmarks():
+    """Returns the benchmark suite as a dictionary mapping each name to (benchmark, operations per repeat)."""
+    suite = {}
+    for num_decks in range(1, 9):
+        suite[f"deck_build_{num_decks}"] = (time_deck_build(num_decks), 2000)
+        suite[f"deck_shuffle_{num_decks}"] = (time_deck_shuffle(num_decks), max(1, 200 // num_decks))
+    suite["deal_card"] = (time_deal_card, 100_000)
+    suite["hand_totals"] = (time_hand_totals, 100_000)
+    suite["engine_play_rounds"] = (time_engine_play_rounds, 50_000)
+    suite["ev_solver_split_query"] = (time_ev_solver_split_query, 20)
+    suite["blackjack_hand_round"] = (time_blackjack_hand_round, 2000)
+    suite["blackjack_hand_round_buffered"] = (blackjack_hand_round_benchmark(Buffered_Sink), 2000)
+    suite["blackjack_hand_round_discard"] = (blackjack_hand_round_benchmark(Discard_Sink), 2000)
+    suite["load_card_image_cold"] = (card_image_benchmark(warm=False), 52)
+    suite["load_card_image_warm"] = (card_image_benchmark(warm=True), 10_000)
+    return suite
+
+
+def run_benchmark(benchmark, operations, repeats):
+    """
+    Runs a benchmark 'repeats' times and returns its timings in seconds per operation
+    (the median is the headline figure, with the minimum as the least noisy estimate).
+    """
+    timings = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()): #Discard the game's terminal output
+            elapsed = benchmark(operations)
+        timings.append(elapsed / operations)
+    return {
+        "operations": operations,
+        "repeats": repeats,
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+    }
+
+
+def run_suite(names=None, repeats=5):
+    """
+    Runs the benchmarks with the given names (every benchmark if None), returning a results dictionary with
+    the timings of each benchmark under "benchmarks", any that couldn't run under "skipped" and any that went over
+    their time limit under "failed".
+    """
+    suite = benchmarks()
+    names = names if names else list(suite)
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+        "skipped": {},
+        "failed": {},
+    }
+
+    for name in names:
+        if name not in suite:
+            raise ValueError(f"Unknown benchmark: {name}")
+        benchmark, operations = suite[name]
+        try:
+            results["benchmarks"][name] = run_benchmark(benchmark, operations, repeats)
+        except BenchmarkSkipped as e:
+            results["skipped"][name] = str(e)
+        except BenchmarkFailed as e:
+            results["failed"][name] = str(e)
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD):
+    """
+    Compares the median timings of results to a baseline, returning a list of (name, baseline, current, ratio, regressed)
+    for every benchmark in both, where regressed is True if it's slower than the baseline by more than the threshold (a fraction).
+    """
+    comparisons = []
+    for name, timing in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        baseline_median = baseline["benchmarks"][name]["median"]
+        ratio = timing["median"] / baseline_median
+        comparisons.append((name, baseline_median, timing["median"], ratio, ratio > 1 + threshold))
+    return comparisons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Times the engine, shoe, hand evaluation and rendering hot paths.")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (all of them if none are given)")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times to run each benchmark")
+    parser.add_argument("--output", default=BENCHMARK_RESULTS_PATH, help="Path to write the results JSON to")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH, help="Path of the baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD, help="Fractional slowdown counted as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(benchmarks()))
+        return 0
+
+    results = run_suite(args.names, repeats=args.repeats)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    for name, timing in results["benchmarks"].items():
+        print(f"{name:<24} {timing['median'] * 1e6:>12.3f} us/op")
+    for name, reason in results["skipped"].items():
+        print(f"{name:<24} skipped ({reason})")
+    for name, reason in results["failed"].items():
+        print(f"{name:<24} FAILED ({reason})")
+    if results["failed"]:
+        print(f"{len(results['failed'])} benchmark(s) failed")
+        return 1
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} to compare against (run with --update-baseline to create one)")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared to {args.baseline} (regression threshold {args.threshold:.0%}):")
+    regressions = 0
+    for name, baseline_median, median, ratio, regressed in compare_to_baseline(results, baseline, args.threshold):
+        regressions += regressed
+        print(f"{name:<24} {baseline_median * 1e6:>12.3f} -> {median * 1e6:>12.3f} us/op  x{ratio:.2f}{'  REGRESSION' if regressed else ''}")
+
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,47 @@
 NUM_DECKS = 6  # Number of decks in the shoe (standard is 6)
 MAX_HANDS = 4  # Maximum number of hands a player can have
 ALLOW_RESPLITTING_ACES = True # Whether a player can resplit aces
+DEALER_HITS_SOFT_17 = True # Whether the dealer hits (True) or stands (False) on a soft 17
+ALLOW_DOUBLING = False # Whether the player can double down on their first two cards (headless engine only for now)
+DOUBLE_AFTER_SPLIT = True # Whether hands made by splitting can double down when doubling is allowed
+ALLOW_SURRENDER = False # Whether the player can surrender their first two cards for half the stake (headless engine only for now)
+BLACKJACK_PAYOUT = None # Payout of a natural blackjack, e.g. 1.5 for 3:2 (None to treat it like any other 21)
+COUNT_SYSTEM = "Hi-Lo" # Card counting system tracked by the deck (see COUNT_SYSTEMS in deck_architecture.py)
+PENETRATION = 0.75 # Fraction of the shoe dealt before the cut card comes out and the shoe is reshuffled after the round
+CONTINUOUS_SHUFFLE = False # Whether the discards go back in the shoe after every round (a continuous shuffling machine)
+
+# Output
+OUTPUT_SINK = "print" # Where the game's terminal commentary goes: "print", "buffered" (written in batches), "events" (structured) or "discard"
+OUTPUT_BUFFER_LINES = 256 # Lines the buffered sink holds back before writing a batch
+OUTPUT_EVENTS_PATH = None # JSON lines file the events sink appends to (None to only keep the events in memory)
 
 # Asset Paths
 CARD_IMAGES_PATH = r"assets/svg_playing_cards-fronts/"
 CARD_BACK_IMAGE_PATH = r"assets/svg_playing_cards-backs/abstract.svg"
+CARD_IMAGE_CACHE_PATH = r"assets/.card_image_cache/" # Rasterised card PNGs are stored here between runs
+STRATEGY_TABLES_PATH = r"assets/.strategy_tables/" # Solved dealer and basic strategy tables are stored here for each rule set (see tables_architecture.py)
+ROUND_LOG_PATH = None # Path of a binary log to append every round played to, e.g. r"rounds.bjlog" (see log_architecture.py), or None to not log
+
+# Performance Settings
+CARD_IMAGE_CACHE_SIZE = 128 # Maximum number of card images held in memory
+DEALER_CARD_DELAY_MS = 1000 # Pause in milliseconds between the dealer's cards appearing on screen (0 shows the dealer's play instantly)
+BENCHMARK_RESULTS_PATH = r"benchmark_results.json" # Where benchmark.py writes the results of each run
+BENCHMARK_BASELINE_PATH = r"benchmark_baseline.json" # Stored results each benchmark run is compared against
+BENCHMARK_REGRESSION_THRESHOLD = 0.25 # Fractional slowdown from the baseline counted as a regression
+EV_QUERY_TIME_LIMIT = 0.010 # Longest a cold EV solver query from the GUI may take in seconds (benchmark.py fails above it)
+INSTRUMENTATION_ENABLED = False # Whether main.py records timings of the hot paths (see profiling_architecture.py)
+INSTRUMENTATION_SAMPLE_SIZE = 10_000 # Durations sampled per hot path for the percentiles (memory stays bounded over a long session)
+INSTRUMENTATION_TRACE = False # Whether to also record each call for a Chrome trace file
+INSTRUMENTATION_TRACE_MAX_EVENTS = 200_000 # Most recent calls kept for the trace (older ones are dropped, so memory stays bounded)
+INSTRUMENTATION_SUMMARY_PATH = r"instrumentation_summary.json" # Where the timing summary is written when the game closes
+INSTRUMENTATION_TRACE_PATH = r"instrumentation_trace.json" # Where the Chrome trace is written when the game closes
+STATS_CONFIDENCE = 0.95 # Confidence level of the house edge interval reported by simulations (see stats_architecture.py)
+STATS_CHECK_ROUNDS = 10_000 # Rounds played between checks of the confidence interval when a simulation stops at a target width
+SERVER_HOST = "127.0.0.1" # Address the multi-table server listens on (see server.py)
+SERVER_PORT = 8765 # Port the multi-table server listens on
 
 # UI Layout
+UI_RENDERER = "canvas" # "canvas" draws the whole table in one window, "windows" shows each hand and the controls in a separate window
 DEFAULT_WINDOW_WIDTH = 800
 DEFAULT_WINDOW_HEIGHT = 600
 CARD_WIDTH = 300
@@ -19,3 +54,7 @@ WINDOW_PADDING = 100
 BUTTON_ACTIVE_COLOUR = "green"
 BUTTON_DISABLED_COLOUR = "grey"
 BUTTON_TEXT_COLOUR = "white"
+TABLE_COLOUR = "dark green" # Background of the canvas table
+TABLE_TEXT_COLOUR = "white" # Colour of the score labels and hand outlines on the canvas table
+TABLE_BUTTON_WIDTH = 180
+TABLE_BUTTON_HEIGHT = 70
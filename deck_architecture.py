@@ -1,38 +1,60 @@
 import random
-from tkinter import PhotoImage
-from cairosvg import svg2png
-from config import CARD_IMAGES_PATH,CARD_BACK_IMAGE_PATH
+from array import array
+from output_architecture import Print_Sink
+from config import COUNT_SYSTEM, PENETRATION, CONTINUOUS_SHUFFLE
+
+SUITS = ["Hearts","Diamonds","Clubs","Spades"]
+RANKS = [str(i) for i in range(2,11)] + ["Jack","Queen","King","Ace"]
+RANK_VALUES = [i for i in range(2,11)] + [10,10,10,11] #Value of each rank, with aces as 11 (handled case by case in 'Hand' class)
+
+CARDS_PER_DECK = len(SUITS) * len(RANKS)
+
+#Tags added to the running count for each rank (in the order of RANKS: 2-10, Jack, Queen, King, Ace) by each counting system
+COUNT_SYSTEMS = {
+    "Hi-Lo":     (1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1),
+    "KO":        (1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1, -1),
+    "Hi-Opt I":  (0, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, 0),
+    "Hi-Opt II": (1, 1, 2, 2, 1, 1, 0, 0, -2, -2, -2, -2, 0),
+    "Omega II":  (1, 1, 2, 2, 2, 1, 0, -1, -2, -2, -2, -2, 0),
+    "Zen":       (1, 1, 2, 2, 2, 1, 0, 0, -2, -2, -2, -2, -1),
+}
+
 
 class Card:
     """
-    Represents the state of a single card, i.e:
-    rank (str): The rank from set [2-10, Jack, Queen, King]
+    Represents a single card, i.e:
+    rank (str): The rank from set [2-10, Jack, Queen, King, Ace]
     suit (str): The suit from set [Hearts, Diamonds, Clubs, Spades]
+
+    Cards are immutable flyweights: there is one shared instance per rank and suit (see CARDS),
+    identified by a code from 0-51 (suit index * 13 + rank index) which is what the deck stores.
+    Whether a card is face up or down belongs to the hand holding it.
     """
-    
+    __slots__ = ("rank", "suit", "code", "points")
+
     def __init__(self,rank,suit):
         """
-        Initialises a card with a given rank and suit and a status of either revealed or not
+        Initialises a card with a given rank and suit, precomputing its code and value
         """
-        self.rank = rank
-        self.suit = suit
-        self.revealed = True #Initialise as revealed
+        if rank not in RANKS:
+            raise ValueError(f"Unexpected card rank: {rank}")
+
+        object.__setattr__(self, "rank", rank)
+        object.__setattr__(self, "suit", suit)
+        object.__setattr__(self, "code", SUITS.index(suit) * len(RANKS) + RANKS.index(rank))
+        object.__setattr__(self, "points", RANK_VALUES[RANKS.index(rank)])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cards are immutable as they are shared between decks and hands")
+
+    def __repr__(self):
+        return f"Card({self.rank!r}, {self.suit!r})"
     
     def value(self):
         """
-        Returns the value of the card 
+        Returns the value of the card (11 for an ace)
         """
-        if self.rank.isdigit():
-            return int(self.rank)
-        elif self.rank in ["Jack","Queen","King"]:
-            return 10
-        elif self.rank == "Ace":
-            return 11 #11 as standard, will be handled case by case in 'Hand' class.
-        else:
-            raise ValueError(f"Unexpected card rank: {self.rank}")
-    
-    def reveal(self):
-        self.revealed = True
+        return self.points
 
     def get_filename(self):
         """Returns the card's name as a string, e.g., "spades_ace"."""
@@ -50,88 +72,229 @@ class Card:
         }
 
         return f"{self.rank} {suit_symbols.get(self.suit, '?')}"
-    
-    def get_image(self, card_type="front"):
-        """
-        Returns the image for a given card.
-        Note that the card image nededs to be found at the paths defined in config 
-        and the front cards need to be formatted with names of format "{suit}_{rank}.svg"
-        """
-        if card_type == "front":
-            file_path = f"{CARD_IMAGES_PATH}{self.suit.lower()}_{self.rank.lower()}.svg" #Pulls the path to the current card's front image
-        elif card_type == "back":
-            file_path = CARD_BACK_IMAGE_PATH
-        else:
-            raise ValueError(f"Invalid card_type: {card_type}")
 
-        # Convert SVG to PNG for tkinter using cairosvg
-        png_data = svg2png(url=file_path)
-        from io import BytesIO
-        return PhotoImage(data=BytesIO(png_data).read())
+
+CARDS = tuple(Card(rank, suit) for suit in SUITS for rank in RANKS) #The 52 shared card instances, indexed by card code
+CARD_VALUES = array("B", [card.points for card in CARDS]) #Value of each card code (aces as 11)
+HARD_CARD_VALUES = array("B", [1 if card.rank == "Ace" else card.points for card in CARDS]) #Value of each card code (aces as 1)
+DECK_CODES = array("B", range(CARDS_PER_DECK)) #Card codes for a single deck
+
+
+def count_tags(count_system):
+    """
+    Returns the tag of each card code for a counting system, given either by name (see COUNT_SYSTEMS)
+    or as a sequence of 13 tags by rank in the order of RANKS.
+    """
+    if isinstance(count_system, str):
+        if count_system not in COUNT_SYSTEMS:
+            raise ValueError(f"Unknown count system: {count_system}")
+        count_system = COUNT_SYSTEMS[count_system]
+    if len(count_system) != len(RANKS):
+        raise ValueError(f"A count system needs one tag per rank ({len(RANKS)}), got {len(count_system)}")
+    return array("b", [count_system[RANKS.index(card.rank)] for card in CARDS])
+
     
+def shoe_seed(seed, shoe_index):
+    """Returns the seed the given shoe of a seeded session is shuffled from."""
+    return f"{seed}/{shoe_index}"
+
+
 class Deck:
     """
-    Represents the state of a set of a given number of shuffled decks of cards
+    Represents the state of a set of a given number of shuffled decks of cards.
+    The shoe is a fixed array of card codes (one byte per card): the undealt cards are kept at the front
+    and each dealt card is swapped in behind them, into the discard tray, so nothing is allocated while dealing or reshuffling.
+    The running count of a card counting system is kept up to date as each card is dealt.
+
+    A deck created from a seed shuffles each shoe from its own seed derived from (seed, shoe index),
+    so any shoe of a session can be rebuilt exactly without dealing the shoes before it.
     """
-    def __init__(self,num_decks = 6):
+    def __init__(self,num_decks = 6, rng = None, count_system = COUNT_SYSTEM, seed = None, shoe_index = 0, output = None, penetration = PENETRATION, continuous_shuffle = CONTINUOUS_SHUFFLE):
         """
         Initialises a deck where every combination of rank and suit of cards is included for as many decks as there are.
         The resultant deck is then shuffled.
         (6 decks is standard for a casino shoe)
+
+        Args:
+            num_decks (int): Number of decks in the shoe.
+            rng (random.Random): Source of randomness for the shuffle, e.g. a seeded random.Random (the global random module if None).
+            count_system (str or sequence): Counting system to track, by name from COUNT_SYSTEMS or as 13 tags by rank.
+            seed (int): Seed to shuffle every shoe from (instead of 'rng'), making the whole session reproducible.
+            shoe_index (int): Index of the first shoe to deal, e.g. to rebuild shoe 'shoe_index' of a seeded session.
+            output (Output_Sink): Where reshuffles and the cut card are announced (printed if None).
+            penetration (float): Fraction of the full shoe dealt before the cut card comes out (above 0 and at most 1).
+            continuous_shuffle (bool): Whether the discards go back into the shoe after every round, as with a continuous shuffling machine
+                ('penetration' is then ignored).
+        """
+        if seed is not None and rng is not None:
+            raise ValueError("A deck can be given a seed or an rng, not both")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be above 0 and at most 1")
+
+        self.num_decks = num_decks
+        self.seed = seed
+        self.output = output if output is not None else Print_Sink()
+        self.rng = rng if rng is not None else random
+        self.count_tags = count_tags(count_system) #Tag of each card code in the counting system
+        self.penetration = penetration
+        self.continuous_shuffle = continuous_shuffle
+        self.shoe_index = shoe_index - 1 #Number of times the shoe has been refilled (new_deck below moves this on to 'shoe_index')
+        self.resize_shoe(num_decks)
+        self.new_deck()
+
+    def resize_shoe(self, num_decks):
+        """Allocates the arrays for a shoe of 'num_decks' decks (only needed when the number of decks changes)."""
+        self.num_decks = num_decks
+        self.full_shoe = DECK_CODES * num_decks #Every card code in the shoe, in order
+        self.shoe = array("B", self.full_shoe) #The undealt cards followed by the discard tray
+
+        #Number of cards dealt from the shoe before the cut card comes out (with a continuous shuffler, the first card of each round)
+        self.cut_card = 0 if self.continuous_shuffle else min(round(self.penetration * len(self.shoe)), len(self.shoe) - 1)
+
+    def new_deck(self, decks = None):
+        """
+        Gathers the discard tray back into the shoe and starts a new shoe (of 'decks' decks if given, otherwise the same size).
+        The cards are put back in order in place, and the shuffle is done lazily as the cards are dealt
+        (each deal picks a uniformly random card from those left), which gives exactly the same distribution as shuffling up front,
+        so a reshuffle costs a single copy of the shoe's bytes.
+        With a continuous shuffler this happens after every round, and isn't announced.
+
+        Args:
+            decks (int): Number of decks to refill the shoe with (the current number if None).
         """
-        self.new_deck(decks = num_decks)
+        if decks is not None and decks != self.num_decks:
+            self.resize_shoe(decks)
+
+        self.shoe_index += 1
+        if not self.continuous_shuffle:
+            self.output.emit("shuffle", "New deck shuffled", shoe_index=self.shoe_index)
+
+        if self.seed is not None:
+            self.rng = random.Random(shoe_seed(self.seed, self.shoe_index))
 
         #Initialise variables to track when to create a new deck
+        self.shoe[:] = self.full_shoe #Back in order, so a seeded shoe deals the same cards every time it's rebuilt
+        self.cards_left = len(self.shoe) #The undealt cards are shoe[:cards_left], and the discard tray is the rest
         self.dealt_cards = 0
         self.should_shuffle_after_hand = False 
+        self.running_count = 0 #Sum of the count tags of every card dealt since the shuffle
 
-    def new_deck(self, decks = 1):
-        print("New deck shuffled")
-        self.suits = ["Hearts","Diamonds","Clubs","Spades"]
-        self.ranks = [str(i) for i in range(2,11)] + ["Jack","Queen","King","Ace"]
-        self.cards = [Card(rank, suit) for suit in self.suits for rank in self.ranks] * decks #Generates all possible cards in the deck
+    @property
+    def cards(self):
+        """Codes of the cards still in the shoe (a copy, for inspecting the shoe)."""
+        return self.shoe[:self.cards_left]
 
-        for card in self.cards:
-            card.revealed = True #Ensure all cards are revealed when the deck is created
-
-        random.shuffle(self.cards)
+    @property
+    def discards(self):
+        """Codes of the cards dealt since the shuffle, in the discard tray (a copy)."""
+        return self.shoe[self.cards_left:]
     
     def deal_card(self):
         """
-        Pulls a card from somewhere in the deck, removing it from the deck in the process.
+        Pulls a card from somewhere in the deck, moving it to the discard tray in the process.
         """
-        if not self.cards:
+        cards_left = self.cards_left
+        if not cards_left:
             raise ValueError("No cards left in the deck")
         
-        if self.dealt_cards >= 0.75 * len(self.cards): #If you reach the cut card (usually 75% through the deck), shuffle after the hand
-            print("Cut card reached! Shuffle after this hand.")
+        if self.dealt_cards == self.cut_card: #If you reach the cut card (usually 75% through the shoe), shuffle after the hand
+            if not self.continuous_shuffle:
+                self.output.emit("cut_card", "Cut card reached! Shuffle after this hand.", dealt_cards=self.dealt_cards)
             self.should_shuffle_after_hand = True
         
         self.dealt_cards += 1
+
+        #Swap a random undealt card with the last undealt card and take it (one step of a Fisher-Yates shuffle)
+        shoe = self.shoe
+        last = cards_left - 1
+        position = int(self.rng.random() * cards_left)
+        code = shoe[position]
+        shoe[position] = shoe[last]
+        shoe[last] = code
+        self.cards_left = last
+
+        self.running_count += self.count_tags[code]
         
-        return self.cards.pop() #Extracts a card from the deck   
+        return CARDS[code] #Extracts a card from the deck   
+
+    def decks_remaining(self):
+        """Returns the number of decks' worth of cards left in the shoe."""
+        return self.cards_left / CARDS_PER_DECK
+
+    def true_count(self):
+        """
+        Returns the running count per deck remaining (0 if the shoe is empty).
+        Cards are counted as they are dealt, including the dealer's hole card, so this is meant for decisions between rounds.
+        """
+        cards_left = self.cards_left
+        if not cards_left:
+            return 0.0
+        return self.running_count * CARDS_PER_DECK / cards_left
 
 class Hand:
     """
     Represents the current hand of a player (or the dealer)
+    The hard total and number of aces are kept up to date as cards are added and removed,
+    so every total query is a constant time lookup.
     """
     def __init__(self):
         """
         Initialises the hand as an empty set before cards are dealt.
         """
         self.cards = []
+        self.revealed = [] #Whether each card in the hand is face up
+        self.hard = 0 #Running hard total (aces counted as 1)
+        self.aces = 0 #Running count of aces in the hand
     
     def reset(self):
-        """Resets the current hand to empty and ensures no card has unintended hidden status."""
-        for card in self.cards:
-            card.revealed = True
+        """Resets the current hand to empty."""
         self.cards.clear()
+        self.revealed.clear()
+        self.hard = 0
+        self.aces = 0
 
-    def add_card(self,card):
+    def add_card(self,card,revealed=True):
         """
-        Adds a given card to the current hand
+        Adds a given card to the current hand, face up unless specified otherwise
         """
         self.cards.append(card)
+        self.revealed.append(revealed)
+
+        hard_value = HARD_CARD_VALUES[card.code]
+        self.hard += hard_value
+        if hard_value == 1:
+            self.aces += 1
+
+    def pop_card(self):
+        """
+        Removes and returns the last card in the hand (used when splitting)
+        """
+        self.revealed.pop()
+        card = self.cards.pop()
+
+        hard_value = HARD_CARD_VALUES[card.code]
+        self.hard -= hard_value
+        if hard_value == 1:
+            self.aces -= 1
+
+        return card
+
+    def copy(self):
+        """Returns a snapshot of the hand that isn't changed by later cards (e.g. for the UI to animate)."""
+        snapshot = Hand()
+        snapshot.cards = self.cards.copy()
+        snapshot.revealed = self.revealed.copy()
+        snapshot.hard = self.hard
+        snapshot.aces = self.aces
+        return snapshot
+
+    def reveal_all(self):
+        """Turns every card in the hand face up."""
+        self.revealed = [True] * len(self.cards)
+
+    def all_revealed(self):
+        """Returns true if every card in the hand is face up."""
+        return all(self.revealed)
     
     def hard_total(self):
         """
@@ -139,14 +302,7 @@ class Hand:
         This is the total where any aces are treated as 1's
         It is therefore the minimum value the hand can take.
         """
-        total = 0
-        for card in self.cards:
-            if card.rank != "Ace":
-                total += card.value()
-            else:
-                total += 1 #In a hard total, any aces are treated as a 1
-
-        return total
+        return self.hard
     
     def soft_total(self):
         """
@@ -154,43 +310,31 @@ class Hand:
         This is the total where at most one ace is treated as an 11 (more than this and you'll always be bust)
         This is therefore the maximum sensible value the hand can take 
         """
-        total = 0
-        first_ace_down = False
-        for card in self.cards:
-            if card.rank != "Ace":
-                total += card.value()
-            elif not first_ace_down:
-                total += 11 #Count only the first ace as 11 (as a second one counted as 11 would always bust your total)
-                first_ace_down = True 
-            else:
-                total +=1 #Any subsequent aces to the first are always counted as 1's
-
-        return total
+        if self.aces:
+            return self.hard + 10 #Count only the first ace as 11 (as a second one counted as 11 would always bust your total)
+        return self.hard
     
     def total(self):
         """
         Returns the maximum possible total assuming the hand isn't bust.
         """
-        hard = self.hard_total()
-        soft = self.soft_total()
-
-        if soft <= 21:
-            return soft
-        else:
-            return hard
+        hard = self.hard
+        if self.aces and hard <= 11:
+            return hard + 10 #Soft total is still 21 or under
+        return hard
     
     def is_soft(self):
         """
         Returns true if the hard and soft totals are not the same (i.e. the hand is 'soft')
         This means there is at least one ace in the hand and it can be played as an 11 or 1 without going bust
         """
-        return self.soft_total() != self.hard_total() and self.soft_total() <= 21
+        return self.aces > 0 and self.hard <= 11
     
     def is_bust(self):
         """
         Returns true if the hard total is above 21 (i.e. the player has no way of making their hand below 21)
         """
-        return self.hard_total() > 21
+        return self.hard > 21
     
     def is_pair(self):
         """
@@ -211,16 +355,13 @@ class Hand:
         if not show_hidden_cards:
             return "Hidden"
 
-        if standing and self.is_soft() and not self.is_bust():
-            # If standing and the hand is soft, return only the soft total
-            return f"{self.soft_total()}"
-    
-        hard_total = self.hard_total()
         if self.is_soft():
-            soft_total = self.soft_total()
-            return f"{hard_total}/{soft_total}"
+            if standing:
+                # If standing and the hand is soft, return only the soft total
+                return f"{self.hard + 10}"
+            return f"{self.hard}/{self.hard + 10}"
         else:
-            return f"{hard_total}"
+            return f"{self.hard}"
     
     def get_deckstring(self, show_hidden_cards=True):
         """
@@ -229,8 +370,8 @@ class Hand:
             show_hidden_cards (bool): If False, hidden cards will be represented as '-'.
         """
         card_strings = []
-        for card in self.cards:
-            if card.revealed or show_hidden_cards:
+        for card, revealed in zip(self.cards, self.revealed):
+            if revealed or show_hidden_cards:
                 card_strings.append(card.get_cardname())
             else:
                 card_strings.append("-")
@@ -0,0 +1,698 @@
+import math
+from bisect import bisect_right
+from deck_architecture import Deck, Hand, HARD_CARD_VALUES
+from output_architecture import Discard_Sink
+from stats_architecture import Simulation_Stats
+from rules_architecture import rule_set, PAIR, ACE_PAIR, SPLIT_ACE_PAIR, ORIGINAL_HAND, SPLIT_HAND, SPLIT_ACES_HAND, OUTCOME_LOSE, OUTCOME_DRAW, OUTCOME_WIN, OUTCOME_BLACKJACK, OUTCOME_SURRENDER
+from config import NUM_DECKS, MAX_HANDS, ALLOW_RESPLITTING_ACES, DEALER_HITS_SOFT_17, STATS_CONFIDENCE, STATS_CHECK_ROUNDS
+
+# Actions a strategy callback can return for a player hand
+HIT = "hit"
+STAND = "stand"
+SPLIT = "split"
+DOUBLE = "double"
+SURRENDER = "surrender"
+
+# Result of a single player hand against the dealer (in units of the stake)
+WIN = 1
+DRAW = 0
+LOSE = -1
+
+OUTCOME_RESULTS = (LOSE, DRAW, WIN, WIN, LOSE) #Result of each hand outcome (see rules_architecture), e.g. a surrender counts as a loss
+
+
+class Blackjack_Round:
+    """
+    Pure game state for a single round of Blackjack, with no UI, printing or timers:
+
+    - Holds the player's hands (including split hands) and the dealer's hand.
+    - Applies the rules for dealing, hitting, standing, splitting and the dealer's play.
+    - Settles each player hand against the dealer once the round is over.
+
+    Front ends (the Tk GUI, headless simulations) drive a round through these methods
+    and extend them to add their own display logic.
+
+    Every rule decision is a lookup in the round's compiled Rule_Set, so many rule variants can be played side by side
+    without the rules being re-checked setting by setting.
+    """
+    def __init__(self, deck, max_hands=MAX_HANDS, allow_resplitting_aces=ALLOW_RESPLITTING_ACES, dealer_hits_soft_17=DEALER_HITS_SOFT_17, rules=None):
+        """
+        Initializes a new round.
+
+        Args:
+            deck (Deck): The deck of cards used for the game.
+            max_hands (int): Maximum number of hands the player can split into.
+            allow_resplitting_aces (bool): Whether a hand made by splitting aces can be split again.
+            dealer_hits_soft_17 (bool): Whether the dealer hits or stands on a soft 17.
+            rules (Rule_Set): The full rules to play by, overriding the three settings above (the config rules with those settings if None).
+        """
+        self.deck = deck
+        if rules is None:
+            rules = rule_set(max_hands=max_hands, allow_resplitting_aces=allow_resplitting_aces, dealer_hits_soft_17=dealer_hits_soft_17)
+        self.rules = rules
+
+        self.dealer_card_set = Hand()  # Hand object to store dealer's cards
+        self.player_hands = [Hand()] #Start with an empty set of 1 hand
+
+        self.player_hand_turn_over = [False] #Track which of the player's hands' turns are over
+        self.split_from_aces = [False] #Track which of the player's hands were made by splitting aces
+        self.doubled = [False] #Track which of the player's hands have doubled down (staking twice as much)
+        self.surrendered = [False] #Track which of the player's hands were surrendered
+
+        self.player_turn_over = False  # Track if the player's turn is over for all hands
+        self.round_over = False #Track if the player and dealer turns are both over
+
+        self.actions = [] #(hand index, action) of each decision the player has made this round, in order
+
+    def reset_all_hands(self):
+        """ Reset player and dealer hands ready for a new round"""
+        self.dealer_card_set.reset() #Reset the dealer's hand
+        self.player_hands = [Hand()] #Reset any number of hands back to a standard 1 new hand object
+        self.player_hand_turn_over = [False]
+        self.split_from_aces = [False]
+        self.doubled = [False]
+        self.surrendered = [False]
+
+        self.player_turn_over = False
+        self.round_over = False
+
+        self.actions = []
+
+    def num_hands(self):
+        """Return the number of hands currently in play."""
+        return len(self.player_hands)
+
+    def deal_card_to_player(self, hand_index=0):
+        """
+        Deals a card from the deck to the player's hand with index 'hand_index' and returns it.
+        """
+        if self.player_turn_over:
+            raise ValueError("Player trying to be dealt to after turn end")
+
+        new_card = self.deck.deal_card()
+        self.player_hands[hand_index].add_card(new_card)
+        return new_card
+
+    def deal_card_to_dealer(self, revealed=True):
+        """
+        Deals a card from the deck to the dealer's hand (face up or face down) and returns it.
+        """
+        if self.round_over:
+            raise ValueError("Dealer trying to be dealt to after hand end")
+
+        new_card = self.deck.deal_card()
+        self.dealer_card_set.add_card(new_card, revealed)
+        return new_card
+
+    def deal_initial_hands(self):
+        """Deal two cards to the first player's hand and two to the dealer (the second face down)."""
+        self.deal_card_to_player(0)
+        self.deal_card_to_dealer(revealed=True)
+        self.deal_card_to_player(0)
+        self.deal_card_to_dealer(revealed=False)
+        self.check_naturals()
+
+    def is_natural(self, hand_index=0):
+        """Returns true if the given hand is a natural blackjack (21 with the first two cards of an unsplit hand)."""
+        hand = self.player_hands[hand_index]
+        return len(self.player_hands) == 1 and len(hand.cards) == 2 and hand.total() == 21
+
+    def dealer_has_natural(self):
+        """Returns true if the dealer's first two cards make 21."""
+        return len(self.dealer_card_set.cards) == 2 and self.dealer_card_set.total() == 21
+
+    def check_naturals(self):
+        """
+        Settles naturals straight after the deal when the rules pay them out:
+        the round ends at once if the dealer has one (after checking their hole card), and a player natural stands immediately.
+        Returns true if a natural ended the player's turn.
+        """
+        if not self.rules.naturals:
+            return False
+
+        if self.dealer_has_natural():
+            self.reveal_dealer_cards()
+            self.player_hand_turn_over[0] = True
+            self.player_turn_over = True
+            self.round_over = True
+            return True
+
+        if self.is_natural(0):
+            self.end_hand_turn(0)
+            return True
+
+        return False
+
+    def end_hand_turn(self, hand_index=0):
+        """
+        Mark the given hand's turn as over, passing play to the dealer once every hand is finished.
+        """
+        self.player_hand_turn_over[hand_index] = True
+
+        if all(self.player_hand_turn_over):
+            self.player_turn_over = True
+            self.dealer_play()
+
+    def can_hit(self, hand_index=0):
+        """Check if the specified hand can take another card."""
+        return not self.player_hand_turn_over[hand_index] and not self.split_from_aces[hand_index]
+
+    def player_hits(self, hand_index=0):
+        """
+        Deal a card to the given hand and end its turn if it goes bust. Returns the dealt card.
+        """
+        if self.split_from_aces[hand_index]:
+            raise ValueError("Only one card is dealt to each hand after splitting aces")
+
+        self.actions.append((hand_index, HIT))
+        new_card = self.deal_card_to_player(hand_index)
+        self.check_bust(hand_index)
+        return new_card
+
+    def player_stands(self, hand_index=0):
+        """
+        Handle the player's decision to stand.
+        """
+        self.actions.append((hand_index, STAND))
+        self.end_hand_turn(hand_index)
+
+    def hand_kind(self, hand_index=0):
+        """Returns whether the given hand is the original hand, a split hand or a hand from split aces (for the rule tables)."""
+        if self.split_from_aces[hand_index]:
+            return SPLIT_ACES_HAND
+        return SPLIT_HAND if len(self.player_hands) > 1 else ORIGINAL_HAND
+
+    def can_double(self, hand_index=0):
+        """Check if the specified hand can double down."""
+        return (not self.player_hand_turn_over[hand_index] and len(self.player_hands[hand_index].cards) == 2
+                and self.rules.double_allowed[self.hand_kind(hand_index)])
+
+    def player_doubles(self, hand_index=0):
+        """
+        Double the stake on the given hand, which then receives exactly one more card. Returns the dealt card.
+        """
+        if not self.can_double(hand_index):
+            raise ValueError(f"Hand {hand_index + 1} can't double down")
+
+        self.actions.append((hand_index, DOUBLE))
+        self.doubled[hand_index] = True
+        new_card = self.deal_card_to_player(hand_index)
+        if not self.check_bust(hand_index):
+            self.end_hand_turn(hand_index)
+        return new_card
+
+    def can_surrender(self, hand_index=0):
+        """Check if the player can surrender, which is only as the first decision on the original hand."""
+        return self.rules.allow_surrender and not self.actions and len(self.player_hands) == 1 and not self.player_turn_over
+
+    def player_surrenders(self, hand_index=0):
+        """
+        Give up the hand for half of its stake back.
+        """
+        if not self.can_surrender(hand_index):
+            raise ValueError("The player can only surrender as their first decision")
+
+        self.actions.append((hand_index, SURRENDER))
+        self.surrendered[hand_index] = True
+        self.end_hand_turn(hand_index)
+
+    def check_bust(self, hand_index=0):
+        """
+        Check if the player's hand has gone bust, ending its turn if so. Returns True on a bust.
+        """
+        if self.player_hands[hand_index].is_bust():
+            self.end_hand_turn(hand_index)
+            return True
+        return False
+
+    def can_split(self, hand_index=0):
+        """Check if the specified hand can be split."""
+        hand = self.player_hands[hand_index]
+
+        #Check if the hand is a pair
+        if not hand.is_pair():
+            return False
+
+        #Check the number of hands against the split limit for this kind of pair (0 if the rules don't allow splitting it)
+        if HARD_CARD_VALUES[hand.cards[0].code] == 1:
+            pair_kind = SPLIT_ACE_PAIR if self.split_from_aces[hand_index] else ACE_PAIR
+        else:
+            pair_kind = PAIR
+        return len(self.player_hands) < self.rules.split_limits[pair_kind]
+
+    def split_hand(self, hand_index):
+        """
+        Split the specified hand, returning the index of the new hand (or None if it can't be split).
+        When aces are split, each hand receives exactly one more card and its turn ends, unless
+        that card makes a new pair of aces which the rules allow to be split again.
+        """
+        if not self.can_split(hand_index):
+            return None
+
+        self.actions.append((hand_index, SPLIT))
+        new_hand_index = self.separate_pair(hand_index)
+
+        # Check if splitting involves aces
+        if self.player_hands[hand_index].cards[0].rank == "Ace":
+            self.complete_split_aces(hand_index, new_hand_index)
+
+        return new_hand_index
+
+    def separate_pair(self, hand_index):
+        """
+        Move the second card of the given pair into a new hand and return the new hand's index.
+        """
+        new_hand = Hand()
+        new_hand.add_card(self.player_hands[hand_index].pop_card())
+        self.player_hands.append(new_hand)
+        self.player_hand_turn_over.append(False)
+        self.split_from_aces.append(False)
+        self.doubled.append(False)
+        self.surrendered.append(False)
+        return len(self.player_hands) - 1
+
+    def complete_split_aces(self, hand_index, new_hand_index):
+        """
+        Deal the single card each hand receives after splitting aces and end their turns.
+        """
+        self.split_from_aces[hand_index] = True
+        self.split_from_aces[new_hand_index] = True
+
+        # Deal one card to each hand
+        self.deal_card_to_player(hand_index)
+        self.deal_card_to_player(new_hand_index)
+
+        # Keep a hand open only while it can still be resplit
+        self.player_hand_turn_over[hand_index] = not self.can_split(hand_index)
+        self.player_hand_turn_over[new_hand_index] = not self.can_split(new_hand_index)
+
+        # If all hands are done, transition to the dealer's turn
+        if all(self.player_hand_turn_over):
+            self.player_turn_over = True
+            self.dealer_play()
+
+    def dealer_should_hit(self):
+        """
+        Returns true if the dealer must draw another card.
+        The dealer hits below 17 (and on a soft 17 if the rules say so), standing on everything else (including a bust).
+        """
+        dealer_hand = self.dealer_card_set
+        return self.rules.dealer_hits[dealer_hand.hard * 2 + (dealer_hand.aces > 0)]
+
+    def reveal_dealer_cards(self):
+        """ Reveal all dealer cards at the end of the game"""
+        self.dealer_card_set.reveal_all()
+
+    def begin_dealer_turn(self):
+        """
+        Check the dealer is allowed to play and turn over their hidden card.
+        """
+        if not self.player_turn_over:
+            raise ValueError("Dealer trying to play before player turn end")
+        elif self.round_over:
+            raise ValueError("Dealer trying to play after hand end")
+
+        self.reveal_dealer_cards()
+
+    def dealer_turn_step(self):
+        """
+        Execute one step of the dealer's play sequence.
+        Returns True if the dealer drew a card, or False once the dealer stands or busts and the round is over.
+        """
+        if not self.dealer_should_hit():
+            self.round_over = True
+            return False
+
+        self.deal_card_to_dealer(revealed=True)
+        return True
+
+    def dealer_play(self):
+        """
+        Dealer's turn to play after the player stands or goes bust on every hand, resolved instantly.
+        """
+        self.begin_dealer_turn()
+        while self.dealer_turn_step():
+            pass
+
+    def hand_outcome(self, hand_index=0):
+        """
+        Returns the outcome of the given player hand against the dealer's final hand, as one of the OUTCOME values in rules_architecture.
+        If both the player and the dealer bust, the hand is a draw.
+        """
+        if self.surrendered[hand_index]:
+            return OUTCOME_SURRENDER
+
+        #When naturals are paid out, a natural beats any other hand (and two naturals draw)
+        if self.rules.naturals:
+            player_natural = self.is_natural(hand_index)
+            dealer_natural = self.dealer_has_natural()
+            if player_natural and dealer_natural:
+                return OUTCOME_DRAW
+            elif player_natural:
+                return OUTCOME_BLACKJACK
+            elif dealer_natural:
+                return OUTCOME_LOSE
+
+        player_hand = self.player_hands[hand_index]
+        dealer_hand = self.dealer_card_set
+
+        if player_hand.is_bust():
+            return OUTCOME_DRAW if dealer_hand.is_bust() else OUTCOME_LOSE
+        elif dealer_hand.is_bust():
+            return OUTCOME_WIN
+
+        player_total = player_hand.total()
+        dealer_total = dealer_hand.total()
+        if player_total > dealer_total:
+            return OUTCOME_WIN
+        elif player_total < dealer_total:
+            return OUTCOME_LOSE
+        return OUTCOME_DRAW
+
+    def hand_result(self, hand_index=0):
+        """
+        Returns WIN, DRAW or LOSE for the given player hand against the dealer's final hand (a surrender is a loss).
+        """
+        return OUTCOME_RESULTS[self.hand_outcome(hand_index)]
+
+    def results(self):
+        """Returns the result of every player hand once the round is over."""
+        if not self.round_over:
+            raise ValueError("Results requested before the end of the round")
+        return [self.hand_result(i) for i in range(len(self.player_hands))]
+
+    def payouts(self):
+        """
+        Returns the units won (or lost, if negative) by every player hand once the round is over, for a stake of 1 unit per hand.
+        This accounts for doubled stakes, surrenders and the blackjack payout.
+        """
+        if not self.round_over:
+            raise ValueError("Payouts requested before the end of the round")
+        payouts = self.rules.payouts
+        return [payouts[self.hand_outcome(i)] * (2 if self.doubled[i] else 1) for i in range(len(self.player_hands))]
+
+
+def dealer_style_strategy(hand, dealer_upcard, can_split):
+    """
+    Simple strategy that mimics the dealer: hit below 17 and stand otherwise, never splitting.
+    """
+    return HIT if hand.total() < 17 else STAND
+
+
+class Table_Strategy:
+    """
+    Fixed player strategy looked up from decision tables, usable as a strategy callback.
+
+    Each table is indexed as table[value][upcard], where upcard is the dealer's up card value
+    with an ace counted as 1 (so 1-10), and the entries are HIT, STAND or SPLIT:
+    - hard (22 x 11): actions by hard hand total (0-21)
+    - soft (22 x 11): actions by soft hand total (0-21)
+    - pairs (11 x 11): whether to split a pair, by the value of the paired cards (ace as 1)
+    """
+    def __init__(self, hard, soft, pairs):
+        self.hard = hard
+        self.soft = soft
+        self.pairs = pairs
+
+    def __call__(self, hand, dealer_upcard, can_split):
+        upcard = HARD_CARD_VALUES[dealer_upcard.code]
+
+        if can_split and self.pairs[HARD_CARD_VALUES[hand.cards[0].code]][upcard]:
+            return SPLIT
+        if hand.is_soft():
+            return self.soft[hand.total()][upcard]
+        return self.hard[hand.total()][upcard]
+
+
+def basic_strategy():
+    """
+    Returns the standard multi-deck basic strategy for hitting, standing and splitting as a Table_Strategy.
+    (It never doubles or surrenders, as the default rules don't offer them, so those hands fall back to hitting or standing.)
+    """
+    def stand_against(low, high):
+        """Row of actions standing against upcards low-high (ace as 1) and hitting otherwise."""
+        return [STAND if low <= upcard <= high else HIT for upcard in range(11)]
+
+    hard = [[HIT] * 11 for _ in range(22)]
+    hard[12] = stand_against(4, 6)
+    for total in range(13, 17):
+        hard[total] = stand_against(2, 6)
+    for total in range(17, 22):
+        hard[total] = [STAND] * 11
+
+    soft = [[HIT] * 11 for _ in range(22)]
+    soft[18] = stand_against(2, 8)
+    for total in range(19, 22):
+        soft[total] = [STAND] * 11
+
+    def split_against(*upcards):
+        """Row of split decisions splitting only against the given upcards (ace as 1)."""
+        return [upcard in upcards for upcard in range(11)]
+
+    pairs = [[False] * 11 for _ in range(11)]
+    pairs[1] = split_against(*range(1, 11))
+    pairs[2] = split_against(2, 3, 4, 5, 6, 7)
+    pairs[3] = split_against(2, 3, 4, 5, 6, 7)
+    pairs[6] = split_against(2, 3, 4, 5, 6)
+    pairs[7] = split_against(2, 3, 4, 5, 6, 7)
+    pairs[8] = split_against(*range(1, 11))
+    pairs[9] = split_against(2, 3, 4, 5, 6, 8, 9)
+
+    return Table_Strategy(hard, soft, pairs)
+
+
+class Bet_Spread:
+    """
+    Bet sizing by true count, usable as a bet callback: calling it with a true count returns the stake in units.
+
+    The ramp is a sequence of (true count, bet) steps: the bet is that of the highest step the true count has reached,
+    or min_bet below the first step.
+    """
+    def __init__(self, ramp=((1, 1), (2, 2), (3, 4), (4, 8)), min_bet=1):
+        steps = sorted(ramp)
+        self.thresholds = [true_count for true_count, _ in steps]
+        self.bets = [min_bet] + [bet for _, bet in steps]
+
+    def __call__(self, true_count):
+        return self.bets[bisect_right(self.thresholds, true_count)]
+
+
+class Blackjack_Engine:
+    """
+    Plays complete rounds of Blackjack headlessly as fast as possible.
+
+    - Asks a strategy callback for every player decision instead of waiting for button presses.
+    - Resolves the dealer's play instantly, with no UI updates or timers.
+    - Reshuffles the deck between rounds once the cut card has been reached.
+
+    A strategy is any callable taking (hand, dealer_upcard, can_split) and returning HIT, STAND or SPLIT,
+    or DOUBLE or SURRENDER where the rules allow them.
+    """
+    def __init__(self, strategy=dealer_style_strategy, deck=None, num_decks=NUM_DECKS, max_hands=MAX_HANDS, allow_resplitting_aces=ALLOW_RESPLITTING_ACES, dealer_hits_soft_17=DEALER_HITS_SOFT_17, round_log=None, seed=None, rules=None, output=None):
+        """
+        Initializes the engine.
+
+        Args:
+            strategy (callable): Decision callback for the player's hands.
+            deck (Deck): Deck to deal from (a new shuffled deck of 'num_decks' decks is created if None).
+            num_decks (int): Number of decks in the shoe when no deck is given.
+            max_hands (int): Maximum number of hands the player can split into.
+            allow_resplitting_aces (bool): Whether a hand made by splitting aces can be split again.
+            dealer_hits_soft_17 (bool): Whether the dealer hits or stands on a soft 17.
+            round_log (Round_Log_Writer): Log to append a record of every round to (None to not log).
+            seed (int): Seed for the new deck when no deck is given, making the run reproducible (see Deck).
+            rules (Rule_Set): The full rules to play by, overriding max_hands, allow_resplitting_aces and dealer_hits_soft_17.
+            output (Output_Sink): Where a new deck announces its reshuffles (discarded if None, as nobody watches a simulation).
+        """
+        self.strategy = strategy
+        self.deck = deck if deck is not None else Deck(num_decks=num_decks, seed=seed, output=output if output is not None else Discard_Sink())
+        self.round = Blackjack_Round(self.deck, max_hands=max_hands, allow_resplitting_aces=allow_resplitting_aces, dealer_hits_soft_17=dealer_hits_soft_17, rules=rules)
+        self.rounds_played = 0
+        self.round_log = round_log
+
+    def play_round(self):
+        """
+        Plays a single round from the deal to the dealer's final card.
+        Returns the list of results (WIN/DRAW/LOSE) for each player hand.
+        """
+        current_round = self.play_hands()
+        results = current_round.results()
+        if self.round_log is not None:
+            self.round_log.write_round(current_round, results)
+        return results
+
+    def play_hands(self):
+        """
+        Plays a single round from the deal to the dealer's final card, leaving the results to be read from the returned round.
+        """
+        #Reshuffle if the cut card came out last round
+        if self.deck.should_shuffle_after_hand:
+            self.deck.new_deck(decks=self.deck.num_decks)
+
+        current_round = self.round
+        current_round.reset_all_hands()
+        current_round.deal_initial_hands()
+
+        dealer_upcard = current_round.dealer_card_set.cards[0]
+        strategy = self.strategy
+        turn_over = current_round.player_hand_turn_over
+
+        #Keep asking for decisions on the first unfinished hand until every hand is done
+        while not current_round.player_turn_over:
+            hand_index = turn_over.index(False)
+            can_split = current_round.can_split(hand_index)
+            action = strategy(current_round.player_hands[hand_index], dealer_upcard, can_split)
+
+            #A hand made by splitting aces can't take more cards, so a hit there is played as a stand
+            if action == HIT and current_round.split_from_aces[hand_index]:
+                action = STAND
+
+            if action == HIT:
+                current_round.player_hits(hand_index)
+            elif action == STAND:
+                current_round.player_stands(hand_index)
+            elif action == SPLIT and can_split:
+                current_round.split_hand(hand_index)
+                turn_over = current_round.player_hand_turn_over
+            elif action == DOUBLE and current_round.can_double(hand_index):
+                current_round.player_doubles(hand_index)
+            elif action == SURRENDER and current_round.can_surrender(hand_index):
+                current_round.player_surrenders(hand_index)
+            else:
+                raise ValueError(f"Invalid action from strategy: {action}")
+
+        self.rounds_played += 1
+        return current_round
+
+    def play_rounds(self, num_rounds):
+        """
+        Plays 'num_rounds' rounds and returns a summary of the results as a dictionary with
+        the number of rounds and hands played, the wins, draws and losses, and the net units won
+        (including doubled stakes, surrenders and blackjack payouts).
+        """
+        outcome_counts = [0] * len(OUTCOME_RESULTS)
+        net = 0
+        play_hands = self.play_hands
+        current_round = self.round
+        hand_outcome = current_round.hand_outcome
+        payouts = current_round.rules.payouts
+        round_log = self.round_log
+
+        #Settle each hand once, counting its outcome and adding its payout
+        for _ in range(num_rounds):
+            play_hands()
+            doubled = current_round.doubled
+            for hand_index in range(len(current_round.player_hands)):
+                outcome = hand_outcome(hand_index)
+                outcome_counts[outcome] += 1
+                net += payouts[outcome] * 2 if doubled[hand_index] else payouts[outcome]
+            if round_log is not None:
+                round_log.write_round(current_round)
+
+        wins = sum(count for outcome, count in enumerate(outcome_counts) if OUTCOME_RESULTS[outcome] == WIN)
+        losses = sum(count for outcome, count in enumerate(outcome_counts) if OUTCOME_RESULTS[outcome] == LOSE)
+        draws = sum(outcome_counts) - wins - losses
+        return {
+            "rounds": num_rounds,
+            "hands": wins + draws + losses,
+            "wins": wins,
+            "draws": draws,
+            "losses": losses,
+            "net": net,
+        }
+
+    def simulate(self, max_rounds=None, ci_width=None, confidence=STATS_CONFIDENCE, check_rounds=STATS_CHECK_ROUNDS, stats=None):
+        """
+        Plays rounds, adding each to streaming statistics as it finishes, until 'max_rounds' have been played
+        or the confidence interval of the house edge is narrower than 'ci_width', whichever comes first.
+
+        Args:
+            max_rounds (int): Most rounds to play (no limit if None, in which case 'ci_width' must be given).
+            ci_width (float): Width of the house edge's confidence interval (in units per round) to stop at (None to play every round).
+            confidence (float): Confidence level of the interval.
+            check_rounds (int): Rounds played between checks of the interval.
+            stats (Simulation_Stats): Statistics to add the rounds to, e.g. to carry on an earlier run (new statistics if None).
+        Returns:
+            Simulation_Stats: The statistics of the rounds played.
+        """
+        if max_rounds is None and ci_width is None:
+            raise ValueError("A simulation needs a number of rounds or a confidence interval width to stop at")
+
+        stats = stats if stats is not None else Simulation_Stats()
+        play_hands = self.play_hands
+        current_round = self.round
+        hand_outcome = current_round.hand_outcome
+        payouts = current_round.rules.payouts
+        round_log = self.round_log
+        add_round = stats.add_round
+        add_hand = stats.add_hand
+
+        rounds_played = 0
+        while max_rounds is None or rounds_played < max_rounds:
+            batch = check_rounds if max_rounds is None else min(check_rounds, max_rounds - rounds_played)
+            for _ in range(batch):
+                play_hands()
+                upcard = current_round.dealer_card_set.cards[0].points
+                doubled = current_round.doubled
+                round_net = 0
+                for hand_index, hand in enumerate(current_round.player_hands):
+                    outcome = hand_outcome(hand_index)
+                    round_net += payouts[outcome] * 2 if doubled[hand_index] else payouts[outcome]
+                    add_hand(hand.total(), upcard, OUTCOME_RESULTS[outcome], hand.is_bust())
+                add_round(round_net)
+                if round_log is not None:
+                    round_log.write_round(current_round)
+            rounds_played += batch
+
+            if ci_width is not None and stats.confidence_width(confidence) <= ci_width:
+                break
+
+        return stats
+
+    def play_rounds_with_bets(self, num_rounds, bet_spread=None):
+        """
+        Plays 'num_rounds' rounds, staking each by the deck's true count at the start of the round,
+        and reports the results per true count bucket (the true count rounded down to a whole number).
+
+        Args:
+            num_rounds (int): Number of rounds to play.
+            bet_spread (callable): Takes the true count and returns the stake in units (a default Bet_Spread if None).
+        Returns:
+            dict: The totals over every round ("rounds", "hands", "wins", "draws", "losses", "wagered", "net", "win_rate")
+            with the same summary for each bucket under "buckets", keyed by true count.
+        """
+        bet_spread = bet_spread if bet_spread is not None else Bet_Spread()
+        deck = self.deck
+        play_round = self.play_round
+        current_round = self.round
+        buckets = {}
+
+        for _ in range(num_rounds):
+            #Reshuffle before reading the count, so the bet is made on the shoe that will actually be dealt from
+            if deck.should_shuffle_after_hand:
+                deck.new_deck(decks=deck.num_decks)
+
+            true_count = deck.true_count()
+            bet = bet_spread(true_count)
+            bucket = buckets.get(math.floor(true_count))
+            if bucket is None:
+                bucket = buckets[math.floor(true_count)] = {"rounds": 0, "hands": 0, "wins": 0, "draws": 0, "losses": 0, "wagered": 0, "net": 0}
+
+            results = play_round()
+            bucket["rounds"] += 1
+            bucket["hands"] += len(results)
+            bucket["wagered"] += bet * (len(results) + sum(current_round.doubled))
+            bucket["net"] += bet * sum(current_round.payouts())
+            for result in results:
+                if result == WIN:
+                    bucket["wins"] += 1
+                elif result == LOSE:
+                    bucket["losses"] += 1
+                else:
+                    bucket["draws"] += 1
+
+        totals = {key: sum(bucket[key] for bucket in buckets.values()) for key in ("rounds", "hands", "wins", "draws", "losses", "wagered", "net")}
+        for summary in [totals, *buckets.values()]:
+            summary["win_rate"] = summary["wins"] / summary["hands"] if summary["hands"] else 0.0
+        totals["buckets"] = dict(sorted(buckets.items()))
+        return totals
@@ -1,50 +1,38 @@
-from deck_architecture import Deck, Card, Hand
-from GUI_architecture import BlackjackUI
-from config import NUM_DECKS, MAX_HANDS, ALLOW_RESPLITTING_ACES
-
-class Blackjack_Hand:
+import random
+from deck_architecture import Deck
+from engine_architecture import Blackjack_Round, WIN, DRAW, LOSE
+from log_architecture import Round_Log_Writer
+from output_architecture import output_sink
+from config import NUM_DECKS, ROUND_LOG_PATH, UI_RENDERER
+
+class Blackjack_Hand(Blackjack_Round):
     """
-    Manages the logic for a single round of Blackjack:
+    Manages the logic for a single round of Blackjack played through the GUI:
     
-    - Handles player and dealer hands, including dealing cards, splitting, and standing.
-    - Tracks the state of the round (e.g., player's turn, dealer's turn).
-    - Interfaces with the UI to update the display during gameplay.
+    - Uses the rules in `Blackjack_Round` for dealing, splitting, standing and the dealer's play.
+    - Reports the state of the round to its output sink (the terminal by default) as it progresses.
+    - Interfaces with the UI to update the display during gameplay, pacing the dealer's cards.
     """
-    def __init__(self,deck,ui):
+    def __init__(self,deck,ui,round_log=None,output=None):
         """
         Initializes a new Blackjack hand.
 
         Args:
             deck (Deck): The deck of cards used for the game.
             ui (BlackjackUI): The UI object for displaying the game state.
+            round_log (Round_Log_Writer): Log to append a record of the round to once it's over (None to not log).
+            output (Output_Sink): Where the state of the round is reported (the deck's sink if None).
         """
-
-        self.deck = deck
+        super().__init__(deck)
         self.ui = ui
-        self.dealer_card_set = Hand()  # Hand object to store dealer's cards
-        self.player_hands = [Hand()] #Start with an empty set of 1 hand
-
-        self.player_hand_turn_over = [False] #Track which of the player's hands' turns are over
-
-        self.player_turn_over = False  # Track if the player's turn is over for all hands
-        self.round_over = False #Track if the player and dealer turns are both over
+        self.round_log = round_log
+        self.output = output if output is not None else deck.output
 
     def reset_all_hands(self):
-        """ Reset player and dealer hands using the reset method in Hand class"""
-
-        self.dealer_card_set.reset() #Reset the dealer's hand
-        self.player_hands = [Hand()] #Reset any number of hands back to a standard 1 new hand object
-        self.player_hand_turn_over = [False]
-
-        self.player_turn_over = False
-        self.round_over = False
-
+        """ Reset player and dealer hands and the player windows"""
+        super().reset_all_hands()
         self.ui.reset_player_windows()
 
-    def num_hands(self):
-        """Return the number of hands currently in play."""
-        return len(self.player_hands)
-
     def update_ui(self):
         """ Update the UI to reflect the current hands"""
 
@@ -54,24 +42,25 @@ class Blackjack_Hand:
 
     def display_hand(self, card_set, owner, standing=False):
         """
-        Display the hand of a player or dealer in the terminal.
+        Display the hand of a player or dealer in the terminal (or wherever the output sink sends it).
         Args:
             hand (Hand): The player's or dealer's hand.
             owner (str): The owner of the hand (Player or Dealer).
             standing (bool): Whether the player or dealer is standing.
         """
+        if not self.output.enabled:
+            return #Nobody is watching, so skip building the strings
+
         # Determine which cards need to be revealed based on the owner and standing status (player is always revealed, hace to check for dealer)
-        show_hidden_cards = ("Player" in owner or all(card.revealed for card in card_set.cards))
+        show_hidden_cards = ("Player" in owner or card_set.all_revealed())
     
         # Generate card strings and totals based on standing status
         cards_str = card_set.get_deckstring(show_hidden_cards=show_hidden_cards)
         total_str = card_set.display_score_string(show_hidden_cards=show_hidden_cards, standing=standing)
 
-        #Print the current state of hands to the terminal
-        if standing:
-            print(f"{owner}'s Hand: [{cards_str}] - Total: {total_str} (Standing)")
-        else:
-            print(f"{owner}'s Hand: [{cards_str}] - Total: {total_str}")
+        #Output the current state of the hand
+        template = "{owner}'s Hand: [{cards}] - Total: {total} (Standing)" if standing else "{owner}'s Hand: [{cards}] - Total: {total}"
+        self.output.emit("hand", template, owner=owner, cards=cards_str, total=total_str, standing=standing)
 
     def display_hands(self):
         """Display the current state of the player's and dealer's hands in the terminal."""
@@ -80,47 +69,34 @@ class Blackjack_Hand:
                 self.display_hand(hand,f"Player Hand {i+1}",standing=standing)
             
         self.display_hand(self.dealer_card_set, "Dealer")
-        print(" ")
+        self.output.emit(None, " ")
 
     def deal_card_to_player(self,hand_index = 0, print_to_terminal=True):
         """
         Deals a card from the deck to the player's hand with index 'hand_index' and print the updated hands if specified by 'print_to_terminal'.
         """
-        if self.player_turn_over:
-            raise ValueError("Player trying to be dealt to after turn end")
-        
-        new_card = self.deck.deal_card()
-        new_card.revealed = True
-        self.player_hands[hand_index].add_card(new_card)    
+        new_card = super().deal_card_to_player(hand_index)
 
         if print_to_terminal:
             self.display_hands()
 
         self.update_ui()
+        return new_card
         
     def deal_card_to_dealer(self,revealed=True,print_to_terminal=True):
         """
         Deals a card from the deck to the dealer's hand and print the updated hands if specified by 'print_to_terminal'.
         """
-        if self.round_over:
-            raise ValueError("Dealer trying to be dealt to after hand end")
-        
-        new_card = self.deck.deal_card()
-
-        if revealed:    
-            new_card.revealed = True
-        else:
-            new_card.revealed = False
-
-        self.dealer_card_set.add_card(new_card)
+        new_card = super().deal_card_to_dealer(revealed)
 
         if print_to_terminal:
             self.display_hands()
 
         self.update_ui()
+        return new_card
 
     def deal_initial_hands(self):
-        """Deal two cards to the first player's hand and one to the dealer."""
+        """Deal two cards to the first player's hand and two to the dealer, printing once all are dealt."""
 
         for i in range(2):
             self.deal_card_to_player(0, print_to_terminal=False)
@@ -135,106 +111,78 @@ class Blackjack_Hand:
 
         self.ui.player_displays[0].enable_hit_stand_buttons()
 
+        #A dealer natural ends the round before the player acts when the rules pay out naturals
+        if self.check_naturals() and self.round_over and self.dealer_has_natural():
+            self.output.emit("dealer_blackjack", "Dealer has blackjack")
+            self.display_hand(self.dealer_card_set, "Dealer", standing=True)
+            self.end_round()
+
     def player_stands(self, hand_index = 0):
         """
         Handle the player's decision to stand.
         """        
-        print(f"Player stands on hand {hand_index+1} with {self.player_hands[hand_index].total()}")
+        self.output.emit("stand", "Player stands on hand {hand} with {total}", hand=hand_index + 1, total=self.player_hands[hand_index].total())
         self.player_hand_turn_over[hand_index] = True
         self.display_hands()
         self.update_ui() 
 
-        if all(self.player_hand_turn_over):
-            self.player_turn_over = True
-            self.dealer_play()
-    
-    def can_split(self, hand_index=0):
-        """Check if the specified hand can be split."""
-        hand = self.player_hands[hand_index]
+        super().player_stands(hand_index)
 
-        #Check if the hand is a pair
-        if not hand.is_pair():
-            return False
-        
-        #Check if the player has reached the maximum split limit
-        if len(self.player_hands) >= MAX_HANDS:
-            return False
-        
-        #Check if the rules allow splitting aces
-        if hand.cards[0].rank == "Ace" and not ALLOW_RESPLITTING_ACES:
-            return False 
+    def separate_pair(self, hand_index):
+        """Split the pair into a new hand and add a window for it."""
+        new_hand_index = super().separate_pair(hand_index)
+
+        # Notify the UI to add a new window for the new hand
+        self.ui.add_player_window(new_hand_index)
 
-        return True
+        # Update hand values for both hands
+        self.ui.player_displays[hand_index].update_hand_value_labels(self.player_hands[hand_index].total(), self.dealer_card_set.total(), dealer_revealed=False)
+        self.ui.player_displays[new_hand_index].update_hand_value_labels(self.player_hands[new_hand_index].total(), self.dealer_card_set.total(), dealer_revealed=False)
+
+        return new_hand_index
 
     def split_hand(self, hand_index):
         """Split the specified hand."""
-        if self.can_split(hand_index):
-            # Create a new hand for the second card
-            new_hand = Hand()
-            new_hand.add_card(self.player_hands[hand_index].cards.pop())
-            self.player_hands.append(new_hand)
-            self.player_hand_turn_over.append(False)
-
-            # Notify the UI to add a new window for the new hand
-            new_hand_index = len(self.player_hands) - 1
-            self.ui.add_player_window(new_hand_index)
-
-            # Update hand values for both hands
-            self.ui.player_displays[hand_index].update_hand_value_labels(self.player_hands[hand_index].total(), self.dealer_card_set.total(), dealer_revealed=False)
-            self.ui.player_displays[new_hand_index].update_hand_value_labels(new_hand.total(), self.dealer_card_set.total(), dealer_revealed=False)
-
-            # Check if splitting involves aces
-            if self.player_hands[hand_index].cards[0].rank == "Ace":
-                # Deal one card to each hand
-                self.deal_card_to_player(hand_index, print_to_terminal=False)
-                self.deal_card_to_player(new_hand_index, print_to_terminal=False)
-
-                # Mark both hands as "turn over"
-                self.player_hand_turn_over[hand_index] = True
-                self.player_hand_turn_over[new_hand_index] = True
-
-                # If all hands are done, transition to the dealer's turn
-                if all(self.player_hand_turn_over):
-                    self.player_turn_over = True
-                    self.dealer_play()
+        new_hand_index = super().split_hand(hand_index)
 
+        if new_hand_index is not None:
             self.update_ui()
-            print(f"Split performed on Hand {hand_index + 1}")     
+            self.output.emit("split", "Split performed on Hand {hand}", hand=hand_index + 1)
+
+        return new_hand_index
 
     def check_bust(self, hand_index = 0):
         """
         Check if the player's hand has gone bust using the existing `is_bust()` method.
         """
         if self.player_hands[hand_index].is_bust():
-            print(f"Player hand {hand_index + 1} busts at {self.player_hands[hand_index].hard_total()}")
-            print(" ")
-            self.player_hand_turn_over[hand_index] = True
-            
-            if all(self.player_hand_turn_over):
-                self.player_turn_over = True
-                self.dealer_play()
+            self.output.emit("bust", "Player hand {hand} busts at {total}", hand=hand_index + 1, total=self.player_hands[hand_index].hard_total())
+            self.output.emit(None, " ")
+
+        return super().check_bust(hand_index)
                         
     def dealer_play(self):
         """
         Dealer's turn to play after player stands or goes bust.
-        Dealer hits until reaching at least a hard 17.
+        The dealer's whole turn is resolved at once, and each card is queued for the UI to show after a short delay
+        (see DEALER_CARD_DELAY_MS), so the round is settled before the animation even starts.
         """
-        if not self.player_turn_over:
-            raise ValueError("Dealer trying to play before player turn end")
-        elif self.round_over:
-            raise ValueError("Dealer trying to play after hand end")
-            
-        print(f"Dealer's turn begins at {self.dealer_card_set.total()}")
-        print("")
-        
-        self.reveal_dealer_cards()
-        self.dealer_turn_step()
+        self.begin_dealer_turn()
+
+        self.output.emit("dealer_turn", "Dealer's turn begins at {total}", total=self.dealer_card_set.total())
+        self.output.emit(None, "")
+
+        self.ui.animate_dealer_hand(self.dealer_card_set, delay_ms=0) #Show the hole card straight away
+
+        while self.dealer_turn_step():
+            pass
 
     def determine_winner(self):
         """
         Determine the result for each player hand (win/lose/draw) against the dealer.
         """
         if self.round_over:
+            dealer_hand = self.dealer_card_set
             for i, player_hand in enumerate(self.player_hands):
                 
                 # Player's hand identifier for output
@@ -243,60 +191,69 @@ class Blackjack_Hand:
                 else:
                     hand_label = f"Player Hand {i+1}"
 
+                result = self.hand_result(i)
+
                 # Check if the player's hand is a bust
                 if player_hand.is_bust():
-                    if self.dealer_card_set.is_bust():
+                    if result == DRAW:
                         #Dealer and player bust, it's a draw
-                        print(f"Draw: {hand_label} busts on {player_hand.hard_total()}, Dealer busts on {self.dealer_card_set.hard_total()}")
+                        template = "Draw: {hand} busts on {player_total}, Dealer busts on {dealer_total}"
                     else:
                         #Player busts, dealer wins
-                        print(f"{hand_label} loses: Busts on {player_hand.hard_total()}, Dealer stands on {self.dealer_card_set.total()}")
-                elif self.dealer_card_set.is_bust():
+                        template = "{hand} loses: Busts on {player_total}, Dealer stands on {dealer_total}"
+                    player_total = player_hand.hard_total()
+                elif dealer_hand.is_bust():
                     # Dealer busts, player wins
-                    print(f"{hand_label} wins: Stands on {player_hand.total()}, Dealer busts on {self.dealer_card_set.hard_total()}")
-                elif player_hand.total() < self.dealer_card_set.total():
+                    template = "{hand} wins: Stands on {player_total}, Dealer busts on {dealer_total}"
+                    player_total = player_hand.total()
+                elif result == LOSE:
                     # Dealer has higher total, player loses
-                    print(f"{hand_label} loses: Stands on {player_hand.total()}, Dealer stands on {self.dealer_card_set.total()}")
-                elif player_hand.total() > self.dealer_card_set.total():
+                    template = "{hand} loses: Stands on {player_total}, Dealer stands on {dealer_total}"
+                    player_total = player_hand.total()
+                elif result == WIN:
                     # Player has higher total, player wins
-                    print(f"{hand_label} wins: Stands on {player_hand.total()}, Dealer stands on {self.dealer_card_set.total()}")
+                    template = "{hand} wins: Stands on {player_total}, Dealer stands on {dealer_total}"
+                    player_total = player_hand.total()
                 else:
                     # Totals are equal, it's a draw
-                    print(f"Draw: {hand_label} stands on {player_hand.total()}, Dealer stands on {self.dealer_card_set.total()}")
+                    template = "Draw: {hand} stands on {player_total}, Dealer stands on {dealer_total}"
+                    player_total = player_hand.total()
+
+                dealer_total = dealer_hand.hard_total() if dealer_hand.is_bust() else dealer_hand.total()
+                self.output.emit("result", template, hand=hand_label, player_total=player_total, dealer_total=dealer_total, result=result)
 
     def dealer_turn_step(self):
         """
-        Execute one step of the dealer's play sequence.
+        Execute one step of the dealer's play sequence, queueing any card drawn for the UI to animate.
+        Returns True if the dealer drew a card, or False once the dealer has stood or bust (and the round has been settled).
         """
-        # Calculate current dealer's hard total
-        hard_total = self.dealer_card_set.hard_total()
+        # Dealer hits, so queue the hand as it is now to be shown after the previous card
+        if super().dealer_turn_step():
+            self.ui.animate_dealer_hand(self.dealer_card_set)
+            return True
 
-        # Dealer stands if total is > 17 or exactly 17 and not soft
+        # Dealer has stood or bust, so the round is over
         if self.dealer_card_set.is_bust():
-            print(f"Dealer busts at {hard_total}")
-            self.round_over = True
-            self.determine_winner()
-            self.update_ui()
-            return
-        elif hard_total > 17 or (hard_total == 17 and not self.dealer_card_set.is_soft()):
-            print(f"Dealer stands on {hard_total}")
-            self.round_over = True
+            self.output.emit("dealer_bust", "Dealer busts at {total}", total=self.dealer_card_set.hard_total())
+        else:
+            self.output.emit("dealer_stand", "Dealer stands on {total}", total=self.dealer_card_set.total())
             self.display_hand(self.dealer_card_set, "Dealer", standing=True)
-            self.determine_winner()
-            self.update_ui()
-            return
 
-        # Dealer hits if the total is <= 17 or is a soft 17
-        self.deal_card_to_dealer(revealed=True)
-        self.update_ui()
+        self.end_round()
+        return False
 
-        # Schedule the next step in the dealer's turn after a short delay
-        self.ui.root.after(1000, self.dealer_turn_step)
+    def end_round(self):
+        """Print the result of every hand, log the round and update the UI once the round is over."""
+        self.determine_winner()
+        if self.round_log is not None:
+            self.round_log.write_round(self)
+        self.update_ui()
+        self.ui.finish_dealer_animation() #Show the final state once any queued dealer cards have been shown
+        self.output.flush() #Write out the round's output if the sink holds it back
 
     def reveal_dealer_cards(self):
         """ Reveal all dealer cards at the end of the game"""
-        for card in self.dealer_card_set.cards:
-            card.reveal()
+        super().reveal_dealer_cards()
         self.update_ui()
     
     def play_hand(self):
@@ -313,29 +270,48 @@ class Blackjack_Game:
     - Handles the starting of new rounds and shuffling the deck.
     - Interacts with the `Blackjack_Hand` class to manage the gameplay logic.
     """
-    def __init__(self):
+    def __init__(self, seed=None, shoe_index=0, deck=None, output=None):
         """
         Initializes the Blackjack_Game class.
+        Every game deals from a seeded deck, so any hand can be rebuilt later from the seed and shoe index (see replay_architecture.py).
+
+        Args:
+            seed (int): Seed for the shoes (a random one is picked and printed if None).
+            shoe_index (int): Index of the shoe of the seeded session to start from.
+            deck (Deck): Deck to deal from instead, e.g. one fast-forwarded to a logged round.
+            output (Output_Sink): Where the game's commentary goes, for the deck as well as the hands (the OUTPUT_SINK in config if None).
         """
-        self.deck = Deck(num_decks=NUM_DECKS) #Creates a deck of the specified number of decks
-        self.ui = BlackjackUI(self) #Creates a UI object for the game
+        self.output = output if output is not None else output_sink()
+
+        if deck is None:
+            if seed is None:
+                seed = random.SystemRandom().getrandbits(63)
+            deck = Deck(num_decks=NUM_DECKS, seed=seed, shoe_index=shoe_index, output=self.output) #Creates a deck of the specified number of decks
+        self.deck = deck
+        self.deck.output = self.output
+        self.output.emit("seed", "Deck seed: {seed}, starting at shoe {shoe_index}", seed=self.deck.seed, shoe_index=self.deck.shoe_index)
+
+        from GUI_architecture import UI_RENDERERS #Imported here so the rest of this module can be used without the graphics libraries
+        self.ui = UI_RENDERERS[UI_RENDERER](self) #Creates a UI object for the game (one canvas or one window per hand, see config)
         self.current_hand = None  
         self.round_number = 1 
+        self.round_log = Round_Log_Writer(ROUND_LOG_PATH, num_decks=self.deck.num_decks, seed=self.deck.seed) if ROUND_LOG_PATH else None #Binary record of every round played
 
     def start_new_hand(self):
         """
         Starts a new hand of Blackjack.
         """
+        #Skip the rest of any dealer animation still playing, as its round is already settled
+        self.ui.skip_animations()
+
         #Reshuffle if necessary
         if self.deck.should_shuffle_after_hand:
-            self.deck.new_deck() #Reshuffle by creating a new deck
+            self.deck.new_deck(decks=self.deck.num_decks) #Reshuffle by refilling the shoe with the same number of decks
     
-        self.current_hand = Blackjack_Hand(self.deck, self.ui)
+        self.current_hand = Blackjack_Hand(self.deck, self.ui, round_log=self.round_log, output=self.output)
 
-        #Print a separator and the current hand number
-        print("\n" + "=" * 50)
-        print(f"Starting Hand {self.round_number}")
-        print("=" * 50 + "\n")
+        #Output a separator and the current hand number
+        self.output.emit("new_hand", "\n" + "=" * 50 + "\nStarting Hand {number}\n" + "=" * 50 + "\n", number=self.round_number)
 
         #Start gameplay for the new hand
         self.current_hand.play_hand()
@@ -346,4 +322,9 @@ class Blackjack_Game:
     def play(self):
         # Start the first hand
         self.start_new_hand()
-        self.ui.mainloop()
\ No newline at end of file
+        try:
+            self.ui.mainloop()
+        finally:
+            if self.round_log is not None:
+                self.round_log.close()
+            self.output.close()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import argparse
+import json
+import sys
+import time
+from engine_architecture import Blackjack_Engine, basic_strategy, dealer_style_strategy
+from config import NUM_DECKS, STATS_CONFIDENCE
+
+# Entry point for simulations without the GUI: only the engine is imported, so it starts in milliseconds,
+# needs no display, and worker processes fork without the graphics libraries loaded.
+
+
+def solved_strategy(num_decks):
+    """Returns the basic strategy solved for the config rules and 'num_decks' decks, from the saved tables (needs numpy)."""
+    from tables_architecture import load_tables #Only pulled in when asked for, as it needs numpy
+    return load_tables(num_decks=num_decks).strategy()
+
+
+STRATEGIES = {
+    "basic": lambda num_decks: basic_strategy(),
+    "dealer": lambda num_decks: dealer_style_strategy,
+    "solved": solved_strategy,
+}
+
+
+def run(args):
+    """Plays the rounds described by the parsed command line arguments and returns the summary dictionary."""
+    strategy = STRATEGIES[args.strategy](args.decks)
+
+    if args.workers:
+        #Only pulled in for sharded runs, as it needs numpy
+        from simulation_architecture import run_sharded_simulation
+        return run_sharded_simulation(args.rounds, workers=args.workers, seed=args.seed, strategy=strategy, kind=args.kind,
+                                      ci_width=args.ci_width, confidence=args.confidence, num_decks=args.decks)
+
+    round_log = None
+    if args.log:
+        from log_architecture import Round_Log_Writer
+        round_log = Round_Log_Writer(args.log, num_decks=args.decks, seed=args.seed)
+
+    engine = Blackjack_Engine(strategy, num_decks=args.decks, seed=args.seed, round_log=round_log)
+    try:
+        if args.bets:
+            summary = engine.play_rounds_with_bets(args.rounds)
+        else:
+            summary = engine.simulate(args.rounds, ci_width=args.ci_width, confidence=args.confidence).summary(args.confidence)
+    finally:
+        if round_log is not None:
+            round_log.close()
+
+    summary["seed"] = args.seed
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays Blackjack rounds headlessly and prints a summary of the results as JSON.")
+    parser.add_argument("--rounds", type=int, default=100_000, help="Number of rounds to play (the most played when --ci-width is given)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="basic", help="Player strategy (\"solved\" solves basic strategy for the rules once and saves it, see tables_architecture.py)")
+    parser.add_argument("--decks", type=int, default=NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--seed", type=int, help="Seed for the shoes, making the run reproducible")
+    parser.add_argument("--log", help="Path of a round log to append every round to")
+    parser.add_argument("--bets", action="store_true", help="Vary the bet by true count and report results per count bucket")
+    parser.add_argument("--ci-width", type=float, help="Stop once the house edge's confidence interval is narrower than this (in units per round)")
+    parser.add_argument("--confidence", type=float, default=STATS_CONFIDENCE, help="Confidence level of the house edge interval")
+    parser.add_argument("--workers", type=int, help="Split the run across this many processes (needs numpy)")
+    parser.add_argument("--kind", choices=["batch", "engine"], default="engine", help="Simulator used by each worker when --workers is given")
+    args = parser.parse_args(argv)
+
+    if args.workers and (args.log or args.bets):
+        parser.error("--log and --bets can't be combined with --workers")
+    if args.bets and args.ci_width is not None:
+        parser.error("--ci-width can't be combined with --bets")
+
+    start = time.perf_counter()
+    summary = run(args) #The engine's decks discard their reshuffle announcements, so only the summary is printed
+    summary["seconds"] = time.perf_counter() - start
+
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
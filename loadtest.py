@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from deck_architecture import CARDS, Hand
+from engine_architecture import basic_strategy, HIT, STAND
+from profiling_architecture import percentile
+from server_architecture import Blackjack_Server
+from config import SERVER_HOST
+
+# Load generator for the multi-table server: many simulated players, each at their own table playing basic strategy,
+# share a pool of connections and pipeline their requests over them. Reports the latency of every request and the rounds played per second.
+
+
+class Load_Test_Connection:
+    """
+    One client connection to the server, shared by several simulated players.
+    Requests are tagged with ids so each player can wait for its own response while the others' requests are in flight.
+    """
+    def __init__(self, reader, writer, latencies):
+        """
+        Args:
+            reader (StreamReader): Reading side of the connection.
+            writer (StreamWriter): Writing side of the connection.
+            latencies (list): List the round trip time (in seconds) of every request is appended to.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+        self.pending = {} #Maps the ids of requests awaiting a response to their futures
+        self.ids = itertools.count()
+        self.responses = asyncio.get_running_loop().create_task(self.read_responses())
+
+    @classmethod
+    async def open(cls, host, port, latencies):
+        """Connects to the server."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, latencies)
+
+    async def read_responses(self):
+        """Hands each response to the request waiting for it."""
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            self.pending.pop(response["id"]).set_result(response)
+
+        for future in self.pending.values():
+            future.set_exception(ConnectionError("Server closed the connection"))
+
+    async def request(self, op, **fields):
+        """Sends a request and returns its response, raising a RuntimeError if the server rejected it."""
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+
+        start = time.perf_counter()
+        self.writer.write(json.dumps({"op": op, "id": request_id, **fields}).encode() + b"\n")
+        await self.writer.drain()
+        response = await future
+        self.latencies.append(time.perf_counter() - start)
+
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def close(self):
+        """Closes the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.responses.cancel()
+
+
+def hand_from_codes(codes):
+    """Returns a Hand holding the cards with the given card codes."""
+    hand = Hand()
+    for code in codes:
+        hand.add_card(CARDS[code])
+    return hand
+
+
+async def simulated_player(connection, num_rounds, strategy, seed=None):
+    """
+    Opens a table and plays 'num_rounds' rounds at it with the given strategy, then closes it.
+    Returns the player's net result in units.
+    """
+    table = (await connection.request("new_table", seed=seed))["table"]
+    net = 0
+    for _ in range(num_rounds):
+        state = await connection.request("deal", table=table)
+        while not state["round_over"]:
+            hand_index = state["turn_over"].index(False)
+            hand = hand_from_codes(state["hands"][hand_index])
+            action = strategy(hand, CARDS[state["dealer"][0]], state["can_split"][hand_index])
+
+            #A hand made by splitting aces can't take more cards, so a hit there is played as a stand
+            if action == HIT and not state["can_hit"][hand_index]:
+                action = STAND
+
+            state = await connection.request(action, table=table, hand=hand_index)
+        net += sum(state["payouts"])
+
+    await connection.request("close_table", table=table)
+    return net
+
+
+async def run_load_test(args):
+    """Runs the load test described by the parsed command line arguments and returns the summary dictionary."""
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        #No server given, so host one on this event loop
+        server = await Blackjack_Server(host=host, port=0).start()
+        port = server.port
+
+    latencies = []
+    connections = [await Load_Test_Connection.open(host, port, latencies) for _ in range(min(args.connections, args.players))]
+    strategy = basic_strategy()
+
+    start = time.perf_counter()
+    nets = await asyncio.gather(*(
+        simulated_player(connections[i % len(connections)], args.rounds, strategy, None if args.seed is None else args.seed + i)
+        for i in range(args.players)
+    ))
+    seconds = time.perf_counter() - start
+
+    for connection in connections:
+        await connection.close()
+    if server is not None:
+        await server.close()
+
+    ordered = sorted(latencies)
+    rounds = args.players * args.rounds
+    return {
+        "players": args.players,
+        "connections": len(connections),
+        "rounds": rounds,
+        "requests": len(ordered),
+        "net": sum(nets),
+        "seconds": seconds,
+        "rounds_per_second": rounds / seconds,
+        "requests_per_second": len(ordered) / seconds,
+        "latency_ms": {
+            "p50": percentile(ordered, 0.5) * 1e3,
+            "p99": percentile(ordered, 0.99) * 1e3,
+            "max": ordered[-1] * 1e3,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drives the multi-table server with simulated players and prints latency and throughput as JSON.")
+    parser.add_argument("--players", type=int, default=2000, help="Number of simulated players, each at their own table")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds played by each player")
+    parser.add_argument("--connections", type=int, default=100, help="Number of connections the players share")
+    parser.add_argument("--host", default=SERVER_HOST, help="Address of the server")
+    parser.add_argument("--port", type=int, help="Port of a running server (one is hosted in this process if not given)")
+    parser.add_argument("--seed", type=int, help="Seed for the players' shoes (player i's shoe uses seed + i)")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_load_test(args))
+
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+import mmap
+import os
+import struct
+from collections import namedtuple
+from engine_architecture import HIT, STAND, SPLIT, DOUBLE, SURRENDER
+from config import MAX_HANDS, NUM_DECKS
+
+# The log is a fixed size header followed by one fixed width record per round, so any round can be found by its index
+# and the whole file can be read in place through a memory map.
+LOG_MAGIC = b"BJRL"
+LOG_VERSION = 4
+HEADER_FORMAT = struct.Struct("<4sHBBBH") #Magic, version, max hands, max cards per hand, max actions, record size
+
+# Range of the values stored in each record's fixed width fields
+MIN_SEED = -(1 << 63)
+MAX_SEED = (1 << 63) - 1
+MAX_DECKS = 255
+MAX_SLOTS = 255 #Most card or action slots a record can be sized for
+
+EMPTY_SLOT = 0xFF #Fills the unused card and action slots of a record
+
+# Actions are stored as a byte each: hand index * 8 + the action's code
+ACTION_CODES = {HIT: 0, STAND: 1, SPLIT: 2, DOUBLE: 3, SURRENDER: 4}
+ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+Round_Record = namedtuple("Round_Record", ["seed", "num_decks", "shoe_index", "shoe_position", "dealer_cards", "hands", "actions", "results"])
+Round_Record.__doc__ = """
+A round read back from the log:
+- seed (int): Seed of the deck the round was dealt from (see Deck), or None if it wasn't seeded.
+- num_decks (int): Number of decks in the shoe.
+- shoe_index (int): Which shoe of the session the round was dealt from (see Deck.shoe_index).
+- shoe_position (int): How many cards had been dealt from that shoe before the round.
+- dealer_cards (tuple): Card codes of the dealer's hand, in the order they were dealt.
+- hands (tuple): A tuple of card codes for each player hand.
+- actions (tuple): (hand index, action) of each of the player's decisions, in order.
+- results (tuple): WIN/DRAW/LOSE for each player hand.
+"""
+
+
+def max_hand_cards(num_decks):
+    """
+    Returns the most cards a hand can hold in a shoe of 'num_decks' decks:
+    as many of the lowest cards as fit in 21 (e.g. A, A, A, A, 2, 2, 2, 2, 3, 3, 3 from one deck), plus the card that busts it.
+    """
+    cards = hard = 0
+    for value in range(1, 11):
+        for _ in range(16 * num_decks if value == 10 else 4 * num_decks):
+            if hard + value > 21:
+                return cards + 1
+            hard += value
+            cards += 1
+    return cards
+
+
+def record_struct(max_hands, max_cards, max_actions):
+    """Returns the struct for one record with the given capacity."""
+    return struct.Struct(
+        f"<qBBIHBBB{max_cards}s{max_hands}B{max_hands * max_cards}s{max_hands}b{max_actions}s"
+    )
+
+
+def check_seed(seed):
+    """Raises a ValueError if a deck seed can't be stored in a record (None, for an unseeded deck, can)."""
+    if seed is not None and not (isinstance(seed, int) and MIN_SEED <= seed <= MAX_SEED):
+        raise ValueError(f"A round log can only record integer seeds from {MIN_SEED} to {MAX_SEED}")
+
+
+class Round_Log_Writer:
+    """
+    Appends one fixed width binary record per round to a log file through a buffered file,
+    so logging costs a struct pack and a buffer copy per round rather than any text formatting.
+
+    Records are sized for the largest hands a shoe of 'num_decks' decks can deal, and appending to an existing log
+    checks its header matches, so a file never mixes record layouts.
+    Values that don't fit a record (a seed outside 64 bits, more decks than the log was sized for) raise a ValueError
+    before anything is written, rather than partway through a run.
+    """
+    def __init__(self, path, max_hands=MAX_HANDS, num_decks=NUM_DECKS, seed=None, buffer_size=1 << 16):
+        """
+        Opens (or creates) a log for appending.
+
+        Args:
+            path (str): Path of the log file.
+            max_hands (int): Most player hands a round can have.
+            num_decks (int): Most decks in the shoes of the rounds logged.
+            seed (int): Seed of the deck the rounds will be dealt from, checked up front (None if unknown or unseeded).
+            buffer_size (int): Size in bytes of the write buffer.
+        """
+        if not 1 <= num_decks <= MAX_DECKS:
+            raise ValueError(f"A round log can record shoes of 1 to {MAX_DECKS} decks")
+        check_seed(seed)
+
+        self.path = path
+        self.max_hands = max_hands
+        self.num_decks = num_decks
+        self.max_cards = max_hand_cards(num_decks)
+        self.max_actions = max_hands * (self.max_cards + 1) #Every card a hand can take and one split or stand each
+        if max_hands > MAX_SLOTS or self.max_actions > MAX_SLOTS:
+            raise ValueError("Too many hands for a round log record")
+
+        self.record = record_struct(max_hands, self.max_cards, self.max_actions)
+        self.header = HEADER_FORMAT.pack(LOG_MAGIC, LOG_VERSION, max_hands, self.max_cards, self.max_actions, self.record.size)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                if f.read(HEADER_FORMAT.size) != self.header:
+                    raise ValueError(f"Existing log at {path} has a different record layout")
+            self.file = open(path, "ab", buffering=buffer_size)
+        else:
+            self.file = open(path, "wb", buffering=buffer_size)
+            self.file.write(self.header)
+
+        self.rounds_written = 0
+
+    def write_round(self, current_round, results=None):
+        """
+        Appends a record of a finished round.
+
+        Args:
+            current_round (Blackjack_Round): The round to record.
+            results (list): The result of each player hand (taken from the round if None).
+        """
+        if results is None:
+            results = current_round.results()
+
+        deck = current_round.deck
+        max_cards = self.max_cards
+        player_hands = current_round.player_hands
+        dealer_cards = bytes([card.code for card in current_round.dealer_card_set.cards])
+        actions = bytes([hand_index * 8 + ACTION_CODES[action] for hand_index, action in current_round.actions])
+
+        #Check everything fits before packing, as struct would silently cut off or pad oversized fields
+        if deck.num_decks > self.num_decks:
+            raise ValueError(f"Round was dealt from {deck.num_decks} decks, but the log's records are sized for {self.num_decks}")
+        check_seed(deck.seed)
+        if len(player_hands) > self.max_hands or len(actions) > self.max_actions:
+            raise ValueError("Round has more hands or actions than the log's records can hold")
+        if len(dealer_cards) > max_cards or any(len(hand.cards) > max_cards for hand in player_hands):
+            raise ValueError("Round has a hand with more cards than the log's records can hold")
+
+        hand_cards = bytearray([EMPTY_SLOT]) * (self.max_hands * max_cards)
+        hand_counts = [0] * self.max_hands
+        cards_in_round = len(dealer_cards)
+        for i, hand in enumerate(player_hands):
+            start = i * max_cards
+            hand_cards[start:start + len(hand.cards)] = bytes([card.code for card in hand.cards])
+            hand_counts[i] = len(hand.cards)
+            cards_in_round += len(hand.cards)
+
+        padded_results = list(results) + [0] * (self.max_hands - len(results))
+
+        self.file.write(self.record.pack(
+            deck.seed or 0,
+            deck.seed is not None,
+            deck.num_decks,
+            deck.shoe_index,
+            deck.dealt_cards - cards_in_round, #Every card of the round came from the current shoe
+            len(player_hands),
+            len(dealer_cards),
+            len(actions),
+            dealer_cards.ljust(max_cards, b"\xff"),
+            *hand_counts,
+            bytes(hand_cards),
+            *padded_results,
+            actions.ljust(self.max_actions, b"\xff"),
+        ))
+        self.rounds_written += 1
+
+    def flush(self):
+        """Writes any buffered records to the file."""
+        self.file.flush()
+
+    def close(self):
+        """Flushes and closes the log."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Round_Log_Reader:
+    """
+    Reads a round log in place through a memory map, so millions of rounds can be iterated, indexed or filtered
+    without loading or parsing the file (only the records actually looked at are unpacked).
+    """
+    def __init__(self, path):
+        """
+        Opens a log for reading.
+
+        Args:
+            path (str): Path of the log file.
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.max_hands, self.max_cards, self.max_actions, record_size = HEADER_FORMAT.unpack_from(self.map, 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{path} is not a version {LOG_VERSION} round log")
+        self.record = record_struct(self.max_hands, self.max_cards, self.max_actions)
+        if self.record.size != record_size:
+            raise ValueError(f"{path} has an unexpected record size")
+
+        #A partly written final record (e.g. from a crash mid-write) is ignored
+        self.num_rounds = (len(self.map) - HEADER_FORMAT.size) // record_size
+
+    def __len__(self):
+        return self.num_rounds
+
+    def decode(self, fields):
+        """Returns the Round_Record for a record's unpacked fields."""
+        max_hands = self.max_hands
+        max_cards = self.max_cards
+        seed, has_seed, num_decks, shoe_index, shoe_position, num_hands, num_dealer_cards, num_actions, dealer_cards = fields[:9]
+        hand_counts = fields[9:9 + max_hands]
+        hand_cards = fields[9 + max_hands]
+        results = fields[10 + max_hands:10 + 2 * max_hands]
+        actions = fields[10 + 2 * max_hands]
+
+        return Round_Record(
+            seed if has_seed else None,
+            num_decks,
+            shoe_index,
+            shoe_position,
+            tuple(dealer_cards[:num_dealer_cards]),
+            tuple(tuple(hand_cards[i * max_cards:i * max_cards + hand_counts[i]]) for i in range(num_hands)),
+            tuple((code >> 3, ACTIONS[code & 7]) for code in actions[:num_actions]),
+            results[:num_hands],
+        )
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.num_rounds
+        if not 0 <= index < self.num_rounds:
+            raise IndexError("Round index out of range")
+        return self.decode(self.record.unpack_from(self.map, HEADER_FORMAT.size + index * self.record.size))
+
+    def __iter__(self):
+        records = memoryview(self.map)[HEADER_FORMAT.size:HEADER_FORMAT.size + self.num_rounds * self.record.size]
+        try:
+            for fields in self.record.iter_unpack(records):
+                yield self.decode(fields)
+        finally:
+            records.release()
+
+    def filter(self, predicate):
+        """Yields the rounds for which predicate(record) is true."""
+        return (record for record in self if predicate(record))
+
+    def to_numpy(self):
+        """
+        Returns the log as a NumPy structured array viewing the memory map directly (no copy), for vectorised analytics.
+        Fields: seed, has_seed, num_decks, shoe_index, shoe_position, num_hands, num_dealer_cards, num_actions, dealer_cards, hand_card_counts, hand_cards, results, actions.
+        Requires numpy.
+        """
+        import numpy as np
+
+        dtype = np.dtype([
+            ("seed", "<i8"),
+            ("has_seed", "u1"),
+            ("num_decks", "u1"),
+            ("shoe_index", "<u4"),
+            ("shoe_position", "<u2"),
+            ("num_hands", "u1"),
+            ("num_dealer_cards", "u1"),
+            ("num_actions", "u1"),
+            ("dealer_cards", "u1", (self.max_cards,)),
+            ("hand_card_counts", "u1", (self.max_hands,)),
+            ("hand_cards", "u1", (self.max_hands, self.max_cards)),
+            ("results", "i1", (self.max_hands,)),
+            ("actions", "u1", (self.max_actions,)),
+        ])
+        return np.frombuffer(self.map, dtype=dtype, count=self.num_rounds, offset=HEADER_FORMAT.size)
+
+    def close(self):
+        """Closes the memory map and file."""
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,5 +1,35 @@
+import argparse
 from game_architecture import Blackjack_Game
+from profiling_architecture import instrumentation
+from config import INSTRUMENTATION_ENABLED, INSTRUMENTATION_TRACE, INSTRUMENTATION_SUMMARY_PATH, INSTRUMENTATION_TRACE_PATH
 
 if __name__ == "__main__":
-    game = Blackjack_Game()
-    game.play()
+    parser = argparse.ArgumentParser(description="Play Blackjack against the dealer.")
+    parser.add_argument("--seed", type=int, help="Seed for the shoes, to replay a session's exact cards")
+    parser.add_argument("--shoe", type=int, default=0, help="Index of the shoe of the seeded session to start from")
+    parser.add_argument("--replay", metavar="LOG", help="Round log to pick a round to replay from")
+    parser.add_argument("--round", type=int, default=-1, help="Index in the log of the round to replay (the last round by default)")
+    args = parser.parse_args()
+
+    if INSTRUMENTATION_ENABLED:
+        instrumentation.enable(trace=INSTRUMENTATION_TRACE, load_modules=True)
+
+    if args.replay:
+        #Jump straight to the logged round, replaying the earlier rounds of its shoe headlessly
+        from log_architecture import Round_Log_Reader
+        from replay_architecture import fast_forward
+        with Round_Log_Reader(args.replay) as reader:
+            deck, record = fast_forward(reader, args.round)
+        game = Blackjack_Game(deck=deck)
+    else:
+        game = Blackjack_Game(seed=args.seed, shoe_index=args.shoe)
+
+    try:
+        game.play()
+    finally:
+        #Report where the time went once the game is closed
+        if INSTRUMENTATION_ENABLED:
+            print(instrumentation.format_summary())
+            instrumentation.write_summary(INSTRUMENTATION_SUMMARY_PATH)
+            if INSTRUMENTATION_TRACE:
+                instrumentation.write_chrome_trace(INSTRUMENTATION_TRACE_PATH)
@@ -0,0 +1,131 @@
+import json
+import sys
+from collections import deque
+from config import OUTPUT_SINK, OUTPUT_BUFFER_LINES, OUTPUT_EVENTS_PATH
+
+# Where the game's running commentary (hands, decisions, results, reshuffles) goes.
+# Every message is emitted as an event kind, a str.format template and the template's fields,
+# so text sinks only format what they actually write and the event sink keeps the fields themselves.
+# Messages with no kind are purely cosmetic (e.g. blank separator lines) and are left out of structured output.
+
+
+class Output_Sink:
+    """
+    Base class for the output sinks.
+    Code producing output can check 'enabled' to skip building messages nobody will see.
+    """
+    enabled = True
+
+    def emit(self, kind, template, **fields):
+        """
+        Emits one message.
+
+        Args:
+            kind (str): What the message reports (e.g. "hand", "result", "shuffle"), or None for cosmetic lines.
+            template (str): str.format template of the message as text.
+            **fields: The values filled into the template.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Writes out anything held back."""
+
+    def close(self):
+        """Flushes the sink and releases anything it holds open."""
+        self.flush()
+
+
+class Print_Sink(Output_Sink):
+    """Writes every message to the terminal as soon as it's emitted (the original behaviour)."""
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream (file): Stream to write to (whatever sys.stdout is at the time if None).
+        """
+        self.stream = stream
+
+    def emit(self, kind, template, **fields):
+        print(template.format(**fields), file=self.stream if self.stream is not None else sys.stdout)
+
+
+class Buffered_Sink(Output_Sink):
+    """
+    Collects messages as text and writes them in batches, so a burst of messages costs one write rather than one per line.
+    The batch is written once it holds 'max_lines' lines or whenever the sink is flushed (the game flushes at the end of every round).
+    """
+    def __init__(self, stream=None, max_lines=OUTPUT_BUFFER_LINES):
+        """
+        Args:
+            stream (file): Stream to write to (whatever sys.stdout is at the time if None).
+            max_lines (int): Number of lines held back before a batch is written.
+        """
+        self.stream = stream
+        self.max_lines = max_lines
+        self.lines = []
+
+    def emit(self, kind, template, **fields):
+        self.lines.append(template.format(**fields))
+        if len(self.lines) >= self.max_lines:
+            self.flush()
+
+    def flush(self):
+        if not self.lines:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(self.lines) + "\n")
+        stream.flush()
+        self.lines.clear()
+
+
+class Discard_Sink(Output_Sink):
+    """Drops every message, for simulations where nobody is watching."""
+    enabled = False
+
+    def emit(self, kind, template, **fields):
+        pass
+
+
+class Event_Sink(Output_Sink):
+    """
+    Keeps each message as a structured event, {"event": kind, **fields}, instead of text,
+    for tools that want to consume the game's output rather than read it.
+    Events are kept in memory (the most recent 'max_events' if given) and optionally appended to a JSON lines file.
+    """
+    def __init__(self, path=None, max_events=None):
+        """
+        Args:
+            path (str): File to append each event to as a line of JSON (None to only keep them in memory).
+            max_events (int): Number of recent events kept in memory (all of them if None).
+        """
+        self.events = deque(maxlen=max_events)
+        self.file = open(path, "a") if path is not None else None
+
+    def emit(self, kind, template, **fields):
+        if kind is None:
+            return
+        event = {"event": kind, **fields}
+        self.events.append(event)
+        if self.file is not None:
+            self.file.write(json.dumps(event) + "\n")
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+OUTPUT_SINKS = {
+    "print": Print_Sink,
+    "buffered": Buffered_Sink,
+    "discard": Discard_Sink,
+    "events": lambda: Event_Sink(OUTPUT_EVENTS_PATH),
+}
+
+
+def output_sink(name=OUTPUT_SINK):
+    """Returns a new sink of the named kind ("print", "buffered", "discard" or "events")."""
+    return OUTPUT_SINKS[name]()
@@ -0,0 +1,408 @@
+from functools import lru_cache
+from deck_architecture import CARDS, HARD_CARD_VALUES
+from engine_architecture import HIT, STAND, SPLIT
+from config import DEALER_HITS_SOFT_17
+
+# Final dealer results, in the order of the probabilities returned by dealer_probabilities
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, "Bust")
+BUST_INDEX = 5
+
+# Shoe compositions are tuples of 10 counts by card value: index 0 is aces, 1-8 are 2-9 and 9 is all ten-valued cards
+NUM_VALUES = 10
+
+
+def shoe_counts(card_codes):
+    """
+    Returns the canonical composition (tuple of counts by value, aces first) of a collection of card codes,
+    e.g. `shoe_counts(deck.cards)` for the cards left in a Deck.
+    """
+    counts = [0] * NUM_VALUES
+    for code in card_codes:
+        counts[HARD_CARD_VALUES[code] - 1] += 1
+    return tuple(counts)
+
+
+def full_shoe_counts(num_decks):
+    """Returns the composition of a full shoe of 'num_decks' decks."""
+    return tuple([4 * num_decks] * 9 + [16 * num_decks])
+
+
+def remove_card(counts, value):
+    """Returns the composition with one card of the given value (ace as 1) removed."""
+    index = value - 1
+    if counts[index] <= 0:
+        raise ValueError(f"No cards of value {value} left in the shoe")
+    return counts[:index] + (counts[index] - 1,) + counts[index + 1:]
+
+
+@lru_cache(maxsize=1 << 20)
+def dealer_final_distribution(hard, has_ace, counts, dealer_hits_soft_17):
+    """
+    Returns the probabilities of each final dealer result (see DEALER_OUTCOMES) from a dealer hand with the given
+    hard total and ace status, drawing from a shoe with the given composition.
+    Follows the dealer's rule in `Blackjack_Round.dealer_should_hit`: hit below 17 and, if the rules say so, on soft 17.
+
+    Memoized on the hand and shoe composition, so the many orders of drawing the same cards are only evaluated once.
+    """
+    if hard > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+    soft = has_ace and hard <= 11
+    total = hard + 10 if soft else hard
+    if total > 17 or (total == 17 and not (soft and dealer_hits_soft_17)):
+        result = [0.0] * 6
+        result[total - 17] = 1.0
+        return tuple(result)
+
+    cards_left = sum(counts)
+    if cards_left == 0:
+        raise ValueError("Shoe ran out of cards during the dealer's play")
+
+    #Weight the result after each possible next card by the chance of drawing it
+    result = [0.0] * 6
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        value = index + 1
+        probability = count / cards_left
+        next_hard = hard + value
+        next_has_ace = has_ace or value == 1
+
+        #Settle hands that stop here directly rather than recursing
+        if next_hard > 21:
+            result[BUST_INDEX] += probability
+            continue
+        next_total = next_hard + 10 if next_has_ace and next_hard <= 11 else next_hard
+        if next_total > 17 or (next_total == 17 and not (dealer_hits_soft_17 and next_hard == 7 and next_has_ace)):
+            result[next_total - 17] += probability
+            continue
+
+        next_counts = counts[:index] + (count - 1,) + counts[index + 1:]
+        outcome = dealer_final_distribution(next_hard, next_has_ace, next_counts, dealer_hits_soft_17)
+        for i in range(6):
+            result[i] += probability * outcome[i]
+
+    return tuple(result)
+
+
+@lru_cache(maxsize=1 << 16)
+def dealer_probabilities(upcard, counts, dealer_hits_soft_17=DEALER_HITS_SOFT_17, dealer_peeks=False):
+    """
+    Returns the exact probability of each final dealer result (17, 18, 19, 20, 21, bust) for a given up card.
+
+    Args:
+        upcard (int): Value of the dealer's up card (ace as 1, ten-valued cards as 10).
+        counts (tuple): Composition of the shoe the hole card and any hits are drawn from (see `shoe_counts`),
+            i.e. excluding the up card and any other cards already seen.
+        dealer_hits_soft_17 (bool): Whether the dealer hits or stands on a soft 17.
+        dealer_peeks (bool): Whether the dealer has already checked the hole card for a natural and doesn't have one,
+            as when the rules pay out naturals (see `Blackjack_Round.check_naturals`).
+    Returns:
+        tuple: Six probabilities in the order of DEALER_OUTCOMES.
+    """
+    counts = tuple(counts)
+    natural_value = {1: 10, 10: 1}.get(upcard) if dealer_peeks else None
+    if natural_value is None:
+        return dealer_final_distribution(upcard, upcard == 1, counts, dealer_hits_soft_17)
+
+    #The hole card is one of the cards that doesn't complete a natural, so draw it from those alone
+    natural_index = natural_value - 1
+    cards_left = sum(counts) - counts[natural_index]
+    if cards_left == 0:
+        raise ValueError("No hole card can be drawn without making a natural")
+
+    result = [0.0] * 6
+    for index, count in enumerate(counts):
+        if index == natural_index or count == 0:
+            continue
+        value = index + 1
+        next_counts = counts[:index] + (count - 1,) + counts[index + 1:]
+        outcome = dealer_final_distribution(upcard + value, upcard == 1 or value == 1, next_counts, dealer_hits_soft_17)
+        probability = count / cards_left
+        for i in range(6):
+            result[i] += probability * outcome[i]
+    return tuple(result)
+
+
+def clear_caches():
+    """Empties the memoized dealer distributions (e.g. to free memory between long runs)."""
+    dealer_final_distribution.cache_clear()
+    dealer_probabilities.cache_clear()
+    standing_values.cache_clear()
+
+
+def unseen_counts(current_round):
+    """
+    Returns the composition of the cards the player can't see in a round: those left in the deck plus the dealer's hidden cards.
+    """
+    counts = list(shoe_counts(current_round.deck.cards))
+    dealer_hand = current_round.dealer_card_set
+    for card, revealed in zip(dealer_hand.cards, dealer_hand.revealed):
+        if not revealed:
+            counts[HARD_CARD_VALUES[card.code] - 1] += 1
+    return tuple(counts)
+
+
+def unseen_rank_count(current_round, rank):
+    """Returns how many of the cards the player can't see in a round (see unseen_counts) are of the given rank."""
+    count = sum(1 for code in current_round.deck.cards if CARDS[code].rank == rank)
+    dealer_hand = current_round.dealer_card_set
+    for card, revealed in zip(dealer_hand.cards, dealer_hand.revealed):
+        if not revealed and card.rank == rank:
+            count += 1
+    return count
+
+
+def stand_ev(player_total, dealer_probs):
+    """
+    Returns the expected value of standing on a (non-bust) total against the dealer's final result probabilities.
+    """
+    ev = dealer_probs[BUST_INDEX]
+    for i in range(5):
+        dealer_total = 17 + i
+        if player_total > dealer_total:
+            ev += dealer_probs[i]
+        elif player_total < dealer_total:
+            ev -= dealer_probs[i]
+    return ev
+
+
+def bust_ev(dealer_probs):
+    """
+    Returns the expected value of a bust hand, which is a loss unless the dealer also busts (a draw).
+    """
+    return dealer_probs[BUST_INDEX] - 1.0
+
+
+class Transposition_Table:
+    """
+    Size-bounded cache of solved positions.
+    Once full, the oldest entries are evicted first so memory stays bounded over a long session.
+    """
+    def __init__(self, max_entries=1 << 18):
+        self.max_entries = max_entries
+        self.entries = {} #Maps position keys to values, in insertion order
+
+        # Counters for measuring how well the table is working
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns the stored value for a key, or None if it isn't stored."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the oldest entry if the table is full."""
+        if len(self.entries) >= self.max_entries:
+            del self.entries[next(iter(self.entries))]
+            self.evictions += 1
+        self.entries[key] = value
+
+    def stats(self):
+        """Returns the table counters as a dictionary."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self.entries)}
+
+
+@lru_cache(maxsize=1 << 16)
+def standing_values(upcard, counts, dealer_hits_soft_17=DEALER_HITS_SOFT_17, dealer_peeks=False):
+    """
+    Returns the expected value of standing on each total from 0-21 against a dealer up card and shoe composition,
+    with the expected value of a bust hand appended as a 23rd entry.
+    """
+    dealer_probs = dealer_probabilities(upcard, counts, dealer_hits_soft_17, dealer_peeks)
+    return tuple(stand_ev(total, dealer_probs) for total in range(22)) + (bust_ev(dealer_probs),)
+
+
+class EV_Solver:
+    """
+    Composition-dependent expected value solver for the player's decisions in a round.
+
+    - The chance of each card the player draws comes from the exact unseen composition, depleted as cards are drawn.
+    - The dealer's result probabilities come from `dealer_probabilities` for the unseen composition at the decision
+      point. With exact_dealer=True they are recomputed for the composition at every position in the search instead,
+      which is exact but too slow for interactive use.
+    - When the dealer peeks for a natural (the rules pay naturals out), a decision is only reached if the dealer doesn't
+      have one, so the dealer's results are conditioned on that. The player's own draws still come from the unseen
+      composition including the hole card.
+    - Splits are valued by a Split_EV_Calculator. With deep_splits=False the hits each hand takes after the split are
+      drawn from the composition at the split, which keeps split queries interactive (see split_architecture).
+      Hitting a pair is valued the same way, as its search is the largest of any hand's.
+    - Positions are stored in a transposition table keyed by (hand state, shoe composition), so the many orders of
+      drawing the same cards are solved once and repeated queries are nearly free.
+    """
+    def __init__(self, dealer_hits_soft_17=DEALER_HITS_SOFT_17, exact_dealer=False, table=None, deep_splits=False, dealer_peeks=False):
+        """
+        The dealer's rules are taken from the round being evaluated by `evaluate`, as is whether a hand can be split
+        (MAX_HANDS, ALLOW_RESPLITTING_ACES); the ones given here are for searches made directly.
+
+        Args:
+            dealer_hits_soft_17 (bool): Whether the dealer hits or stands on a soft 17.
+            exact_dealer (bool): Whether to recompute the dealer's probabilities at every position of the search.
+            table (Transposition_Table): Table to store solved positions in (a new one if None).
+            deep_splits (bool): Whether the hits each hand takes after a split, or a pair takes, deplete the composition as they're dealt.
+            dealer_peeks (bool): Whether the dealer has checked for a natural and doesn't have one (see `dealer_probabilities`).
+        """
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.dealer_peeks = dealer_peeks
+        self.exact_dealer = exact_dealer
+        self.deep_splits = deep_splits
+        self.table = table if table is not None else Transposition_Table()
+        self.splits = None #Split_EV_Calculator sharing the table, made on the first split query
+
+        # Set for each query by set_decision_point
+        self.upcard = None
+        self.root_values = None
+        self.context = None
+
+    def set_decision_point(self, upcard, counts):
+        """
+        Sets the dealer up card and unseen composition that the following searches are made from.
+        """
+        self.upcard = upcard
+        self.root_values = standing_values(upcard, counts, self.dealer_hits_soft_17, self.dealer_peeks)
+        dealer_rules = (upcard, self.dealer_hits_soft_17, self.dealer_peeks)
+        self.context = dealer_rules if self.exact_dealer else dealer_rules + (counts,)
+
+    def set_rules(self, rules):
+        """Takes the dealer's soft 17 rule and whether they peek for naturals from a Rule_Set."""
+        self.dealer_hits_soft_17 = rules.dealer_hits_soft_17
+        self.dealer_peeks = rules.naturals
+
+    def best_ev(self, hard, has_ace, counts):
+        """
+        Returns the expected value of playing on optimally (hitting or standing) from a hand with the given hard total and ace status.
+        """
+        values = standing_values(self.upcard, counts, self.dealer_hits_soft_17, self.dealer_peeks) if self.exact_dealer else self.root_values
+        if hard > 21:
+            return values[22]
+
+        total = hard + 10 if has_ace and hard <= 11 else hard
+        if total == 21:
+            return values[21] #Hitting can never improve on 21
+
+        key = (self.context, hard, has_ace, counts)
+        ev = self.table.get(key)
+        if ev is None:
+            ev = max(values[total], self.hit_ev(hard, has_ace, counts))
+            self.table.put(key, ev)
+        return ev
+
+    def hit_ev(self, hard, has_ace, counts):
+        """
+        Returns the expected value of taking exactly one more card and then playing on optimally.
+        """
+        values = standing_values(self.upcard, counts, self.dealer_hits_soft_17, self.dealer_peeks) if self.exact_dealer else self.root_values
+        cards_left = sum(counts)
+        ev = 0.0
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+            value = index + 1
+            next_hard = hard + value
+            next_has_ace = has_ace or value == 1
+
+            #Busts and 21s end the hand, so only search on from other totals
+            if next_hard > 21 and not self.exact_dealer:
+                ev += count * values[22]
+            elif next_hard == 21 or (next_has_ace and next_hard == 11):
+                if self.exact_dealer:
+                    next_counts = counts[:index] + (count - 1,) + counts[index + 1:]
+                    ev += count * standing_values(self.upcard, next_counts, self.dealer_hits_soft_17, self.dealer_peeks)[21]
+                else:
+                    ev += count * values[21]
+            else:
+                next_counts = counts[:index] + (count - 1,) + counts[index + 1:]
+                ev += count * self.best_ev(next_hard, next_has_ace, next_counts)
+        return ev / cards_left
+
+    def fixed_best_ev(self, hard, has_ace, counts):
+        """
+        Returns the expected value of playing on optimally from a hand when every card it draws comes from
+        the composition 'counts' without depleting it (so each position is one of a few dozen totals).
+        """
+        values = standing_values(self.upcard, counts, self.dealer_hits_soft_17, self.dealer_peeks) if self.exact_dealer else self.root_values
+        if hard > 21:
+            return values[22]
+
+        total = hard + 10 if has_ace and hard <= 11 else hard
+        if total == 21:
+            return values[21]
+
+        key = (self.context, "fixed", hard, has_ace, counts)
+        ev = self.table.get(key)
+        if ev is None:
+            ev = max(values[total], self.fixed_hit_ev(hard, has_ace, counts))
+            self.table.put(key, ev)
+        return ev
+
+    def fixed_hit_ev(self, hard, has_ace, counts):
+        """
+        Returns the expected value of taking exactly one more card and then playing on optimally,
+        with every card drawn from the composition 'counts' without depleting it (see fixed_best_ev).
+        """
+        ev = 0.0
+        for index, count in enumerate(counts):
+            if count:
+                ev += count * self.fixed_best_ev(hard + index + 1, has_ace or index == 0, counts)
+        return ev / sum(counts)
+
+    def split_ev(self, pair_value, counts, rules=None, num_hands=1, rank_count=None):
+        """
+        Returns the approximate expected value of splitting a pair of the given value (ace as 1), summed over every hand it ends up as.
+        Resplits are allowed up to the rules' hand limit and hands made by splitting aces receive exactly one card, but the cards
+        each hand draws besides the pair's value aren't removed from the shoe for the hands after it (see Split_EV_Calculator),
+        and unless the solver was made with deep_splits=True the hits a hand takes don't deplete the shoe for its own later hits either.
+        No setting makes the value exact.
+
+        Args:
+            pair_value (int): Value of the pair's cards (ace as 1).
+            counts (tuple): Composition of the unseen cards, excluding the pair.
+            rules (Rule_Set): Rules deciding how often the pair can be resplit (the config rules if None).
+            num_hands (int): Number of hands the player has before the split.
+            rank_count (int): Number of unseen cards of the pair's rank, which decides how often a pair of tens can be resplit
+                (an even share of the unseen tens if None).
+        """
+        if self.splits is None:
+            from split_architecture import Split_EV_Calculator #Imported here as it builds on this module
+            self.splits = Split_EV_Calculator(self, self.table)
+        return self.splits.split_ev(pair_value, counts, rules, num_hands, rank_count)
+
+    def evaluate(self, current_round, hand_index=0):
+        """
+        Returns the expected value of each option for a hand in the current round, based on the cards the player can't see.
+        The dealer's soft 17 rule and peek for naturals are taken from the round's rules.
+
+        Returns:
+            dict: {"stand": ev, "hit": ev or None, "split": ev or None, "best": action}, where an option is None if the rules don't allow it.
+        """
+        hand = current_round.player_hands[hand_index]
+        counts = unseen_counts(current_round)
+        self.set_rules(current_round.rules)
+        self.set_decision_point(HARD_CARD_VALUES[current_round.dealer_card_set.cards[0].code], counts)
+
+        if hand.is_bust():
+            options = {STAND: self.root_values[22], HIT: None, SPLIT: None}
+        else:
+            options = {STAND: self.root_values[hand.total()], HIT: None, SPLIT: None}
+            if current_round.can_hit(hand_index):
+                #Hitting a pair searches the most positions of any hand (e.g. a soft 12), so like splitting it
+                #draws from the composition without depleting it unless deep_splits is set
+                if hand.is_pair() and not self.deep_splits:
+                    options[HIT] = self.fixed_hit_ev(hand.hard, hand.aces > 0, counts)
+                else:
+                    options[HIT] = self.hit_ev(hand.hard, hand.aces > 0, counts)
+            if current_round.can_split(hand_index):
+                pair_card = hand.cards[0]
+                options[SPLIT] = self.split_ev(
+                    HARD_CARD_VALUES[pair_card.code], counts, current_round.rules, len(current_round.player_hands),
+                    unseen_rank_count(current_round, pair_card.rank),
+                )
+
+        best = max((action for action in options if options[action] is not None), key=lambda action: options[action])
+        return {"stand": options[STAND], "hit": options[HIT], "split": options[SPLIT], "best": best}
@@ -0,0 +1,219 @@
+import importlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from functools import wraps
+from config import INSTRUMENTATION_SAMPLE_SIZE, INSTRUMENTATION_TRACE_MAX_EVENTS
+
+# Hot paths that can be instrumented, as (module, owner, attribute): the owner is a class in the module,
+# or None for a function imported into the module's namespace (e.g. svg2png, which is called as a module global).
+HOOK_POINTS = (
+    ("deck_architecture", "Deck", "deal_card"),
+    ("GUI_architecture", None, "svg2png"),
+    ("GUI_architecture", "CardsWindowBase", "display_cards"),
+    ("GUI_architecture", "PlayerHandWindow", "display_cards"),
+    ("GUI_architecture", "BlackjackUI", "center_windows"),
+    ("GUI_architecture", "CanvasHandArea", "update_card_items"),
+    ("GUI_architecture", "TableUI", "layout"),
+    ("engine_architecture", "Blackjack_Round", "dealer_play"),
+    ("engine_architecture", "Blackjack_Round", "dealer_turn_step"),
+    ("game_architecture", "Blackjack_Hand", "dealer_play"),
+    ("game_architecture", "Blackjack_Hand", "dealer_turn_step"),
+)
+
+
+def percentile(sorted_values, fraction):
+    """Returns the value at the given fraction (0-1) of a sorted list, interpolating between neighbouring values."""
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class Duration_Reservoir:
+    """
+    Running count, total and maximum of one hot path's call durations, plus a uniform sample of at most 'size' of them
+    (reservoir sampling) for the percentiles, so memory stays bounded however long the session runs.
+    The percentiles are exact until more than 'size' calls have been recorded.
+    """
+    def __init__(self, size=INSTRUMENTATION_SAMPLE_SIZE):
+        """
+        Args:
+            size (int): Most durations kept in the sample.
+        """
+        self.size = size
+        self.rng = random.Random(0) #Picks which durations the sample keeps (separate from the game's randomness)
+        self.clear()
+
+    def clear(self):
+        """Discards every recorded duration."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.sample = []
+
+    def add(self, duration):
+        """Records one call's duration."""
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+        if len(self.sample) < self.size:
+            self.sample.append(duration)
+        else:
+            slot = self.rng.randrange(self.count) #Keep the new duration with probability size / count
+            if slot < self.size:
+                self.sample[slot] = duration
+
+
+class Instrumentation:
+    """
+    Records call counts and timings of the hot paths in HOOK_POINTS, and can be switched on and off at run time.
+
+    - Enabling it swaps each hot path for a timing wrapper, and disabling it puts the originals back,
+      so while it's off the instrumented code runs exactly as it would without it.
+    - Every call is counted and timed, and the percentiles come from a bounded sample of the durations (see Duration_Reservoir).
+    - With tracing on, each call is also kept as a Chrome trace event (viewable in chrome://tracing or Perfetto),
+      which shows nested calls such as a dealer step's deals and repaints on a timeline.
+      Only the most recent 'max_trace_events' calls are kept, so a long traced session's memory stays bounded too.
+    """
+    def __init__(self, hook_points=HOOK_POINTS, max_trace_events=INSTRUMENTATION_TRACE_MAX_EVENTS):
+        """
+        Args:
+            hook_points (tuple): The (module, owner, attribute) hot paths to instrument when enabled.
+            max_trace_events (int): Most trace events kept, the oldest being dropped first.
+        """
+        self.hook_points = hook_points
+        self.enabled = False
+        self.tracing = False
+        self.originals = {} #Maps each patched (module, owner, attribute) to the original it replaced
+        self.skipped = {} #Maps each hook point that couldn't be patched to the reason why
+
+        self.durations = {} #Maps each hook's label to the Duration_Reservoir of its calls (in seconds)
+        self.trace_events = deque(maxlen=max_trace_events) #(label, start, end, thread id) of each recent call while tracing
+        self.origin = time.perf_counter() #Trace timestamps are relative to this
+
+    def enable(self, trace=False, load_modules=False):
+        """
+        Starts recording the hot paths, also keeping trace events if 'trace' is True.
+
+        Only modules that have already been imported are instrumented unless 'load_modules' is True,
+        so a headless process doesn't load the graphics libraries just to time the engine.
+        Hook points in modules that can't be imported (e.g. the GUI without a display library) are skipped.
+        """
+        self.tracing = trace
+        if self.enabled:
+            return
+        self.enabled = True
+        self.skipped.clear()
+
+        for hook_point in self.hook_points:
+            module_name, owner_name, attribute = hook_point
+            if not load_modules and module_name not in sys.modules:
+                self.skipped[hook_point] = "module not imported"
+                continue
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError as e:
+                self.skipped[hook_point] = str(e)
+                continue
+
+            owner = module if owner_name is None else getattr(module, owner_name)
+            original = getattr(owner, attribute) if owner_name is None else owner.__dict__[attribute]
+            label = attribute if owner_name is None else f"{owner_name}.{attribute}"
+
+            self.originals[hook_point] = original
+            setattr(owner, attribute, self.wrap(label, original))
+
+    def disable(self):
+        """Stops recording, restoring the original hot paths (the recorded timings are kept)."""
+        if not self.enabled:
+            return
+        self.enabled = False
+
+        for (module_name, owner_name, attribute), original in self.originals.items():
+            module = importlib.import_module(module_name)
+            owner = module if owner_name is None else getattr(module, owner_name)
+            setattr(owner, attribute, original)
+        self.originals.clear()
+
+    def reset(self):
+        """Discards everything recorded so far."""
+        for durations in self.durations.values():
+            durations.clear() #In place, as the installed wrappers hold on to their reservoirs
+        self.trace_events.clear()
+        self.origin = time.perf_counter()
+
+    def wrap(self, label, func):
+        """Returns a wrapper around 'func' that records the duration of each call under 'label'."""
+        durations = self.durations.setdefault(label, Duration_Reservoir())
+        trace_events = self.trace_events
+        perf_counter = time.perf_counter
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = perf_counter()
+                durations.add(end - start)
+                if self.tracing:
+                    trace_events.append((label, start, end, threading.get_ident()))
+
+        return wrapper
+
+    def summary(self):
+        """
+        Returns the recorded timings as a dictionary mapping each label to its call count and
+        total, mean, median (p50), p90, p99 and maximum durations in seconds.
+        """
+        results = {}
+        for label, durations in self.durations.items():
+            if not durations.count:
+                continue
+            ordered = sorted(durations.sample)
+            results[label] = {
+                "calls": durations.count,
+                "total": durations.total,
+                "mean": durations.total / durations.count,
+                "p50": percentile(ordered, 0.5),
+                "p90": percentile(ordered, 0.9),
+                "p99": percentile(ordered, 0.99),
+                "max": durations.max,
+            }
+        return results
+
+    def format_summary(self):
+        """Returns the summary as a table for printing, slowest total first (times in milliseconds)."""
+        lines = [f"{'Hot path':<34}{'Calls':>9}{'Total':>11}{'Mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'Max':>10}"]
+        for label, stats in sorted(self.summary().items(), key=lambda item: item[1]["total"], reverse=True):
+            lines.append(
+                f"{label:<34}{stats['calls']:>9}{stats['total'] * 1e3:>11.2f}{stats['mean'] * 1e3:>10.4f}"
+                f"{stats['p50'] * 1e3:>10.4f}{stats['p90'] * 1e3:>10.4f}{stats['p99'] * 1e3:>10.4f}{stats['max'] * 1e3:>10.4f}"
+            )
+        return "\n".join(lines)
+
+    def write_summary(self, path):
+        """Writes the summary to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_chrome_trace(self, path):
+        """Writes the recorded trace events to a file in the Chrome trace event format."""
+        origin = self.origin
+        pid = os.getpid()
+        events = [
+            {"name": label, "ph": "X", "ts": (start - origin) * 1e6, "dur": (end - start) * 1e6, "pid": pid, "tid": thread_id}
+            for label, start, end, thread_id in self.trace_events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+instrumentation = Instrumentation() #Shared instance used by the game (see INSTRUMENTATION_ENABLED in config)
@@ -0,0 +1,107 @@
+from deck_architecture import Deck
+from output_architecture import Discard_Sink
+from engine_architecture import Blackjack_Round, HIT, STAND, SPLIT, DOUBLE, SURRENDER
+
+
+def replay_round(current_round, record):
+    """
+    Replays a logged round through the engine: deals the initial hands, applies the stored actions in order
+    and lets the dealer play, all instantly.
+    Raises a ValueError if the cards or results don't match the record (e.g. the log came from different rules).
+
+    Args:
+        current_round (Blackjack_Round): Round to play, dealing from a deck positioned at the start of the logged round.
+        record (Round_Record): The logged round.
+    Returns:
+        list: The result of each player hand.
+    """
+    current_round.reset_all_hands()
+    current_round.deal_initial_hands()
+
+    for hand_index, action in record.actions:
+        if action == HIT:
+            current_round.player_hits(hand_index)
+        elif action == STAND:
+            current_round.player_stands(hand_index)
+        elif action == SPLIT:
+            if current_round.split_hand(hand_index) is None:
+                raise ValueError(f"Logged split of hand {hand_index + 1} isn't allowed by these rules")
+        elif action == DOUBLE:
+            current_round.player_doubles(hand_index)
+        elif action == SURRENDER:
+            current_round.player_surrenders(hand_index)
+
+    results = current_round.results() if current_round.round_over else None
+    hands = tuple(tuple(card.code for card in hand.cards) for hand in current_round.player_hands)
+    dealer_cards = tuple(card.code for card in current_round.dealer_card_set.cards)
+    if hands != record.hands or dealer_cards != record.dealer_cards or tuple(results or ()) != tuple(record.results):
+        raise ValueError("Replayed round doesn't match the log")
+
+    return results
+
+
+def shoe_start(reader, round_index):
+    """
+    Returns the index of the first logged round of the shoe that round 'round_index' of the log was dealt from
+    (rounds of a shoe are logged one after another, with increasing positions in the shoe).
+    """
+    record = reader[round_index]
+    start = round_index
+    while start > 0:
+        previous = reader[start - 1]
+        if (previous.seed, previous.num_decks, previous.shoe_index) != (record.seed, record.num_decks, record.shoe_index):
+            break
+        if previous.shoe_position >= reader[start].shoe_position:
+            break
+        start -= 1
+    return start
+
+
+def fast_forward(reader, round_index, **rules):
+    """
+    Rebuilds the seeded shoe a logged round was dealt from and brings it to the state it was in at the start of that round,
+    without going through the UI.
+
+    The earlier rounds of the shoe are replayed from their stored actions through the engine (checking each against the log).
+    If the log doesn't go back to the start of the shoe, the missing cards are dealt out directly instead,
+    which leaves the shoe in the same state as the deal order doesn't depend on who received the cards.
+
+    Args:
+        reader (Round_Log_Reader): The log.
+        round_index (int): Index of the round in the log.
+        **rules: Rules to replay the earlier rounds with (see Blackjack_Round), if they differ from config.
+    Returns:
+        tuple: (Deck ready to deal the round, the round's Round_Record)
+    """
+    record = reader[round_index]
+    if record.seed is None:
+        raise ValueError("Only rounds dealt from a seeded deck can be rebuilt")
+
+    deck = Deck(num_decks=record.num_decks, seed=record.seed, shoe_index=record.shoe_index, output=Discard_Sink()) #Rebuilt quietly
+    current_round = Blackjack_Round(deck, **rules)
+
+    start = shoe_start(reader, round_index)
+    for _ in range(reader[start].shoe_position):
+        deck.deal_card()
+    for index in range(start, round_index):
+        replay_round(current_round, reader[index])
+
+    if deck.dealt_cards != record.shoe_position:
+        raise ValueError("Rebuilt shoe isn't at the logged position")
+
+    #The cut card can only have been reached during the round itself, as the shoe is reshuffled after any round that reaches it
+    deck.should_shuffle_after_hand = False
+    return deck, record
+
+
+def find_round(reader, seed, shoe_index, round_in_shoe=0):
+    """
+    Returns the log index of round 'round_in_shoe' (counting from 0) of the given shoe of a seeded session, or None if it wasn't logged.
+    """
+    count = 0
+    for index, record in enumerate(reader):
+        if record.seed == seed and record.shoe_index == shoe_index:
+            if count == round_in_shoe:
+                return index
+            count += 1
+    return None
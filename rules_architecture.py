@@ -0,0 +1,124 @@
+from functools import lru_cache
+from config import MAX_HANDS, ALLOW_RESPLITTING_ACES, DEALER_HITS_SOFT_17, ALLOW_DOUBLING, DOUBLE_AFTER_SPLIT, ALLOW_SURRENDER, BLACKJACK_PAYOUT
+
+# Kinds of pair for the split table: any pair other than aces, aces, and aces in a hand that was itself made by splitting aces
+PAIR = 0
+ACE_PAIR = 1
+SPLIT_ACE_PAIR = 2
+
+# Kinds of hand for the doubling table: the original hand, a hand made by splitting, and a hand made by splitting aces
+ORIGINAL_HAND = 0
+SPLIT_HAND = 1
+SPLIT_ACES_HAND = 2
+
+# Outcomes of a hand for the payout table
+OUTCOME_LOSE = 0
+OUTCOME_DRAW = 1
+OUTCOME_WIN = 2
+OUTCOME_BLACKJACK = 3
+OUTCOME_SURRENDER = 4
+
+MAX_DEALER_HARD_TOTAL = 26 #The highest hard total a dealer hand can reach (16 plus a ten)
+
+
+class Rule_Set:
+    """
+    One variant of the rules, compiled once into small integer-indexed tables so the engine can look up
+    every rule decision in constant time without branching on the settings:
+
+    - dealer_hits[hard * 2 + has_ace]: whether the dealer draws on a hand (1 if it has an ace, else 0).
+    - split_limits[pair kind]: how many hands the player can have before a pair of that kind (PAIR, ACE_PAIR, SPLIT_ACE_PAIR)
+      can no longer be split, so a pair can be split while the number of hands is below it (0 if never).
+    - double_allowed[hand kind]: whether a two card hand of that kind (ORIGINAL_HAND, SPLIT_HAND, SPLIT_ACES_HAND) can double down.
+    - payouts[outcome]: units won per unit staked for each outcome (OUTCOME_LOSE ... OUTCOME_SURRENDER).
+
+    Rule sets are immutable, so one can be shared by any number of rounds and engines.
+    """
+    __slots__ = (
+        "dealer_hits_soft_17", "max_hands", "allow_resplitting_aces", "allow_doubling", "double_after_split",
+        "allow_surrender", "blackjack_payout", "naturals", "dealer_hits", "split_limits", "double_allowed", "payouts",
+    )
+
+    def __init__(self, dealer_hits_soft_17=DEALER_HITS_SOFT_17, max_hands=MAX_HANDS, allow_resplitting_aces=ALLOW_RESPLITTING_ACES,
+                 allow_doubling=ALLOW_DOUBLING, double_after_split=DOUBLE_AFTER_SPLIT, allow_surrender=ALLOW_SURRENDER, blackjack_payout=BLACKJACK_PAYOUT):
+        """
+        Compiles a rule set.
+
+        Args:
+            dealer_hits_soft_17 (bool): Whether the dealer hits (H17) or stands (S17) on a soft 17.
+            max_hands (int): Maximum number of hands the player can split into (1 for no splitting).
+            allow_resplitting_aces (bool): Whether a hand made by splitting aces can be split again.
+            allow_doubling (bool): Whether the player can double down on their first two cards.
+            double_after_split (bool): Whether hands made by splitting can double down too (never hands from split aces).
+            allow_surrender (bool): Whether the player can surrender their first two cards for half their stake back (late surrender).
+            blackjack_payout (float): Payout of a natural blackjack, e.g. 1.5 for 3:2 or 1.2 for 6:5.
+                None treats a natural like any other 21 (no bonus and no checking for dealer blackjacks).
+        """
+        if max_hands < 1:
+            raise ValueError("The player needs at least 1 hand")
+
+        set_rule = super().__setattr__
+        set_rule("dealer_hits_soft_17", dealer_hits_soft_17)
+        set_rule("max_hands", max_hands)
+        set_rule("allow_resplitting_aces", allow_resplitting_aces)
+        set_rule("allow_doubling", allow_doubling)
+        set_rule("double_after_split", double_after_split)
+        set_rule("allow_surrender", allow_surrender)
+        set_rule("blackjack_payout", blackjack_payout)
+        set_rule("naturals", blackjack_payout is not None)
+
+        #The dealer draws below 17, and on soft 17 under H17
+        dealer_hits = []
+        for hard in range(MAX_DEALER_HARD_TOTAL + 1):
+            for has_ace in (False, True):
+                total = hard + 10 if has_ace and hard <= 11 else hard
+                soft = has_ace and hard <= 11
+                dealer_hits.append(total < 17 or (total == 17 and soft and dealer_hits_soft_17))
+        set_rule("dealer_hits", tuple(dealer_hits))
+
+        set_rule("split_limits", (max_hands, max_hands, max_hands if allow_resplitting_aces else 0))
+        set_rule("double_allowed", (allow_doubling, allow_doubling and double_after_split, False))
+        set_rule("payouts", (-1.0, 0.0, 1.0, 1.0 if blackjack_payout is None else float(blackjack_payout), -0.5))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Rule sets are immutable once compiled")
+
+    def __reduce__(self):
+        return (Rule_Set, tuple(self.settings().values())) #Recompiled from the settings when unpickled (e.g. in a worker process)
+
+    def settings(self):
+        """Returns the settings the rule set was compiled from as a dictionary (e.g. to print or compare variants)."""
+        return {
+            "dealer_hits_soft_17": self.dealer_hits_soft_17,
+            "max_hands": self.max_hands,
+            "allow_resplitting_aces": self.allow_resplitting_aces,
+            "allow_doubling": self.allow_doubling,
+            "double_after_split": self.double_after_split,
+            "allow_surrender": self.allow_surrender,
+            "blackjack_payout": self.blackjack_payout,
+        }
+
+    def replace(self, **changes):
+        """Returns a new rule set with the given settings changed."""
+        return Rule_Set(**{**self.settings(), **changes})
+
+    def __eq__(self, other):
+        return isinstance(other, Rule_Set) and self.settings() == other.settings()
+
+    def __hash__(self):
+        return hash(tuple(self.settings().items()))
+
+    def __repr__(self):
+        return "Rule_Set(" + ", ".join(f"{name}={value!r}" for name, value in self.settings().items()) + ")"
+
+
+DEFAULT_RULES = Rule_Set() #The rules set in config
+
+
+@lru_cache(maxsize=None)
+def rule_set(**changes):
+    """
+    Returns the shared compiled Rule_Set for the config rules with the given settings changed,
+    so each variant is only compiled once however many rounds use it.
+    """
+    return DEFAULT_RULES.replace(**changes) if changes else DEFAULT_RULES
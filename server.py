@@ -0,0 +1,31 @@
+import argparse
+import asyncio
+import sys
+from server_architecture import Blackjack_Server
+from config import NUM_DECKS, SERVER_HOST, SERVER_PORT
+
+# Hosts many independent tables from one process over line-delimited JSON on TCP (see server_architecture.py for the protocol).
+
+
+async def serve(args):
+    server = await Blackjack_Server(host=args.host, port=args.port, num_decks=args.decks).start()
+    print(f"Serving Blackjack tables on {server.host}:{server.port}", file=sys.stderr)
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hosts Blackjack tables over a line-delimited JSON protocol on TCP.")
+    parser.add_argument("--host", default=SERVER_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Port to listen on (0 for any free port)")
+    parser.add_argument("--decks", type=int, default=NUM_DECKS, help="Number of decks in each table's shoe")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import asyncio
+import json
+from deck_architecture import Deck
+from engine_architecture import Blackjack_Round, HIT, STAND, SPLIT, DOUBLE, SURRENDER
+from output_architecture import Discard_Sink
+from config import NUM_DECKS, SERVER_HOST, SERVER_PORT
+
+# Protocol: the client sends one JSON object per line and gets exactly one JSON object per line back, in order.
+# Every request has an "op" and may have an "id", which is echoed in its response so pipelined requests can be matched up.
+# Responses have "ok": true plus the op's fields, or "ok": false and an "error" message.
+#
+#   {"op": "new_table", "seed": 42}            -> {"table": 1}  (the seed is optional)
+#   {"op": "deal", "table": 1}                 -> table state, after dealing a new round
+#   {"op": "hit", "table": 1, "hand": 0}       -> table state (likewise "stand", "split", "double" and "surrender")
+#   {"op": "state", "table": 1}                -> table state
+#   {"op": "close_table", "table": 1}          -> {}
+#   {"op": "stats"}                            -> server counters
+#
+# A table state is {"table", "dealer", "hands", "turn_over", "can_hit", "can_split", "can_double", "round_over", "results", "payouts"},
+# with cards as card codes (see CARDS in deck_architecture) and the dealer's face down card as null.
+# Tables belong to the connection that opened them, and are closed when it disconnects.
+
+PLAYER_ACTIONS = (HIT, STAND, SPLIT, DOUBLE, SURRENDER)
+
+
+class Blackjack_Table:
+    """
+    One table hosted by the server: its own shoe and round, driven by requests rather than by button presses or a strategy.
+    Like the GUI's Blackjack_Hand it holds the state of the round being played, but every action is resolved instantly
+    and answered with the new state.
+    """
+    def __init__(self, table_id, deck, rules=None):
+        """
+        Args:
+            table_id (int): Identifier of the table on the server.
+            deck (Deck): The table's shoe.
+            rules (Rule_Set): Rules to play by (the config rules if None).
+        """
+        self.table_id = table_id
+        self.deck = deck
+        self.round = Blackjack_Round(deck, rules=rules)
+        self.dealt = False #Whether a round has been dealt yet
+        self.rounds_played = 0
+
+    def deal(self):
+        """Deals a new round, reshuffling first if the cut card came out last round."""
+        if self.dealt and not self.round.round_over:
+            raise ValueError("The current round isn't over yet")
+
+        if self.deck.should_shuffle_after_hand:
+            self.deck.new_deck(decks=self.deck.num_decks)
+
+        self.round.reset_all_hands()
+        self.round.deal_initial_hands()
+        self.dealt = True
+        if self.round.round_over:
+            self.rounds_played += 1 #Settled on the deal by a natural
+
+    def act(self, action, hand_index):
+        """
+        Applies one of the player's decisions to the given hand.
+        Raises a ValueError if the decision isn't allowed (the round is left unchanged).
+        """
+        current_round = self.round
+        if not self.dealt or current_round.player_turn_over:
+            raise ValueError("No hand is waiting for a decision")
+        if not 0 <= hand_index < len(current_round.player_hands) or current_round.player_hand_turn_over[hand_index]:
+            raise ValueError(f"Hand {hand_index + 1} isn't in play")
+
+        if action == HIT:
+            if not current_round.can_hit(hand_index):
+                raise ValueError(f"Hand {hand_index + 1} can't take another card")
+            current_round.player_hits(hand_index)
+        elif action == STAND:
+            current_round.player_stands(hand_index)
+        elif action == SPLIT:
+            if current_round.split_hand(hand_index) is None:
+                raise ValueError(f"Hand {hand_index + 1} can't be split")
+        elif action == DOUBLE:
+            current_round.player_doubles(hand_index)
+        elif action == SURRENDER:
+            current_round.player_surrenders(hand_index)
+        else:
+            raise ValueError(f"Unknown action: {action}")
+
+        if current_round.round_over:
+            self.rounds_played += 1
+
+    def state(self):
+        """Returns the state of the table as a dictionary for the protocol."""
+        current_round = self.round
+        dealer_hand = current_round.dealer_card_set
+        num_hands = len(current_round.player_hands)
+        round_over = current_round.round_over
+
+        return {
+            "table": self.table_id,
+            "dealer": [card.code if revealed else None for card, revealed in zip(dealer_hand.cards, dealer_hand.revealed)],
+            "hands": [[card.code for card in hand.cards] for hand in current_round.player_hands],
+            "turn_over": list(current_round.player_hand_turn_over),
+            "can_hit": [current_round.can_hit(i) for i in range(num_hands)],
+            "can_split": [current_round.can_split(i) for i in range(num_hands)],
+            "can_double": [current_round.can_double(i) for i in range(num_hands)],
+            "round_over": round_over,
+            "results": current_round.results() if round_over else None,
+            "payouts": current_round.payouts() if round_over else None,
+        }
+
+
+class Blackjack_Server:
+    """
+    Hosts any number of independent tables in one process over a line-delimited JSON protocol on TCP (see the top of this module).
+
+    Everything runs on a single asyncio event loop: each action is resolved instantly by the engine,
+    so the only waiting is on the network and thousands of connections can share the loop.
+    """
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, num_decks=NUM_DECKS, rules=None, output=None):
+        """
+        Args:
+            host (str): Address to listen on.
+            port (int): Port to listen on (0 picks a free one, see 'port' once started).
+            num_decks (int): Number of decks in each table's shoe.
+            rules (Rule_Set): Rules for every table (the config rules if None).
+            output (Output_Sink): Where the tables' shoes announce their reshuffles (discarded if None).
+        """
+        self.host = host
+        self.port = port
+        self.num_decks = num_decks
+        self.rules = rules
+        self.output = output if output is not None else Discard_Sink()
+        self.server = None
+
+        self.tables = {} #Maps table ids to the open tables
+        self.next_table_id = 1
+
+        # Counters reported by the "stats" op
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.rounds_played = 0 #By tables that have since been closed (open tables keep their own count)
+
+    async def start(self):
+        """Starts listening for connections."""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        """Starts the server if needed and handles connections until cancelled."""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Stops listening for connections."""
+        self.server.close()
+        await self.server.wait_closed()
+
+    def open_table(self, seed=None):
+        """Opens a new table with its own freshly shuffled shoe and returns it."""
+        table = Blackjack_Table(self.next_table_id, Deck(num_decks=self.num_decks, seed=seed, output=self.output), self.rules)
+        self.tables[table.table_id] = table
+        self.next_table_id += 1
+        return table
+
+    def close_table(self, table_id):
+        """Closes a table."""
+        table = self.tables.pop(table_id)
+        self.rounds_played += table.rounds_played
+
+    def stats(self):
+        """Returns the server counters as a dictionary."""
+        return {
+            "connections": self.connections,
+            "tables": len(self.tables),
+            "requests": self.requests,
+            "errors": self.errors,
+            "rounds_played": self.rounds_played + sum(table.rounds_played for table in self.tables.values()),
+        }
+
+    def handle_request(self, request, owned_tables):
+        """
+        Carries out one request and returns the fields of its response.
+
+        Args:
+            request (dict): The decoded request.
+            owned_tables (set): Ids of the tables opened by the connection the request came from.
+        """
+        op = request.get("op")
+        if op == "new_table":
+            table = self.open_table(request.get("seed"))
+            owned_tables.add(table.table_id)
+            return {"table": table.table_id}
+        if op == "stats":
+            return self.stats()
+
+        table_id = request.get("table")
+        if table_id not in owned_tables:
+            raise ValueError(f"Table {table_id} isn't open on this connection")
+        table = self.tables[table_id]
+
+        if op == "deal":
+            table.deal()
+        elif op in PLAYER_ACTIONS:
+            table.act(op, int(request.get("hand", 0)))
+        elif op == "close_table":
+            owned_tables.discard(table_id)
+            self.close_table(table_id)
+            return {}
+        elif op != "state":
+            raise ValueError(f"Unknown op: {op}")
+        return table.state()
+
+    async def handle_connection(self, reader, writer):
+        """Answers the requests on one connection until it closes, then closes the tables it opened."""
+        self.connections += 1
+        owned_tables = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                self.requests += 1
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requests must be JSON objects")
+                    request_id = request.get("id")
+                    response = {"ok": True, **self.handle_request(request, owned_tables)}
+                except (ValueError, TypeError) as e: #A bad request only fails itself, not the connection
+                    self.errors += 1
+                    response = {"ok": False, "error": str(e)}
+
+                if request_id is not None:
+                    response["id"] = request_id
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for table_id in owned_tables:
+                self.close_table(table_id)
+            self.connections -= 1
+            writer.close()
@@ -0,0 +1,387 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from deck_architecture import Deck, RANKS, HARD_CARD_VALUES
+from engine_architecture import Blackjack_Engine, HIT, STAND, DOUBLE, SURRENDER, OUTCOME_RESULTS, basic_strategy
+from output_architecture import Discard_Sink
+from rules_architecture import rule_set, PAIR, ACE_PAIR, SPLIT_ACE_PAIR, ORIGINAL_HAND, SPLIT_HAND, OUTCOME_LOSE, OUTCOME_DRAW, OUTCOME_WIN, OUTCOME_BLACKJACK, OUTCOME_SURRENDER
+from stats_architecture import Simulation_Stats, NUM_UPCARDS, NUM_TALLIES, TALLY_PUSH, TALLY_BUST
+from config import NUM_DECKS, MAX_HANDS, ALLOW_RESPLITTING_ACES, DEALER_HITS_SOFT_17, STATS_CONFIDENCE, STATS_CHECK_ROUNDS
+
+# Action codes used in the vectorised strategy tables
+STAND_CODE = 0
+HIT_CODE = 1
+DOUBLE_CODE = 2
+SURRENDER_CODE = 3
+ACTION_CODES = {STAND: STAND_CODE, HIT: HIT_CODE, DOUBLE: DOUBLE_CODE, SURRENDER: SURRENDER_CODE}
+
+# Cards are sampled by rank (index into RANKS) as suits never affect the play
+NUM_RANKS = len(RANKS)
+ACE_RANK = RANKS.index("Ace")
+RANK_HARD_VALUES = np.array(HARD_CARD_VALUES[:NUM_RANKS], dtype=np.int16) #Card codes 0-12 are one of each rank in order
+
+
+class Batch_Simulator:
+    """
+    Plays many independent rounds of Blackjack at once as NumPy array operations.
+
+    - Each round is dealt off the top of its own freshly shuffled shoe, sampled card by card
+      without replacement from that shoe's remaining rank counts.
+    - The player follows a fixed Table_Strategy (the same tables the headless engine can use),
+      with splits and resplits up to the hand limit tracked in one column per hand.
+    - The dealer's hit/stand loop runs on masked arrays, looking up `Rule_Set.dealer_hits` as `Blackjack_Round.dealer_should_hit` does.
+
+    Every rule comes from the same compiled Rule_Set as the engine's: the split limits (one card to each hand after splitting aces,
+    resplitting aces only if allowed), doubling and surrender where the strategy asks for them and the rules allow them,
+    naturals settled straight after the deal when a blackjack payout is set, the payouts, and a draw when both the player and the dealer bust.
+    As in the engine, a strategy asking to double or surrender where the rules don't allow it is an error.
+    """
+    def __init__(self, strategy=None, num_decks=NUM_DECKS, max_hands=MAX_HANDS, allow_resplitting_aces=ALLOW_RESPLITTING_ACES, dealer_hits_soft_17=DEALER_HITS_SOFT_17, rng=None, rules=None):
+        """
+        Initializes the simulator.
+
+        Args:
+            strategy (Table_Strategy): Player strategy (basic strategy if None).
+            num_decks (int): Number of decks in each shoe.
+            max_hands (int): Maximum number of hands the player can split into.
+            allow_resplitting_aces (bool): Whether a hand made by splitting aces can be split again.
+            dealer_hits_soft_17 (bool): Whether the dealer hits or stands on a soft 17.
+            rng (numpy.random.Generator): Source of randomness (a new unseeded generator if None).
+            rules (Rule_Set): The full rules to play by, overriding the three settings above (the config rules with those settings if None).
+        """
+        strategy = strategy if strategy is not None else basic_strategy()
+        if rules is None:
+            rules = rule_set(max_hands=max_hands, allow_resplitting_aces=allow_resplitting_aces, dealer_hits_soft_17=dealer_hits_soft_17)
+
+        self.num_decks = num_decks
+        self.rules = rules
+        self.max_hands = rules.max_hands
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        #Convert the strategy tables to integer arrays indexed by [total, upcard value]
+        self.hard_table = np.array([[ACTION_CODES[action] for action in row] for row in strategy.hard], dtype=np.int8)
+        self.soft_table = np.array([[ACTION_CODES[action] for action in row] for row in strategy.soft], dtype=np.int8)
+        self.pair_table = np.array(strategy.pairs, dtype=bool)
+
+        #The rule tables as arrays
+        self.dealer_hits = np.array(rules.dealer_hits, dtype=bool).reshape(-1, 2) #Indexed by [hard total, has ace]
+        self.split_limits = np.array(rules.split_limits, dtype=np.int16) #Indexed by pair kind
+        self.double_allowed = np.array(rules.double_allowed, dtype=bool) #Indexed by hand kind
+        self.payouts = np.array(rules.payouts) #Indexed by outcome
+        self.outcome_results = np.array(OUTCOME_RESULTS, dtype=np.int8) #WIN/DRAW/LOSE of each outcome
+
+        #Number of cards of each rank in a full shoe
+        self.shoe_counts = np.full(NUM_RANKS, 4 * num_decks, dtype=np.int32)
+
+    def draw(self, counts, remaining, rows):
+        """
+        Draws one card for each of the given rows from that row's shoe and returns the drawn ranks.
+        """
+        positions = self.rng.integers(0, remaining[rows]) #Position of the drawn card among the cards left
+        cumulative = counts[rows].cumsum(axis=1)
+        ranks = (cumulative <= positions[:, None]).sum(axis=1) #First rank whose cumulative count passes the position
+
+        counts[rows, ranks] -= 1
+        remaining[rows] -= 1
+        return ranks
+
+    def totals(self, hard, aces):
+        """Returns the best totals and soft flags for arrays of hard totals and ace counts."""
+        soft = (aces > 0) & (hard <= 11)
+        return np.where(soft, hard + 10, hard), soft
+
+    def play_batch(self, num_rounds, stats):
+        """
+        Plays 'num_rounds' rounds at once and adds them to 'stats' (a Simulation_Stats).
+        Returns an array of the net units won in each round (summed over split hands).
+        """
+        n = num_rounds
+        max_hands = self.max_hands
+        naturals = self.rules.naturals
+        every_row = np.arange(n)
+
+        # Shoe state for every round
+        counts = np.tile(self.shoe_counts, (n, 1))
+        remaining = np.full(n, int(self.shoe_counts.sum()), dtype=np.int64)
+
+        # Player hand state, one column per possible hand
+        hard = np.zeros((n, max_hands), dtype=np.int16)
+        aces = np.zeros((n, max_hands), dtype=np.int16)
+        num_cards = np.zeros((n, max_hands), dtype=np.int16)
+        first_rank = np.zeros((n, max_hands), dtype=np.int16)
+        second_rank = np.zeros((n, max_hands), dtype=np.int16)
+        turn_over = np.zeros((n, max_hands), dtype=bool)
+        split_from_aces = np.zeros((n, max_hands), dtype=bool)
+        doubled = np.zeros((n, max_hands), dtype=bool)
+        surrendered = np.zeros(n, dtype=bool) #Only the original hand can surrender
+        num_hands = np.ones(n, dtype=np.int16)
+
+        def add_card(rows, slots, ranks):
+            """Adds the drawn ranks to the given hands."""
+            hard[rows, slots] += RANK_HARD_VALUES[ranks]
+            aces[rows, slots] += ranks == ACE_RANK
+            cards_before = num_cards[rows, slots]
+            first_rank[rows, slots] = np.where(cards_before == 0, ranks, first_rank[rows, slots])
+            second_rank[rows, slots] = np.where(cards_before == 1, ranks, second_rank[rows, slots])
+            num_cards[rows, slots] = cards_before + 1
+
+        def can_split(rows, slots):
+            """Vectorised version of Blackjack_Round.can_split, checking the hand count against the split limit for the kind of pair."""
+            splittable = (num_cards[rows, slots] == 2) & (first_rank[rows, slots] == second_rank[rows, slots])
+            is_ace = first_rank[rows, slots] == ACE_RANK
+            pair_kind = np.where(is_ace, np.where(split_from_aces[rows, slots], SPLIT_ACE_PAIR, ACE_PAIR), PAIR)
+            return splittable & (num_hands[rows] < self.split_limits[pair_kind])
+
+        # Initial deal in the same order as the engine. Without naturals the hole card is drawn when the dealer plays,
+        # which gives the same distribution as the player never sees it; with naturals it's needed to check for a dealer blackjack.
+        add_card(every_row, 0, self.draw(counts, remaining, every_row))
+        upcard_rank = self.draw(counts, remaining, every_row)
+        add_card(every_row, 0, self.draw(counts, remaining, every_row))
+        upcard = RANK_HARD_VALUES[upcard_rank]
+        dealer_hard = RANK_HARD_VALUES[upcard_rank].astype(np.int16)
+        dealer_aces = (upcard_rank == ACE_RANK).astype(np.int16)
+
+        def draw_hole_card():
+            """Adds the dealer's hole card to every round's dealer hand."""
+            hole_rank = self.draw(counts, remaining, every_row)
+            dealer_hard[:] += RANK_HARD_VALUES[hole_rank]
+            dealer_aces[:] += hole_rank == ACE_RANK
+
+        player_natural = np.zeros(n, dtype=bool)
+        dealer_natural = np.zeros(n, dtype=bool)
+        if naturals:
+            draw_hole_card()
+            dealer_natural = (dealer_hard == 11) & (dealer_aces > 0)
+            player_natural = (hard[:, 0] == 11) & (aces[:, 0] > 0)
+            turn_over[:, 0] = dealer_natural | player_natural #A dealer natural ends the round, and a player natural stands
+
+        # Player's turn, finishing each hand in order as the engine does (splits always add hands at the end)
+        for slot in range(max_hands):
+            while True:
+                rows = np.flatnonzero((num_hands > slot) & ~turn_over[:, slot])
+                if rows.size == 0:
+                    break
+
+                hand_total, hand_soft = self.totals(hard[rows, slot], aces[rows, slot])
+                up = upcard[rows]
+                pair_value = RANK_HARD_VALUES[first_rank[rows, slot]]
+
+                splitting = can_split(rows, slot) & self.pair_table[pair_value, up]
+                action = np.where(splitting, STAND_CODE, np.where(hand_soft, self.soft_table[hand_total, up], self.hard_table[hand_total, up]))
+                action = np.where(split_from_aces[rows, slot] & (action == HIT_CODE), STAND_CODE, action) #Hands made by splitting aces can't take more cards
+
+                doubling = action == DOUBLE_CODE
+                if doubling.any():
+                    hand_kind = np.where(num_hands[rows] > 1, SPLIT_HAND, ORIGINAL_HAND)
+                    can_double = (num_cards[rows, slot] == 2) & self.double_allowed[hand_kind] & ~split_from_aces[rows, slot]
+                    if (doubling & ~can_double).any():
+                        raise ValueError(f"Invalid action from strategy: {DOUBLE}")
+                surrendering = action == SURRENDER_CODE
+                if surrendering.any():
+                    can_surrender = self.rules.allow_surrender & (slot == 0) & (num_hands[rows] == 1) & (num_cards[rows, slot] == 2)
+                    if (surrendering & ~can_surrender).any():
+                        raise ValueError(f"Invalid action from strategy: {SURRENDER}")
+                hitting = (action == HIT_CODE) | doubling
+
+                # Stand, or surrender and end the hand
+                turn_over[rows[(action == STAND_CODE) & ~splitting], slot] = True
+                surrender_rows = rows[surrendering]
+                surrendered[surrender_rows] = True
+                turn_over[surrender_rows, slot] = True
+
+                # Hit (or double for exactly one card), ending the hand's turn on a bust
+                hit_rows = rows[hitting]
+                if hit_rows.size:
+                    add_card(hit_rows, slot, self.draw(counts, remaining, hit_rows))
+                    turn_over[hit_rows, slot] = hard[hit_rows, slot] > 21
+                    double_rows = rows[doubling]
+                    doubled[double_rows, slot] = True
+                    turn_over[double_rows, slot] = True
+
+                # Split, moving the second card into a new hand at the end
+                split_rows = rows[splitting]
+                if split_rows.size:
+                    new_slots = num_hands[split_rows].astype(np.intp)
+                    ranks = first_rank[split_rows, slot]
+                    values = RANK_HARD_VALUES[ranks]
+                    is_ace = ranks == ACE_RANK
+
+                    hard[split_rows, slot] = values
+                    aces[split_rows, slot] = is_ace
+                    num_cards[split_rows, slot] = 1
+                    hard[split_rows, new_slots] = values
+                    aces[split_rows, new_slots] = is_ace
+                    num_cards[split_rows, new_slots] = 1
+                    first_rank[split_rows, new_slots] = ranks
+                    num_hands[split_rows] += 1
+
+                    # Aces get one card each and only stay open while they can be resplit
+                    ace_rows = split_rows[is_ace]
+                    if ace_rows.size:
+                        ace_new_slots = new_slots[is_ace]
+                        split_from_aces[ace_rows, slot] = True
+                        split_from_aces[ace_rows, ace_new_slots] = True
+                        add_card(ace_rows, slot, self.draw(counts, remaining, ace_rows))
+                        add_card(ace_rows, ace_new_slots, self.draw(counts, remaining, ace_rows))
+                        turn_over[ace_rows, slot] = ~can_split(ace_rows, slot)
+                        turn_over[ace_rows, ace_new_slots] = ~can_split(ace_rows, ace_new_slots)
+
+        # Dealer's turn: turn over the hole card then hit on masked rows until every dealer stands or busts
+        if not naturals:
+            draw_hole_card()
+
+        while True:
+            rows = np.flatnonzero(self.dealer_hits[np.minimum(dealer_hard, len(self.dealer_hits) - 1), (dealer_aces > 0).astype(np.intp)])
+            if rows.size == 0:
+                break
+            ranks = self.draw(counts, remaining, rows)
+            dealer_hard[rows] += RANK_HARD_VALUES[ranks]
+            dealer_aces[rows] += ranks == ACE_RANK
+
+        # Settle every hand in play against the dealer, as Blackjack_Round.hand_outcome does
+        dealer_total, _ = self.totals(dealer_hard, dealer_aces)
+        dealer_bust = (dealer_hard > 21)[:, None]
+        player_total, _ = self.totals(hard, aces)
+        player_bust = hard > 21
+        in_play = np.arange(max_hands)[None, :] < num_hands[:, None]
+
+        outcome = np.select([player_total > dealer_total[:, None], player_total < dealer_total[:, None]], [OUTCOME_WIN, OUTCOME_LOSE], OUTCOME_DRAW)
+        outcome = np.where(dealer_bust, OUTCOME_WIN, outcome)
+        outcome = np.where(player_bust, np.where(dealer_bust, OUTCOME_DRAW, OUTCOME_LOSE), outcome)
+        if naturals:
+            outcome[:, 0] = np.where(player_natural, np.where(dealer_natural, OUTCOME_DRAW, OUTCOME_BLACKJACK), np.where(dealer_natural, OUTCOME_LOSE, outcome[:, 0]))
+        outcome[:, 0] = np.where(surrendered, OUTCOME_SURRENDER, outcome[:, 0])
+
+        results = np.where(in_play, self.outcome_results[outcome], 0)
+        hand_net = np.where(in_play, self.payouts[outcome] * np.where(doubled, 2, 1), 0.0)
+
+        round_net = hand_net.sum(axis=1)
+        hands = int(in_play.sum())
+        wins = int(((results == 1) & in_play).sum())
+        losses = int(((results == -1) & in_play).sum())
+
+        # Welford statistics of the batch, merged into the run's in one pairwise update
+        batch_mean = float(round_net.mean())
+        stats.ev.add_moments(n, batch_mean, float(((round_net - batch_mean) ** 2).sum()))
+        stats.net += float(round_net.sum())
+        stats.hands += hands
+        stats.wins += wins
+        stats.draws += hands - wins - losses
+        stats.losses += losses
+        stats.busts += int((player_bust & in_play).sum())
+
+        # Tally every hand in play by its final total and the dealer's upcard (aces as 11)
+        upcard_value = np.where(upcard == 1, 11, upcard)[:, None]
+        tally = np.where(player_bust, TALLY_BUST, TALLY_PUSH - results)
+        index = ((player_total * NUM_UPCARDS + upcard_value) * NUM_TALLIES + tally)[in_play]
+        counts = np.bincount(index, minlength=len(stats.tallies))
+        stats.tallies = [int(mine + theirs) for mine, theirs in zip(stats.tallies, counts.tolist())]
+
+        return round_net
+
+    def simulate_partial(self, num_rounds, batch_size=100_000, ci_width=None, confidence=STATS_CONFIDENCE):
+        """
+        Plays up to 'num_rounds' rounds in batches of 'batch_size' and returns their Simulation_Stats,
+        which can be merged exactly with those of other runs.
+        If 'ci_width' is given, stops after the first batch that narrows the house edge's confidence interval below it.
+        """
+        stats = Simulation_Stats()
+
+        rounds_left = num_rounds
+        while rounds_left > 0:
+            batch = min(batch_size, rounds_left)
+            self.play_batch(batch, stats)
+            rounds_left -= batch
+
+            if ci_width is not None and stats.confidence_width(confidence) <= ci_width:
+                break
+
+        return stats
+
+    def simulate(self, num_rounds, batch_size=100_000, ci_width=None, confidence=STATS_CONFIDENCE):
+        """
+        Plays up to 'num_rounds' rounds in batches of 'batch_size' and returns a summary (see `Simulation_Stats.summary`).
+        """
+        return self.simulate_partial(num_rounds, batch_size, ci_width, confidence).summary(confidence)
+
+
+def run_shard(shard):
+    """
+    Runs one shard of a sharded simulation (in a worker process) and returns its Simulation_Stats.
+
+    Args:
+        shard (tuple): (kind, num_rounds, seed_sequence, strategy, rules) as built by `run_sharded_simulation`.
+    """
+    kind, num_rounds, seed_sequence, strategy, rules = shard
+
+    if kind == "batch":
+        simulator = Batch_Simulator(strategy, rng=np.random.default_rng(seed_sequence), **rules)
+        return simulator.simulate_partial(num_rounds)
+    elif kind == "engine":
+        # Seed a Python RNG for the shard's own shoe from the shard's stream
+        seed = int.from_bytes(seed_sequence.generate_state(4, np.uint64).tobytes(), "little")
+        num_decks = rules.get("num_decks", NUM_DECKS)
+        engine_rules = {key: value for key, value in rules.items() if key != "num_decks"}
+        deck = Deck(num_decks=num_decks, rng=random.Random(seed), output=Discard_Sink())
+        engine = Blackjack_Engine(strategy if strategy is not None else basic_strategy(), deck=deck, **engine_rules)
+        return engine.simulate(num_rounds, check_rounds=max(num_rounds, 1))
+    else:
+        raise ValueError(f"Unknown simulation kind: {kind}")
+
+
+def run_sharded_simulation(num_rounds, workers=None, seed=None, strategy=None, kind="batch", ci_width=None, confidence=STATS_CONFIDENCE, check_rounds=None, **rules):
+    """
+    Splits a simulation across a pool of worker processes and merges their results exactly.
+
+    Each shard gets its own RNG stream spawned from one SeedSequence (and its own shoes), so a run is
+    bit-for-bit reproducible for a given seed and number of workers.
+
+    With 'ci_width' the rounds are played in waves of 'check_rounds' spread over the workers,
+    and the run stops after the first wave that narrows the house edge's confidence interval below it
+    (each shard carries on in later waves from a stream spawned from its own, so this stays reproducible too).
+
+    Args:
+        num_rounds (int): Most rounds to play.
+        workers (int): Number of shards and worker processes (the number of CPUs if None).
+        seed (int): Root seed (fresh entropy if None; the value used is returned as "seed").
+        strategy (Table_Strategy): Player strategy (basic strategy if None).
+        kind (str): "batch" for the NumPy Batch_Simulator or "engine" for the headless Blackjack_Engine.
+        ci_width (float): Width of the house edge's confidence interval to stop at (None to play every round).
+        confidence (float): Confidence level of the interval.
+        check_rounds (int): Rounds per wave when stopping at 'ci_width' (STATS_CHECK_ROUNDS per worker if None).
+        **rules: Rule settings passed to the simulator (num_decks, max_hands, allow_resplitting_aces, dealer_hits_soft_17).
+    Returns:
+        dict: The summary of the merged run (see `Simulation_Stats.summary`) plus the seed and number of workers used.
+    """
+    workers = workers or os.cpu_count() or 1
+    seed_sequence = np.random.SeedSequence(seed)
+    shard_seeds = seed_sequence.spawn(workers)
+    if ci_width is None:
+        wave_rounds = num_rounds
+    else:
+        wave_rounds = check_rounds if check_rounds is not None else STATS_CHECK_ROUNDS * workers
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        stats = Simulation_Stats()
+        wave_seeds = shard_seeds
+        while stats.rounds < num_rounds:
+            # Spread the wave's rounds as evenly as possible over the shards
+            rounds = min(wave_rounds, num_rounds - stats.rounds)
+            shard_rounds = [rounds // workers + (1 if i < rounds % workers else 0) for i in range(workers)]
+            shards = [(kind, rounds, shard_seed, strategy, rules) for rounds, shard_seed in zip(shard_rounds, wave_seeds)]
+            partials = map(run_shard, shards) if executor is None else executor.map(run_shard, shards)
+            stats.merge(Simulation_Stats.merged(partials))
+
+            if ci_width is not None and stats.confidence_width(confidence) <= ci_width:
+                break
+            wave_seeds = [shard_seed.spawn(1)[0] for shard_seed in shard_seeds]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    summary = stats.summary(confidence)
+    summary["seed"] = seed_sequence.entropy
+    summary["workers"] = workers
+    return summary
@@ -0,0 +1,166 @@
+from probability_architecture import EV_Solver, Transposition_Table, full_shoe_counts, remove_card, standing_values
+from rules_architecture import rule_set, PAIR, ACE_PAIR, SPLIT_ACE_PAIR
+from config import NUM_DECKS
+
+# Expected value of splitting a pair, including every resplit the rules allow.
+#
+# After a split the player has a queue of hands each holding a single card of the pair's value, played in order as the engine does.
+# The value is found by a recursion over how many hands are in the queue, how many more splits the hand limit allows,
+# and the shoe composition (with the number of cards of the pair's own rank, as only those resplit a pair of tens), memoized on all of them:
+# - The first hand in the queue draws its second card.
+# - If that card makes the pair again and another split is allowed, the player takes the better of resplitting
+#   (one more hand in the queue, one fewer split left) and playing the hand on.
+# - Otherwise the hand is played on optimally by the EV_Solver (or stands, after splitting aces), and the rest of the queue follows.
+#
+# This is an approximation rather than the exact value. The composition follows the cards of the pair's value as they're dealt,
+# since those decide how often the pair can be resplit, but the other cards a hand draws (its second card and any hits)
+# aren't removed from the shoe the hands after it are valued from. Following them would mean solving the rest of the queue
+# once per composition each hand can end on, which is far too slow, and it moves the value by much less than the resplits do.
+# So exact split values aren't computed anywhere, including with deep_splits=True below, which only makes each hand's own hits
+# deplete the shoe; the values are accurate to the resplits and the hand limit, which is what pricing rule variants needs.
+# Doubling isn't modelled, matching the EV_Solver.
+#
+# Playing each hand on after its second card is most of the work, since every composition the queue reaches needs its own search
+# of the hand's hits, which takes tens of milliseconds for small pairs deep into a shoe. So unless the solver is made with
+# deep_splits=True (as for the strategy tables and pricing rules), the hits each hand takes after its second card are drawn from
+# the composition at the split without depleting it (`EV_Solver.fixed_best_ev`), which needs one small search per split
+# and keeps queries interactive.
+# The second card of each hand (and so every resplit) still follows the composition as above, and the value moves by
+# under a thousandth of a unit on average (a few thousandths at most), for about a millisecond per query instead of up to 70.
+
+class Split_EV_Calculator:
+    """
+    Memoized calculator of the approximate expected value of splitting a pair (with resplits) for an EV_Solver's decision point
+    (see the top of this module for what's approximated).
+
+    - Resplits are allowed while the number of hands is below the rules' split limit for the pair (MAX_HANDS),
+      or for aces from a split, only if the rules allow resplitting aces.
+    - Each hand made by splitting aces receives exactly one card and then stands.
+    """
+    def __init__(self, solver, table=None):
+        """
+        Args:
+            solver (EV_Solver): Solver valuing each hand played on from its first two cards, set to the decision point to evaluate.
+            table (Transposition_Table): Table to store solved queues in (a new one if None).
+        """
+        self.solver = solver
+        self.table = table if table is not None else Transposition_Table()
+
+    def split_ev(self, pair_value, counts, rules=None, num_hands=1, rank_count=None):
+        """
+        Returns the approximate expected value of splitting a pair, summed over every hand it ends up as.
+
+        Args:
+            pair_value (int): Value of the pair's cards (ace as 1).
+            counts (tuple): Composition of the unseen cards (see `shoe_counts`), excluding the pair.
+            rules (Rule_Set): Rules deciding how often the pair can be resplit (the config rules if None).
+            num_hands (int): Number of hands the player has before the split.
+            rank_count (int): Number of unseen cards of the pair's rank. Only tens need it, since a pair can only be resplit
+                with a card of the same rank (a King doesn't resplit a pair of Queens); if None, the unseen tens are taken
+                to be spread evenly over the four ten-valued ranks.
+        """
+        rules = rules if rules is not None else rule_set()
+        limit = rules.split_limits[SPLIT_ACE_PAIR if pair_value == 1 else PAIR]
+
+        pair_count = counts[pair_value - 1]
+        if pair_value != 10:
+            rank_count = pair_count #Every card of the pair's value is of its rank
+        elif rank_count is None:
+            rank_count = round(pair_count / 4)
+        elif not 0 <= rank_count <= pair_count:
+            raise ValueError(f"The pair's rank can't have {rank_count} unseen cards out of {pair_count} tens")
+
+        hit_counts = None if self.solver.deep_splits else counts
+        return self.queue_ev(pair_value, 2, max(limit - num_hands - 1, 0), counts, rank_count, hit_counts)
+
+    def queue_ev(self, pair_value, pending, splits_left, counts, rank_count, hit_counts=None):
+        """
+        Returns the approximate expected value of 'pending' hands that each hold a single card of the pair's value,
+        with 'splits_left' more splits allowed, all valued from the composition 'counts' of which 'rank_count' cards
+        are of the pair's rank (and with the hands' later hits drawn from 'hit_counts', unless it's None).
+        """
+        if pending == 0:
+            return 0.0
+
+        key = (self.solver.context, pair_value, pending, splits_left, counts, rank_count, hit_counts)
+        ev = self.table.get(key)
+        if ev is not None:
+            return ev
+
+        pair_index = pair_value - 1
+        rest_without_pair = None #Value of the rest of the queue when this hand doesn't draw the pair's value, from the composition before it drew (the approximation)
+        cards_left = sum(counts)
+        ev = 0.0
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+            next_counts = counts[:index] + (count - 1,) + counts[index + 1:]
+            hand_ev = self.hand_ev(pair_value, index + 1, next_counts, hit_counts)
+
+            if index == pair_index:
+                #A card of the pair's rank can resplit it, while a ten of another rank just makes the hand 20
+                if rank_count:
+                    played = hand_ev + self.queue_ev(pair_value, pending - 1, splits_left, next_counts, rank_count - 1, hit_counts)
+                    if splits_left:
+                        played = max(played, self.queue_ev(pair_value, pending + 1, splits_left - 1, next_counts, rank_count - 1, hit_counts))
+                    ev += rank_count * played
+                if count > rank_count:
+                    ev += (count - rank_count) * (hand_ev + self.queue_ev(pair_value, pending - 1, splits_left, next_counts, rank_count, hit_counts))
+            else:
+                if rest_without_pair is None:
+                    rest_without_pair = self.queue_ev(pair_value, pending - 1, splits_left, counts, rank_count, hit_counts)
+                ev += count * (hand_ev + rest_without_pair)
+
+        ev /= cards_left
+        self.table.put(key, ev)
+        return ev
+
+    def hand_ev(self, pair_value, value, counts, hit_counts=None):
+        """
+        Returns the expected value of a hand made by splitting once it holds its second card (of the given value),
+        played on optimally or, after splitting aces, standing.
+        The hand's hits are drawn from 'counts' as they're dealt, or from 'hit_counts' without depleting it if that's given.
+        """
+        solver = self.solver
+        hard = pair_value + value
+        has_ace = pair_value == 1 or value == 1
+        if pair_value != 1:
+            if hit_counts is not None:
+                return solver.fixed_best_ev(hard, has_ace, hit_counts)
+            return solver.best_ev(hard, has_ace, counts)
+
+        values = standing_values(solver.upcard, counts, solver.dealer_hits_soft_17, solver.dealer_peeks) if solver.exact_dealer else solver.root_values
+        return values[hard + 10 if hard <= 11 else hard]
+
+
+def split_ev_off_the_top(pair_value, upcard, rules=None, num_decks=NUM_DECKS, exact_dealer=False, deep_splits=True):
+    """
+    Returns the approximate expected value of splitting a pair (see Split_EV_Calculator) against a dealer up card
+    as the first decision off a full shoe (given no dealer natural if the rules pay naturals out),
+    e.g. to price rule variants such as the hand limit or resplitting aces against each other.
+
+    Args:
+        pair_value (int): Value of the pair's cards (ace as 1).
+        upcard (int): Value of the dealer's up card (ace as 1).
+        rules (Rule_Set): Rules to play by (the config rules if None).
+        num_decks (int): Number of decks in the shoe.
+        exact_dealer (bool): Whether to recompute the dealer's probabilities at every position (see EV_Solver).
+        deep_splits (bool): Whether each hand's hits deplete the composition (see the top of this module).
+    """
+    rules = rules if rules is not None else rule_set()
+    if rules.split_limits[ACE_PAIR if pair_value == 1 else PAIR] <= 1:
+        raise ValueError("The rules don't allow this pair to be split")
+
+    counts = remove_card(remove_card(remove_card(full_shoe_counts(num_decks), pair_value), pair_value), upcard)
+    solver = EV_Solver(dealer_hits_soft_17=rules.dealer_hits_soft_17, exact_dealer=exact_dealer, deep_splits=deep_splits,
+                       dealer_peeks=rules.naturals)
+    solver.set_decision_point(upcard, counts)
+    return Split_EV_Calculator(solver).split_ev(pair_value, counts, rules, rank_count=off_the_top_rank_count(pair_value, num_decks))
+
+
+def off_the_top_rank_count(pair_value, num_decks):
+    """
+    Returns the number of unseen cards of a pair's rank off a full shoe, for `Split_EV_Calculator.split_ev`
+    (None for pairs other than tens, which don't need it). A ten upcard is taken to be of another rank.
+    """
+    return 4 * num_decks - 2 if pair_value == 10 else None
@@ -0,0 +1,198 @@
+from statistics import NormalDist
+from config import STATS_CONFIDENCE
+
+# Simulation results are aggregated as they are played rather than stored per round or per hand,
+# so the memory used stays the same however many rounds are played, and the partial results of separate runs
+# (e.g. the shards of a parallel simulation) can be merged exactly into the result of the whole.
+
+# Categories each player hand is tallied under, by its final total and the dealer's upcard
+TALLY_WIN = 0
+TALLY_PUSH = 1
+TALLY_LOSS = 2
+TALLY_BUST = 3 #The player went over 21 (a loss, or a push if the dealer busts too)
+NUM_TALLIES = 4
+
+NUM_TOTALS = 32 #Final totals run up to 31 (a hard 21 hit with a 10)
+NUM_UPCARDS = 12 #Upcards are tallied by value, 2 to 11 (aces as 11)
+
+
+def confidence_z(confidence):
+    """Returns the number of standard errors either side of the mean covering the given two-sided confidence level."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+class Running_Stats:
+    """
+    Running count, mean and sum of squared deviations of a stream of values (Welford's method),
+    which stays accurate over billions of values where summing squares would lose precision.
+    Two sets of running statistics merge exactly as if every value had been added to one (Chan et al.'s pairwise update).
+    """
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        """
+        Args:
+            count (int): Number of values added.
+            mean (float): Mean of the values.
+            m2 (float): Sum of the squared differences of the values from their mean.
+        """
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        """Adds a single value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def add_moments(self, count, mean, m2):
+        """Adds a batch of values given by their count, mean and sum of squared deviations (e.g. computed with NumPy)."""
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other):
+        """Adds every value of another set of running statistics."""
+        self.add_moments(other.count, other.mean, other.m2)
+
+    def variance(self):
+        """Returns the sample variance of the values (0 with fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def standard_error(self):
+        """Returns the standard error of the mean."""
+        return (self.variance() / self.count) ** 0.5 if self.count else 0.0
+
+    def confidence_interval(self, confidence=STATS_CONFIDENCE):
+        """Returns the (low, high) normal approximation confidence interval of the mean."""
+        half_width = confidence_z(confidence) * self.standard_error()
+        return self.mean - half_width, self.mean + half_width
+
+
+class Simulation_Stats:
+    """
+    Statistics of a simulation, updated as each round is played:
+    - The running mean and variance of the net units won per round (the expected value, whose negative is the house edge).
+    - The number of rounds and hands played, and the wins, draws, losses and busts.
+    - How many hands won, pushed, lost and busted for each final player total against each dealer upcard.
+
+    The state is a fixed set of numbers, so it can be pickled to or from a worker process and merged with other runs.
+    """
+    def __init__(self):
+        self.ev = Running_Stats() #Of the net units won per round
+        self.net = 0 #Exact sum of the net units won, alongside the running mean
+        self.hands = 0
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.busts = 0
+        self.tallies = [0] * (NUM_TOTALS * NUM_UPCARDS * NUM_TALLIES) #Indexed by tally_index
+
+    @property
+    def rounds(self):
+        """Number of rounds played."""
+        return self.ev.count
+
+    def add_round(self, round_net):
+        """Adds a finished round by the net units won over all its hands."""
+        self.ev.add(round_net)
+        self.net += round_net
+
+    def add_hand(self, total, upcard, result, bust):
+        """
+        Adds a finished player hand.
+
+        Args:
+            total (int): Final total of the hand.
+            upcard (int): Value of the dealer's upcard (aces as 11).
+            result (int): 1 for a win, 0 for a draw or -1 for a loss (WIN, DRAW and LOSE in engine_architecture).
+            bust (bool): Whether the hand went over 21.
+        """
+        self.hands += 1
+        if result > 0:
+            self.wins += 1
+        elif result < 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+        if bust:
+            self.busts += 1
+            self.tallies[tally_index(total, upcard, TALLY_BUST)] += 1
+        else:
+            self.tallies[tally_index(total, upcard, TALLY_PUSH - result)] += 1 #A win, push or loss
+
+    def merge(self, other):
+        """Adds the rounds of another run (e.g. another shard of a parallel simulation) to these statistics."""
+        self.ev.merge(other.ev)
+        self.net += other.net
+        self.hands += other.hands
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        self.busts += other.busts
+        self.tallies = [mine + theirs for mine, theirs in zip(self.tallies, other.tallies)]
+        return self
+
+    @classmethod
+    def merged(cls, partials):
+        """Returns the statistics of several runs merged into one."""
+        stats = cls()
+        for partial in partials:
+            stats.merge(partial)
+        return stats
+
+    def house_edge_interval(self, confidence=STATS_CONFIDENCE):
+        """Returns the (low, high) confidence interval of the house edge, the expected units lost per round."""
+        low, high = self.ev.confidence_interval(confidence)
+        return -high, -low
+
+    def confidence_width(self, confidence=STATS_CONFIDENCE):
+        """Returns the width of the house edge's confidence interval (infinite before two rounds have been played)."""
+        if self.rounds < 2:
+            return float("inf")
+        return 2 * confidence_z(confidence) * self.ev.standard_error()
+
+    def tally(self, total, upcard):
+        """Returns how many hands ending on 'total' against the upcard 'upcard' won, pushed, lost and busted, as a dictionary."""
+        start = tally_index(total, upcard, 0)
+        wins, pushes, losses, busts = self.tallies[start:start + NUM_TALLIES]
+        return {"wins": wins, "pushes": pushes, "losses": losses, "busts": busts}
+
+    def tally_table(self):
+        """Returns the tallies of every (total, upcard) pair any hand finished on, as a dictionary keyed by "total/upcard"."""
+        return {
+            f"{total}/{upcard}": self.tally(total, upcard)
+            for total in range(NUM_TOTALS) for upcard in range(NUM_UPCARDS)
+            if any(self.tallies[tally_index(total, upcard, 0):tally_index(total, upcard, NUM_TALLIES)])
+        }
+
+    def summary(self, confidence=STATS_CONFIDENCE):
+        """
+        Returns a summary as a dictionary with the number of rounds and hands played, the wins, draws, losses and busts,
+        the net units won, the expected value per round with its standard error, and the house edge with its confidence interval.
+        """
+        house_edge_low, house_edge_high = self.house_edge_interval(confidence)
+        return {
+            "rounds": self.rounds,
+            "hands": self.hands,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "busts": self.busts,
+            "net": self.net,
+            "ev_per_round": self.ev.mean,
+            "standard_error": self.ev.standard_error(),
+            "house_edge": -self.ev.mean,
+            "house_edge_interval": [house_edge_low, house_edge_high],
+            "confidence": confidence,
+        }
+
+
+def tally_index(total, upcard, tally):
+    """Returns the position of a tally in Simulation_Stats.tallies."""
+    return (total * NUM_UPCARDS + upcard) * NUM_TALLIES + tally
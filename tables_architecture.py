@@ -0,0 +1,150 @@
+import hashlib
+import os
+import numpy as np
+from engine_architecture import Table_Strategy, HIT, STAND
+from probability_architecture import EV_Solver, DEALER_OUTCOMES, dealer_probabilities, full_shoe_counts, remove_card
+from rules_architecture import rule_set, PAIR, ACE_PAIR
+from split_architecture import off_the_top_rank_count
+from config import NUM_DECKS, STRATEGY_TABLES_PATH
+
+# Tables that only depend on the rules and the number of decks, solved once and then kept on disk as .npy files,
+# so every later process memory-maps them in milliseconds instead of solving them again:
+# - dealer (11 x 6): off the top probability of each final dealer result (see DEALER_OUTCOMES) by upcard (ace as 1, row 0 unused).
+#   When the rules pay out naturals the dealer peeks for one before the player acts, so like every EV behind the strategy,
+#   these are given that the dealer doesn't have a natural.
+# - hard, soft (22 x 11): basic strategy action codes by hand total and upcard (ace as 1), as in Table_Strategy.
+# - pairs (11 x 11): whether basic strategy splits a pair, by the value of the paired cards and the upcard (both ace as 1).
+#
+# Files are named by the table format version and a hash of the rule settings and deck count,
+# so changing either (or the format, or how the tables are solved) solves and saves a new set rather than reading a stale one.
+TABLES_VERSION = 3
+TABLE_NAMES = ("dealer", "hard", "soft", "pairs")
+
+# Action codes stored in the strategy tables
+STAND_CODE = 0
+HIT_CODE = 1
+ACTIONS = (STAND, HIT)
+
+
+class Strategy_Tables:
+    """
+    The precomputed tables for one rule set and number of decks (see the top of this module),
+    as NumPy arrays that are usually read-only memory maps of the files on disk.
+    """
+    def __init__(self, rules, num_decks, dealer, hard, soft, pairs):
+        """
+        Args:
+            rules (Rule_Set): Rules the tables were solved for.
+            num_decks (int): Number of decks in the shoe the tables were solved for.
+            dealer (numpy.ndarray): Dealer result probabilities by upcard.
+            hard (numpy.ndarray): Hard total action codes.
+            soft (numpy.ndarray): Soft total action codes.
+            pairs (numpy.ndarray): Split decisions.
+        """
+        self.rules = rules
+        self.num_decks = num_decks
+        self.dealer = dealer
+        self.hard = hard
+        self.soft = soft
+        self.pairs = pairs
+
+    def dealer_probabilities(self, upcard):
+        """
+        Returns the off the top probability of each final dealer result (17, 18, 19, 20, 21, bust) for an upcard (ace as 1),
+        given no dealer natural if the rules pay naturals out.
+        """
+        return tuple(self.dealer[upcard].tolist())
+
+    def strategy(self):
+        """Returns the basic strategy as a Table_Strategy, usable as the engine's strategy callback or by the batch simulator."""
+        hard = [[ACTIONS[code] for code in row] for row in self.hard.tolist()]
+        soft = [[ACTIONS[code] for code in row] for row in self.soft.tolist()]
+        return Table_Strategy(hard, soft, self.pairs.tolist())
+
+
+def tables_key(rules, num_decks):
+    """Returns the hash naming the table files for a rule set and number of decks."""
+    settings = (TABLES_VERSION, num_decks, tuple(sorted(rules.settings().items())))
+    return hashlib.sha1(repr(settings).encode()).hexdigest()[:16]
+
+
+def table_path(directory, key, name):
+    """Returns the path of one table's file."""
+    return os.path.join(directory, f"v{TABLES_VERSION}_{key}_{name}.npy")
+
+
+def solve_tables(rules=None, num_decks=NUM_DECKS):
+    """
+    Solves the tables for a rule set and number of decks from scratch with the EV_Solver (which takes a few seconds).
+
+    The basic strategy is total dependent and played off the top: each hit or stand decision compares the expected values
+    from the full shoe less the upcard (given no dealer natural when the rules pay naturals out, as the dealer peeks),
+    and each split decision compares `EV_Solver.split_ev` (with every resplit the rules allow)
+    with playing the pair's total on, from the full shoe less the upcard and the pair.
+    """
+    rules = rules if rules is not None else rule_set()
+    full_counts = full_shoe_counts(num_decks)
+
+    dealer = np.zeros((11, len(DEALER_OUTCOMES)))
+    hard = np.full((22, 11), HIT_CODE, dtype=np.int8)
+    soft = np.full((22, 11), HIT_CODE, dtype=np.int8)
+    pairs = np.zeros((11, 11), dtype=bool)
+
+    for upcard in range(1, 11):
+        counts = remove_card(full_counts, upcard)
+        dealer[upcard] = dealer_probabilities(upcard, counts, rules.dealer_hits_soft_17, rules.naturals)
+
+        solver = EV_Solver(dealer_hits_soft_17=rules.dealer_hits_soft_17, dealer_peeks=rules.naturals)
+        solver.set_decision_point(upcard, counts)
+        for total in range(4, 22):
+            hard[total, upcard] = STAND_CODE if total == 21 or solver.root_values[total] >= solver.hit_ev(total, False, counts) else HIT_CODE
+        for total in range(12, 22):
+            soft[total, upcard] = STAND_CODE if total == 21 or solver.root_values[total] >= solver.hit_ev(total - 10, True, counts) else HIT_CODE
+
+        for pair_value in range(1, 11):
+            if rules.split_limits[ACE_PAIR if pair_value == 1 else PAIR] <= 1:
+                continue
+            pair_counts = remove_card(remove_card(counts, pair_value), pair_value)
+            solver = EV_Solver(dealer_hits_soft_17=rules.dealer_hits_soft_17, deep_splits=True, dealer_peeks=rules.naturals)
+            solver.set_decision_point(upcard, pair_counts)
+            pair_hard = 2 * pair_value
+            pair_total = 12 if pair_value == 1 else pair_hard
+            play_ev = max(solver.root_values[pair_total], solver.hit_ev(pair_hard, pair_value == 1, pair_counts))
+            split_ev = solver.split_ev(pair_value, pair_counts, rules, rank_count=off_the_top_rank_count(pair_value, num_decks))
+            pairs[pair_value, upcard] = split_ev > play_ev
+
+    return Strategy_Tables(rules, num_decks, dealer, hard, soft, pairs)
+
+
+def save_tables(tables, directory=STRATEGY_TABLES_PATH):
+    """Writes the tables to their files in 'directory'."""
+    os.makedirs(directory, exist_ok=True)
+    key = tables_key(tables.rules, tables.num_decks)
+    for name in TABLE_NAMES:
+        path = table_path(directory, key, name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, getattr(tables, name))
+        os.replace(temp_path, path) #Swaps the finished file in so a partially written table is never read
+
+
+def load_tables(rules=None, num_decks=NUM_DECKS, directory=STRATEGY_TABLES_PATH):
+    """
+    Returns the tables for a rule set and number of decks, memory-mapping them from 'directory' if they've been saved
+    and otherwise solving and saving them first (None to always solve them without touching the disk).
+
+    Args:
+        rules (Rule_Set): Rules to play by (the config rules if None).
+        num_decks (int): Number of decks in the shoe.
+        directory (str): Folder the table files are kept in.
+    """
+    rules = rules if rules is not None else rule_set()
+    if directory is None:
+        return solve_tables(rules, num_decks)
+
+    key = tables_key(rules, num_decks)
+    paths = [table_path(directory, key, name) for name in TABLE_NAMES]
+    if not all(os.path.exists(path) for path in paths):
+        save_tables(solve_tables(rules, num_decks), directory)
+
+    return Strategy_Tables(rules, num_decks, *(np.load(path, mmap_mode="r") for path in paths))